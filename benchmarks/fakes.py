@@ -0,0 +1,577 @@
+"""
+fakes.py
+Capa falsa y determinista de psutil, win32gui, win32process, winreg,
+ctypes.windll y sistema de archivos para medir las rutas calientes
+en Linux sin tocar el sistema real.
+"""
+import os
+import sys
+import types
+import random
+import ctypes
+import posixpath
+from collections import namedtuple
+
+pcputimes = namedtuple("pcputimes", ["user", "system"])
+pmem = namedtuple("pmem", ["rss", "vms", "num_page_faults", "private"])
+pio = namedtuple("pio", ["read_count", "write_count", "read_bytes",
+                         "write_bytes", "other_count", "other_bytes"])
+pfullmem = namedtuple("pfullmem", ["rss", "vms", "uss"])
+svmem = namedtuple("svmem", ["total", "available", "percent", "used", "free"])
+
+SERVICE_USERS = [
+    "NT AUTHORITY\\SYSTEM",
+    "NT AUTHORITY\\LOCAL SERVICE",
+    "NT AUTHORITY\\NETWORK SERVICE",
+]
+
+PROCESS_NAMES = [
+    "svchost.exe", "chrome.exe", "explorer.exe", "code.exe", "python.exe",
+    "RuntimeBroker.exe", "SearchIndexer.exe", "OneDrive.exe", "Teams.exe",
+    "msedge.exe", "conhost.exe", "dllhost.exe", "backup_agent.exe",
+]
+
+
+# ---------------------------------------------------------------- psutil ---
+
+class NoSuchProcess(Exception):
+    """Equivalente de psutil.NoSuchProcess."""
+    def __init__(self, pid=None, name=None, msg=None):
+        super().__init__(msg or f"pid {pid}")
+        self.pid = pid
+        self.name = name
+
+
+class AccessDenied(Exception):
+    """Equivalente de psutil.AccessDenied."""
+    def __init__(self, pid=None, name=None, msg=None):
+        super().__init__(msg or f"pid {pid}")
+        self.pid = pid
+        self.name = name
+
+
+class ZombieProcess(NoSuchProcess):
+    """Equivalente de psutil.ZombieProcess."""
+
+
+class FakeProcess:
+    """Proceso sintético con contadores que avanzan en cada tick."""
+    # pylint: disable=too-many-instance-attributes
+    def __init__(self, system, pid, rng):
+        self.system = system
+        self.pid = pid
+        self.name_ = rng.choice(PROCESS_NAMES)
+        self.exe_ = f"C:\\Program Files\\{self.name_[:-4]}\\{self.name_}"
+        self.username_ = (
+            rng.choice(SERVICE_USERS) if rng.random() < 0.3 else "PC\\usuario"
+        )
+        self.protected = rng.random() < 0.05
+        self.create_time_ = 1_700_000_000.0 + pid
+        self.load = rng.random() ** 4 * 100
+        self.cpu_s = rng.random() * 100
+        self.rss = rng.randint(2, 800) * 1024 * 1024
+        self.io = [rng.randint(0, 10**6) for _ in range(6)]
+        self.info = {}
+
+    def advance(self, dt, rng):
+        """Avanza los contadores acumulados."""
+        self.cpu_s += self.load / 100 * dt * rng.random()
+        self.rss = max(1024 * 1024, self.rss + rng.randint(-64, 64) * 1024)
+        for i in range(6):
+            self.io[i] += rng.randint(0, 4096)
+
+    def _check(self):
+        if self.pid not in self.system.processes:
+            raise NoSuchProcess(self.pid)
+
+    # --- API de psutil.Process usada por la aplicación ---
+    def name(self):
+        """Nombre del proceso."""
+        return self.name_
+
+    def ppid(self):
+        """PID del padre (determinista, sin consumir el generador aleatorio)."""
+        return (self.pid // 12) * 4
+
+    def exe(self):
+        """Ruta del ejecutable."""
+        if self.protected:
+            raise AccessDenied(self.pid)
+        return self.exe_
+
+    def username(self):
+        """Usuario propietario."""
+        self._check()
+        if self.protected:
+            raise AccessDenied(self.pid)
+        return self.username_
+
+    def cmdline(self):
+        """Línea de comandos."""
+        if self.protected:
+            raise AccessDenied(self.pid)
+        return [self.exe_, "--type=renderer", f"--id={self.pid}"]
+
+    def create_time(self):
+        """Momento de creación."""
+        return self.create_time_
+
+    def cpu_percent(self, interval=None):  # pylint: disable=unused-argument
+        """% de CPU desde la última llamada."""
+        return self.load
+
+    def memory_percent(self):
+        """% de memoria física."""
+        return self.rss / self.system.total_memory * 100
+
+    def cpu_times(self):
+        """Tiempos de CPU acumulados."""
+        return pcputimes(self.cpu_s * 0.8, self.cpu_s * 0.2)
+
+    def memory_info(self):
+        """Memoria del proceso."""
+        return pmem(self.rss, self.rss * 2, self.rss // 4096, self.rss * 0.7)
+
+    def memory_full_info(self):
+        """Memoria con USS (más costosa en el sistema real)."""
+        if self.protected:
+            raise AccessDenied(self.pid)
+        return pfullmem(self.rss, self.rss * 2, int(self.rss * 0.6))
+
+    def io_counters(self):
+        """Contadores de E/S."""
+        if self.protected:
+            raise AccessDenied(self.pid)
+        return pio(*self.io)
+
+    def terminate(self):
+        """Termina el proceso sintético."""
+        self.system.processes.pop(self.pid, None)
+
+    def as_dict(self, attrs):
+        """Lee varios atributos como psutil (None si hay acceso denegado)."""
+        result = {}
+        for attr in attrs:
+            if attr == "pid":
+                result[attr] = self.pid
+                continue
+            try:
+                result[attr] = getattr(self, attr)()
+            except AccessDenied:
+                result[attr] = None
+        return result
+
+
+class FakeSystem:
+    """Estado sintético: procesos, ventanas, registro y sistema de archivos."""
+    def __init__(self, processes=1000, windows=1000, churn=0.01, seed=1234):
+        self.rng = random.Random(seed)
+        self.churn = churn
+        self.total_memory = 16 * 1024 ** 3
+        self.next_pid = 4
+        self.processes = {}
+        for _ in range(processes):
+            self.spawn()
+        self.windows = []
+        pids = list(self.processes)
+        for hwnd in range(1, windows + 1):
+            self.windows.append((
+                hwnd * 4,
+                self.rng.choice(pids),
+                self.rng.random() < 0.4,
+                f"Ventana {hwnd}" if self.rng.random() < 0.7 else "",
+            ))
+        self.registry = {}
+        # Proceso propio (psutil.Process() sin PID), fuera de la lista
+        self.own = FakeProcess(self, 0, self.rng)
+
+    def spawn(self):
+        """Crea un proceso nuevo con un PID único."""
+        proc = FakeProcess(self, self.next_pid, self.rng)
+        self.processes[proc.pid] = proc
+        self.next_pid += 4
+        return proc
+
+    def tick(self, dt=1.5):
+        """Avanza el tiempo: actualiza contadores y reemplaza algunos procesos."""
+        for proc in self.processes.values():
+            proc.advance(dt, self.rng)
+        victims = self.rng.sample(
+            list(self.processes), int(len(self.processes) * self.churn)
+        )
+        for pid in victims:
+            del self.processes[pid]
+            self.spawn()
+
+    # --- API de módulo psutil ---
+    def process_iter(self, attrs=None, ad_value=None):  # pylint: disable=unused-argument
+        """Itera los procesos rellenando `info` como psutil."""
+        for proc in list(self.processes.values()):
+            if attrs is not None:
+                proc.info = proc.as_dict(attrs)
+            yield proc
+
+    def get_process(self, pid=None):
+        """Equivalente de psutil.Process(pid)."""
+        if pid is None:
+            return self.own
+        proc = self.processes.get(pid)
+        if proc is None:
+            raise NoSuchProcess(pid)
+        return proc
+
+    def virtual_memory(self):
+        """Memoria virtual del sistema."""
+        used = sum(p.rss for p in self.processes.values()) % self.total_memory
+        return svmem(self.total_memory, self.total_memory - used,
+                     used / self.total_memory * 100, used, self.total_memory - used)
+
+    def psutil_module(self):
+        """Construye el módulo falso `psutil`."""
+        module = types.ModuleType("psutil")
+        module.NoSuchProcess = NoSuchProcess
+        module.AccessDenied = AccessDenied
+        module.ZombieProcess = ZombieProcess
+        module.process_iter = self.process_iter
+        module.Process = self.get_process
+        module.virtual_memory = self.virtual_memory
+        module.cpu_count = lambda logical=True: 8 if logical else 4
+        module.cpu_percent = lambda interval=None, percpu=False: [10.0] * 8 if percpu else 10.0
+        module.pids = lambda: list(self.processes)
+        module.disk_io_counters = lambda: pio(0, 0, 0, 0, 0, 0)
+        module.IDLE_PRIORITY_CLASS = 64
+        module.BELOW_NORMAL_PRIORITY_CLASS = 16384
+        module.NORMAL_PRIORITY_CLASS = 32
+        module.ABOVE_NORMAL_PRIORITY_CLASS = 32768
+        module.HIGH_PRIORITY_CLASS = 128
+        module.IOPRIO_VERYLOW = 0
+        module.IOPRIO_LOW = 1
+        module.IOPRIO_NORMAL = 2
+        module.IOPRIO_HIGH = 3
+        return module
+
+    # --- win32gui / win32process ---
+    def win32gui_module(self):
+        """Construye el módulo falso `win32gui`."""
+        module = types.ModuleType("win32gui")
+        visible = {hwnd: vis for hwnd, _, vis, _ in self.windows}
+        titles = {hwnd: title for hwnd, _, _, title in self.windows}
+
+        def enum_windows(callback, extra):
+            for hwnd, _, _, _ in self.windows:
+                if not callback(hwnd, extra):
+                    break
+
+        module.EnumWindows = enum_windows
+        module.IsWindowVisible = visible.get
+        module.GetWindowText = titles.get
+        return module
+
+    def win32process_module(self):
+        """Construye el módulo falso `win32process`."""
+        module = types.ModuleType("win32process")
+        owners = {hwnd: pid for hwnd, pid, _, _ in self.windows}
+        module.GetWindowThreadProcessId = lambda hwnd: (hwnd + 1, owners.get(hwnd, 0))
+        return module
+
+    # --- winreg ---
+    def winreg_module(self):
+        """Construye el módulo falso `winreg` sobre un diccionario en memoria."""
+        return FakeWinreg(self.registry)
+
+    def populate_registry(self, entries=200):
+        """Crea entradas Run y StartupApproved sintéticas."""
+        run_path = r"Software\Microsoft\Windows\CurrentVersion\Run"
+        approved = r"Software\Microsoft\Windows\CurrentVersion\Explorer\StartupApproved\Run"
+        for root in (FakeWinreg.HKEY_CURRENT_USER, FakeWinreg.HKEY_LOCAL_MACHINE):
+            run_key = self.registry.setdefault((root, run_path.lower()), {})
+            approved_key = self.registry.setdefault((root, approved.lower()), {})
+            for i in range(entries // 2):
+                name = f"App{i}"
+                run_key[name] = (f'"C:\\Program Files\\App{i}\\app{i}.exe" --minimized', 1)
+                approved_key[name] = (bytes([2 if i % 3 else 3]) + b"\x00" * 7, 3)
+
+
+class _FakeKey:
+    """Clave abierta del registro falso (gestor de contexto)."""
+    def __init__(self, values):
+        self.values = values
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class FakeWinreg(types.ModuleType):
+    """Módulo `winreg` mínimo con las funciones usadas por StartupTab."""
+    HKEY_CURRENT_USER = 0x80000001
+    HKEY_LOCAL_MACHINE = 0x80000002
+    KEY_READ = 0x20019
+    KEY_SET_VALUE = 0x0002
+    REG_SZ = 1
+    REG_BINARY = 3
+
+    def __init__(self, registry):
+        super().__init__("winreg")
+        self.registry = registry
+
+    # pylint: disable=invalid-name,unused-argument
+    def OpenKey(self, root, path, reserved=0, access=KEY_READ):
+        """Abre una clave existente."""
+        values = self.registry.get((root, path.lower()))
+        if values is None:
+            raise FileNotFoundError(path)
+        return _FakeKey(values)
+
+    def EnumValue(self, key, index):
+        """Devuelve el valor `index` de la clave."""
+        items = list(key.values.items())
+        if index >= len(items):
+            raise OSError("No more data")
+        name, (value, regtype) = items[index]
+        return name, value, regtype
+
+    def QueryValueEx(self, key, name):
+        """Lee un valor por nombre."""
+        if name not in key.values:
+            raise FileNotFoundError(name)
+        return key.values[name]
+
+    def SetValueEx(self, key, name, reserved, regtype, value):
+        """Escribe un valor."""
+        key.values[name] = (value, regtype)
+
+
+def fake_schtasks(tasks=50):
+    """Namespace `subprocess` cuyo `check_output` imita `schtasks /query /fo CSV /v`."""
+    header = '"TaskName","Schedule Type","Task To Run","Status"'
+    rows = [
+        f'"\\Tarea{i}","{"At logon time" if i % 2 else "Daily"}",'
+        f'"C:\\Tools\\task{i}.exe","{"Ready" if i % 3 else "Disabled"}"'
+        for i in range(tasks)
+    ]
+    output = "\n".join([header] + rows)
+    return types.SimpleNamespace(
+        check_output=lambda *args, **kwargs: output,
+        run=lambda *args, **kwargs: types.SimpleNamespace(stdout="", returncode=0),
+        Popen=lambda *args, **kwargs: None,
+    )
+
+
+# ---------------------------------------------------------------- ctypes ---
+
+class _FakeFunction:
+    """Función de DLL falsa que admite argtypes/restype."""
+    def __init__(self, func):
+        self.func = func
+        self.argtypes = None
+        self.restype = None
+
+    def __call__(self, *args):
+        return self.func(*args)
+
+
+class _FakeDll:
+    """DLL falsa con atributos arbitrarios."""
+    def __init__(self, **functions):
+        for name, func in functions.items():
+            setattr(self, name, _FakeFunction(func))
+
+
+def _fake_kernel32(system):
+    handles = {}
+
+    def open_process(access, inherit, pid):  # pylint: disable=unused-argument
+        proc = system.processes.get(pid)
+        if proc is None or proc.protected:
+            return 0
+        handles[pid + 1] = pid
+        return pid + 1
+
+    return _FakeDll(
+        OpenProcess=open_process,
+        CloseHandle=lambda handle: handles.pop(handle, None) is not None,
+        SetProcessWorkingSetSize=lambda handle, lo, hi: 1 if handle in handles else 0,
+    )
+
+
+def install(system):
+    """
+    Registra los módulos falsos en sys.modules y en ctypes.
+    Debe llamarse antes de importar los módulos de la aplicación.
+    """
+    sys.modules["psutil"] = system.psutil_module()
+    sys.modules["win32gui"] = system.win32gui_module()
+    sys.modules["win32process"] = system.win32process_module()
+    sys.modules["winreg"] = system.winreg_module()
+
+    kernel32 = _fake_kernel32(system)
+    windll = types.SimpleNamespace(
+        shell32=_FakeDll(IsUserAnAdmin=lambda: 1, ShellExecuteW=lambda *a: 42),
+        user32=_FakeDll(
+            GetForegroundWindow=lambda: system.windows[0][0],
+            GetWindowThreadProcessId=lambda hwnd, pid_ref: 1,
+        ),
+        kernel32=kernel32,
+    )
+    ctypes.windll = windll
+    ctypes.WinDLL = lambda name, use_last_error=False: kernel32
+
+    os.environ.setdefault("APPDATA", "/nonexistent/appdata")
+    os.environ.setdefault("ProgramData", "/nonexistent/programdata")
+
+
+# ------------------------------------------------------ sistema de archivos ---
+
+class FakeFileSystem:
+    """
+    Árbol de directorios en memoria con una fracción de archivos
+    "en uso" que no se pueden borrar.
+    """
+    def __init__(self, roots, files=100_000, per_dir=1000, locked=0.02, seed=99):
+        rng = random.Random(seed)
+        self.dirs = {}
+        self.locked = set()
+        per_root = max(1, files // len(roots))
+        for root in roots:
+            self.dirs[root] = ([], [])
+            made = 0
+            index = 0
+            while made < per_root:
+                sub = posixpath.join(root, f"tmp{index:05d}")
+                count = min(per_dir, per_root - made)
+                names = [f"f{n:06d}.tmp" for n in range(count)]
+                self.dirs[root][0].append(f"tmp{index:05d}")
+                self.dirs[sub] = ([], names)
+                for name in names:
+                    if rng.random() < locked:
+                        self.locked.add(posixpath.join(sub, name))
+                made += count
+                index += 1
+
+    def exists(self, path):
+        """Indica si el directorio existe."""
+        return path in self.dirs
+
+    def walk(self, top, topdown=True):
+        """os.walk sobre el árbol en memoria."""
+        if top not in self.dirs:
+            return
+        subdirs, files = self.dirs[top]
+        if topdown:
+            yield top, list(subdirs), list(files)
+        for sub in list(subdirs):
+            yield from self.walk(posixpath.join(top, sub), topdown)
+        if not topdown:
+            yield top, list(subdirs), list(files)
+
+    def remove(self, path):
+        """Borra un archivo (falla si está en uso)."""
+        if path in self.locked:
+            raise PermissionError(13, "El archivo está en uso", path)
+        parent, name = posixpath.split(path)
+        self.dirs[parent][1].remove(name)
+
+    def rmtree(self, path, ignore_errors=False):
+        """Borra un directorio si ya no contiene archivos bloqueados."""
+        subdirs, files = self.dirs.get(path, ([], []))
+        if files or subdirs:
+            if ignore_errors:
+                return
+            raise OSError(39, "Directorio no vacío", path)
+        self.dirs.pop(path, None)
+        parent, name = posixpath.split(path)
+        if parent in self.dirs and name in self.dirs[parent][0]:
+            self.dirs[parent][0].remove(name)
+
+    def os_module(self):
+        """Namespace compatible con el uso de `os` en optimizer_manager."""
+        path = types.SimpleNamespace(
+            join=posixpath.join,
+            exists=self.exists,
+            expandvars=lambda p: p.replace("%LocalAppData%", "/fake/local")
+                                 .replace("%AppData%", "/fake/roaming")
+                                 .replace("\\", "/"),
+            dirname=posixpath.dirname,
+        )
+        return types.SimpleNamespace(path=path, walk=self.walk, remove=self.remove)
+
+    def shutil_module(self):
+        """Namespace compatible con el uso de `shutil` en optimizer_manager."""
+        return types.SimpleNamespace(rmtree=self.rmtree)
+
+
+# ---------------------------------------------------------------- sensores ---
+
+class FakeSensorSource:
+    """
+    Fuente de sensores con la misma interfaz que
+    `throttle_detector.PsutilSensorSource`. Los atributos se cambian entre
+    lecturas para simular escenarios (carga, caída de frecuencia, calor,
+    batería); cada lectura avanza `step` segundos de reloj.
+    """
+    # pylint: disable=too-many-instance-attributes,too-many-arguments
+    def __init__(self, cores=8, max_mhz=4000.0, step=1.0):
+        self.cores = cores
+        self.max_mhz = max_mhz
+        self.step = step
+        self.now = 0.0
+        self.load = 10.0
+        self.freq_ratio = 1.0
+        self.temp = 55.0
+        self.temp_high = 95.0
+        self.battery = None
+
+    def read(self, now=None):
+        """Lectura sintética con los valores actuales."""
+        # pylint: disable=import-outside-toplevel
+        from system_utils.throttle_detector import SensorReading
+        self.now = self.now + self.step if now is None else now
+        return SensorReading(
+            self.now,
+            [self.load] * self.cores,
+            [self.max_mhz * self.freq_ratio] * self.cores,
+            [self.max_mhz] * self.cores,
+            {"coretemp/Package id 0": (self.temp, self.temp_high)},
+            self.battery,
+        )
+
+
+# --------------------------------------------------------------- servicios ---
+
+class FakeServiceBackend:
+    """
+    Backend de servicios con la interfaz de `services.ServiceBackend`. Los
+    procesos svchost de `system` alojan de 1 a `per_host` servicios (para
+    probar el reparto de anfitriones compartidos) y hay `stopped` detenidos.
+    """
+    name = "falso"
+
+    def __init__(self, system, per_host=4, stopped=50, seed=7):
+        self.system = system
+        self.per_host = per_host
+        self.stopped = stopped
+        self.rng = random.Random(seed)
+        self.calls = 0
+
+    def list_services(self):
+        """Servicios derivados de los procesos vivos del sistema falso."""
+        # pylint: disable=import-outside-toplevel
+        from system_utils.services import ServiceInfo
+        self.calls += 1
+        services = []
+        for pid, proc in sorted(self.system.processes.items()):
+            if proc.name_ != "svchost.exe":
+                continue
+            for index in range(self.rng.randint(1, self.per_host)):
+                name = f"Svc{pid}_{index}"
+                services.append(ServiceInfo(
+                    name, f"Servicio {name}", "En ejecución", "Automático", (pid,)
+                ))
+        for index in range(self.stopped):
+            services.append(ServiceInfo(
+                f"Stopped{index}", f"Servicio detenido {index}", "Detenido", "Manual", ()
+            ))
+        return services
@@ -0,0 +1,212 @@
+"""
+run_benchmarks.py
+Mide las rutas calientes de SystemManager contra la capa falsa de
+`benchmarks.fakes` y compara con una línea base guardada.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.run_benchmarks --processes 1000 --save-baseline
+    python -m benchmarks.run_benchmarks --processes 1000
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tracemalloc
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+# pylint: disable=wrong-import-position
+from benchmarks import fakes
+
+BASELINE_FILE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+TEMP_ROOTS = ["/fake/tmp", "C:\\Windows\\Temp", "/fake/local/Temp", "/fake/roaming/Temp"]
+
+
+def percentile(values, pct):
+    """Percentil por interpolación lineal sobre valores ordenados."""
+    values = sorted(values)
+    if not values:
+        return 0.0
+    pos = (len(values) - 1) * pct / 100
+    low = int(pos)
+    high = min(low + 1, len(values) - 1)
+    return values[low] + (values[high] - values[low]) * (pos - low)
+
+
+def measure(func, repeat, setup=None):
+    """
+    Ejecuta `func` `repeat` veces (con `setup` fuera del tiempo medido)
+    y una vez más bajo tracemalloc para medir asignaciones.
+    """
+    durations = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        func()
+        durations.append((time.perf_counter() - start) * 1000)
+
+    if setup:
+        setup()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    blocks = sum(stat.count_diff for stat in after.compare_to(before, "filename")
+                 if stat.count_diff > 0)
+
+    return {
+        "p50": percentile(durations, 50),
+        "p90": percentile(durations, 90),
+        "p99": percentile(durations, 99),
+        "max": max(durations),
+        "peak_kb": peak / 1024,
+        "blocks": blocks,
+    }
+
+
+def build_benchmarks(args):
+    """Instala la capa falsa, importa la aplicación y devuelve los casos."""
+    system = fakes.FakeSystem(
+        processes=args.processes, windows=args.windows, seed=args.seed
+    )
+    system.populate_registry(args.startup_entries)
+    fakes.install(system)
+
+    # Importar después de instalar los módulos falsos
+    # pylint: disable=import-outside-toplevel
+    from PyQt5.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+
+    import process_manager
+    import startup_manager
+    import optimizer_manager
+    import services_manager
+    from system_utils import memory_cleaner
+    from system_utils import temp_cleaner
+    from system_utils.effect_meter import EffectMeter
+    from system_utils.process_table import ProcessTable
+
+    process_tab = process_manager.ProcessTab()
+    process_tab.timer.stop()
+    startup_manager.subprocess = fakes.fake_schtasks(args.startup_entries // 4)
+    startup_tab = startup_manager.StartupTab()
+    # Sin hilo de muestreo: las mediciones de efecto no terminan ni escriben
+    optimizer_tab = optimizer_manager.OptimizerTab(
+        effect_meter=EffectMeter(start=False)
+    )
+    services_tab = services_manager.ServicesTab(
+        process_tab.watch, fakes.FakeServiceBackend(system)
+    )
+    services_tab.catalog.refresh = float("inf")
+    services_tab.catalog.reload()
+    services_tab.processes = process_tab.watch.processes
+
+    table = ProcessTable()
+    snapshot = list(process_tab.watch.processes.values())
+
+    def table_update():
+        table.update(snapshot, time.monotonic())
+
+    def table_queries():
+        table.rates()
+        table.order("rss", limit=20)
+        table.group_by("rss")
+
+    def classify_all():
+        foreground = process_manager.get_foreground_pid()
+        for proc in system.process_iter():
+            process_manager.classify_process(proc, foreground)
+
+    def reset_temp():
+        filesystem = fakes.FakeFileSystem(TEMP_ROOTS, files=args.temp_files)
+        temp_cleaner.os = filesystem.os_module()
+        temp_cleaner.shutil = filesystem.shutil_module()
+        temp_cleaner.tempfile = type("tempfile", (), {
+            "gettempdir": staticmethod(lambda: TEMP_ROOTS[0])
+        })
+        optimizer_tab.log.clear()
+
+    cases = [
+        ("ProcessTab.update_processes", process_tab.update_processes, system.tick),
+        (f"classify_process x{args.processes}", classify_all, None),
+        ("StartupTab.list_items", startup_tab.list_items, None),
+        ("trim_working_set_all", memory_cleaner.trim_working_set_all, None),
+        ("ServicesTab.refresh", services_tab.refresh, None),
+        ("ProcessTable.update", table_update, None),
+        ("ProcessTable rates+order+group_by", table_queries, None),
+        ("OptimizerTab.clean_temp_files", optimizer_tab.clean_temp_files, reset_temp),
+    ]
+    return app, cases
+
+
+def compare(results, baseline, tolerance):
+    """Devuelve la lista de regresiones respecto a la línea base."""
+    regressions = []
+    for name, stats in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        for key in ("p50", "p90"):
+            if base[key] > 0 and stats[key] > base[key] * (1 + tolerance):
+                regressions.append(
+                    f"{name}: {key} {stats[key]:.2f} ms > {base[key]:.2f} ms "
+                    f"(+{(stats[key] / base[key] - 1) * 100:.0f}%)"
+                )
+    return regressions
+
+
+def main(argv=None):
+    """Punto de entrada."""
+    parser = argparse.ArgumentParser(description="Benchmarks de SystemManager")
+    parser.add_argument("--processes", type=int, default=1000, help="100 a 10000")
+    parser.add_argument("--windows", type=int, default=1000)
+    parser.add_argument("--temp-files", type=int, default=100_000, help="hasta 1000000")
+    parser.add_argument("--startup-entries", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--only", help="ejecutar solo los casos que contengan este texto")
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="margen antes de marcar regresión (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    _app, cases = build_benchmarks(args)
+
+    results = {}
+    print(f"{'Operación':40} {'p50':>9} {'p90':>9} {'p99':>9} {'max':>9} "
+          f"{'pico KB':>9} {'bloques':>9}")
+    for name, func, setup in cases:
+        if args.only and args.only not in name:
+            continue
+        repeat = max(1, args.repeat if "clean_temp" not in name else min(args.repeat, 3))
+        stats = measure(func, repeat, setup)
+        results[name] = stats
+        print(f"{name:40} {stats['p50']:9.2f} {stats['p90']:9.2f} {stats['p99']:9.2f} "
+              f"{stats['max']:9.2f} {stats['peak_kb']:9.0f} {stats['blocks']:9d}")
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=4)
+        print(f"Línea base guardada en {args.baseline}")
+        return 0
+
+    if os.path.exists(args.baseline):
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            print("\nRegresiones detectadas:")
+            for line in regressions:
+                print(f"  - {line}")
+            return 1
+        print("\nSin regresiones respecto a la línea base.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
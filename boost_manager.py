@@ -0,0 +1,152 @@
+"""Editor de perfiles del modo primer plano."""
+from datetime import datetime
+# pylint: disable=no-name-in-module
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem,
+    QComboBox, QPushButton, QTextEdit, QLabel, QDialogButtonBox,
+    QMessageBox, QHeaderView, QCheckBox
+)
+from PyQt5.QtCore import QTimer, Qt
+from system_utils.foreground_boost import BOOST_PRIORITIES, default_profile
+from governor_manager import PRIORITY_LABELS
+
+ACTION_LABELS = {
+    "lower": "Bajar prioridad",
+    "suspend": "Suspender",
+}
+
+COLUMNS = ["Aplicación en primer plano", "Procesos a frenar", "Acción",
+           "Prioridad", "Recortar memoria"]
+
+
+class BoostDialog(QDialog):
+    """Diálogo para editar los perfiles y ver el estado y el registro."""
+    def __init__(self, boost, parent=None, new_app=None):
+        super().__init__(parent)
+        self.boost = boost
+        self.setWindowTitle("Modo primer plano")
+        self.resize(850, 480)
+
+        layout = QVBoxLayout(self)
+        self.enabled_check = QCheckBox("Activar el modo primer plano")
+        self.enabled_check.setChecked(boost.enabled)
+        layout.addWidget(self.enabled_check)
+        layout.addWidget(QLabel(
+            "Mientras la aplicación está delante se frenan los procesos indicados "
+            "(nombres o rutas separados por comas; admite *, ?) y se restauran al "
+            "cambiar de ventana.\nSuspender puede bloquear programas que dependan "
+            "de los procesos suspendidos."
+        ))
+        self.status = QLabel()
+        layout.addWidget(self.status)
+
+        self.table = QTableWidget(0, len(COLUMNS))
+        self.table.setHorizontalHeaderLabels(COLUMNS)
+        self.table.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
+        layout.addWidget(self.table)
+
+        for profile in boost.profiles:
+            self.add_row(profile)
+        if new_app:
+            self.add_row(default_profile(new_app))
+
+        row_buttons = QHBoxLayout()
+        btn_add = QPushButton("Agregar perfil")
+        btn_remove = QPushButton("Quitar perfil")
+        btn_add.clicked.connect(lambda: self.add_row(default_profile()))
+        btn_remove.clicked.connect(self.remove_selected)
+        row_buttons.addWidget(btn_add)
+        row_buttons.addWidget(btn_remove)
+        row_buttons.addStretch()
+        layout.addLayout(row_buttons)
+
+        layout.addWidget(QLabel("Acciones realizadas"))
+        self.log = QTextEdit()
+        self.log.setReadOnly(True)
+        layout.addWidget(self.log)
+        self.logged = 0
+
+        buttons = QDialogButtonBox(QDialogButtonBox.Save | QDialogButtonBox.Cancel)
+        buttons.accepted.connect(self.save)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+
+        # El estado cambia desde el hilo del gancho: se consulta mientras está abierto
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.refresh_status)
+        self.timer.start(500)
+        self.refresh_status()
+
+    def refresh_status(self):
+        """Muestra el estado actual y las acciones nuevas del registro."""
+        text = self.boost.status()
+        if self.boost.enabled and not self.boost.hooked:
+            text += " (el seguimiento del primer plano solo está disponible en Windows)"
+        self.status.setText(text)
+        actions = list(self.boost.actions)
+        for timestamp, message in actions[self.logged:]:
+            hora = datetime.fromtimestamp(timestamp).strftime("%H:%M:%S")
+            self.log.append(f"[{hora}] {message}")
+        self.logged = len(actions)
+
+    @staticmethod
+    def _combo(labels, value):
+        """Crea un combo con los valores indicados."""
+        combo = QComboBox()
+        for key, label in labels.items():
+            combo.addItem(label, key)
+        combo.setCurrentIndex(max(0, combo.findData(value)))
+        return combo
+
+    def add_row(self, profile):
+        """Agrega una fila editable con los valores de un perfil."""
+        row = self.table.rowCount()
+        self.table.insertRow(row)
+        self.table.setItem(row, 0, QTableWidgetItem(profile["app"]))
+        self.table.setItem(row, 1, QTableWidgetItem(", ".join(profile["targets"])))
+        self.table.setCellWidget(row, 2, self._combo(ACTION_LABELS, profile["action"]))
+        self.table.setCellWidget(row, 3, self._combo(
+            {key: PRIORITY_LABELS[key] for key in BOOST_PRIORITIES}, profile["priority"]
+        ))
+        trim = QTableWidgetItem()
+        trim.setFlags(trim.flags() | Qt.ItemFlag.ItemIsUserCheckable)
+        trim.setCheckState(Qt.CheckState.Checked if profile["trim"] else Qt.CheckState.Unchecked)
+        self.table.setItem(row, 4, trim)
+
+    def remove_selected(self):
+        """Elimina las filas seleccionadas."""
+        rows = sorted({index.row() for index in self.table.selectedIndexes()}, reverse=True)
+        for row in rows:
+            self.table.removeRow(row)
+
+    def read_profiles(self):
+        """Convierte la tabla en una lista de perfiles."""
+        profiles = []
+        for row in range(self.table.rowCount()):
+            app = (self.table.item(row, 0).text() if self.table.item(row, 0) else "").strip()
+            if not app:
+                continue
+            profile = default_profile(app)
+            targets = self.table.item(row, 1).text() if self.table.item(row, 1) else ""
+            profile["targets"] = [t.strip() for t in targets.split(",") if t.strip()]
+            if not profile["targets"]:
+                raise ValueError(f"El perfil '{app}' no indica procesos a frenar")
+            profile["action"] = self.table.cellWidget(row, 2).currentData()
+            profile["priority"] = self.table.cellWidget(row, 3).currentData()
+            profile["trim"] = self.table.item(row, 4).checkState() == Qt.CheckState.Checked
+            profiles.append(profile)
+        return profiles
+
+    def save(self):
+        """Valida y guarda los perfiles."""
+        try:
+            profiles = self.read_profiles()
+        except ValueError as e:
+            QMessageBox.warning(self, "Modo primer plano", f"Valor no válido: {e}")
+            return
+        config = dict(self.boost.config, enabled=self.enabled_check.isChecked(),
+                      profiles=profiles)
+        if self.boost.save_config(config):
+            self.accept()
+        else:
+            QMessageBox.critical(self, "Error", "No se pudo guardar la configuración")
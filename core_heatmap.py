@@ -0,0 +1,140 @@
+"""Mapa de calor por núcleo lógico con historial, pintado en un solo paintEvent."""
+import numpy as np
+import psutil
+# pylint: disable=no-name-in-module
+from PyQt5.QtWidgets import QWidget
+from PyQt5.QtGui import QPainter, QImage, QColor
+from PyQt5.QtCore import QTimer, QRect, Qt
+from system_utils.profiler import instrument
+
+
+def _build_color_table():
+    """Paleta de 101 colores (0-100 %): azul oscuro → verde → amarillo → rojo."""
+    stops = [(0, (20, 30, 60)), (30, (30, 160, 80)), (70, (240, 210, 40)), (100, (220, 40, 30))]
+    table = []
+    for value in range(101):
+        for (v0, c0), (v1, c1) in zip(stops, stops[1:]):
+            if v0 <= value <= v1:
+                t = (value - v0) / (v1 - v0)
+                r, g, b = (round(a + (b - a) * t) for a, b in zip(c0, c1))
+                table.append(QColor(r, g, b).rgb())
+                break
+    return table
+
+
+COLOR_TABLE = _build_color_table()
+
+
+class CoreHeatmap(QWidget):
+    """
+    Carga actual por núcleo (cuadrícula) y franja de historial (un núcleo
+    por fila). Los datos viven en un búfer circular NumPy y se pintan como
+    imágenes indexadas, así el coste no depende de widgets por núcleo.
+    Las cargas y frecuencias salen del colector "cpu" del runtime.
+    """
+    def __init__(self, collectors, history=120, interval_ms=250, parent=None):
+        super().__init__(parent)
+        self.collectors = collectors
+        self.last_sample = None
+        self.ncores = psutil.cpu_count(logical=True) or 1
+        self.history = history
+        self.buffer = np.zeros((self.ncores, history), dtype=np.uint8)
+        self.freq = np.zeros(self.ncores, dtype=np.float32)
+        self.max_freq = np.zeros(self.ncores, dtype=np.float32)
+        # Columnas tomadas durante un episodio de limitación de frecuencia
+        self.throttled = np.zeros(history, dtype=bool)
+        self.throttling = False
+        self.head = 0
+        self.grid_cols = int(np.ceil(np.sqrt(self.ncores * 4)))
+        self.grid_rows = int(np.ceil(self.ncores / self.grid_cols))
+
+        self.setMinimumHeight(60 + min(self.ncores, 64) * 2)
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.sample)
+        self.timer.start(interval_ms)
+
+    def set_interval(self, interval_ms):
+        """Cambia la frecuencia de muestreo (máximo 4 Hz)."""
+        self.timer.setInterval(max(250, interval_ms))
+
+    @instrument("CoreHeatmap.sample")
+    def sample(self):
+        """Añade la última muestra del colector (si es nueva) y programa un repintado."""
+        sample = self.collectors.get("cpu.per_core")
+        if sample is None or sample is self.last_sample:
+            return
+        self.last_sample = sample
+        loads = sample.value[:self.ncores]
+        self.buffer[:len(loads), self.head] = np.clip(loads, 0, 100)
+        freqs = self.collectors.latest("cpu.freq") or []
+        if len(freqs) == self.ncores:
+            self.freq[:] = freqs
+            self.max_freq[:] = self.collectors.latest("cpu.max_freq")
+        self.throttled[self.head] = self.throttling
+        self.head = (self.head + 1) % self.history
+        if self.isVisible():
+            self.update()
+
+    def _image(self, data):
+        """Convierte una matriz uint8 (0-100) en QImage indexada."""
+        data = np.ascontiguousarray(data)
+        height, width = data.shape
+        image = QImage(data.data, width, height, data.strides[0], QImage.Format_Indexed8)
+        image.setColorTable(COLOR_TABLE)
+        # Copiar para que la imagen no dependa del búfer temporal
+        return image.copy()
+
+    @instrument("CoreHeatmap.paintEvent")
+    def paintEvent(self, event):  # pylint: disable=invalid-name,unused-argument
+        """Pinta la cuadrícula actual, el historial y un resumen."""
+        painter = QPainter(self)
+        width = self.width()
+        text_height = 16
+        grid_height = max(20, (self.height() - text_height) // 3)
+        strip_top = grid_height + 4
+        strip_height = self.height() - strip_top - text_height
+
+        latest = (self.head - 1) % self.history
+        current = self.buffer[:, latest]
+
+        # Cuadrícula de carga actual
+        padded = np.zeros(self.grid_cols * self.grid_rows, dtype=np.uint8)
+        padded[:self.ncores] = current
+        painter.drawImage(
+            QRect(0, 0, width, grid_height),
+            self._image(padded.reshape(self.grid_rows, self.grid_cols))
+        )
+
+        # Historial: columnas en orden cronológico (la más reciente a la derecha)
+        ordered = np.roll(self.buffer, -self.head, axis=1)
+        painter.drawImage(QRect(0, strip_top, width, strip_height), self._image(ordered))
+
+        # Marca roja sobre el historial donde hubo limitación de frecuencia
+        marked = np.flatnonzero(np.roll(self.throttled, -self.head))
+        if marked.size:
+            column = width / self.history
+            for index in marked:
+                painter.fillRect(
+                    int(index * column), strip_top - 3, max(1, int(column + 0.5)), 3,
+                    Qt.GlobalColor.red
+                )
+
+        # Resumen del núcleo más cargado
+        hottest = int(np.argmax(current))
+        summary = (
+            f"Núcleo más cargado: #{hottest} {current[hottest]}% | "
+            f"Media: {current.mean():.0f}%"
+        )
+        if self.freq[hottest]:
+            summary += f" | {self.freq[hottest]:.0f} MHz"
+            if self.max_freq[hottest]:
+                summary += f" / {self.max_freq[hottest]:.0f} MHz"
+        if self.throttling:
+            summary += " | Frecuencia limitada"
+        painter.setPen(Qt.GlobalColor.black)
+        painter.drawText(
+            QRect(0, self.height() - text_height, width, text_height),
+            Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, summary
+        )
+        painter.end()
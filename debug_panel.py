@@ -0,0 +1,122 @@
+"""Panel de depuración oculto: coste propio de SystemManager (Ctrl+Shift+D)."""
+import os
+import time
+import psutil
+# pylint: disable=no-name-in-module
+from PyQt5.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QTreeWidget,
+    QTreeWidgetItem, QPushButton, QSpinBox
+)
+from PyQt5.QtCore import QTimer
+from system_utils.profiler import PROFILER
+
+PROFILE_DIR = os.path.dirname(__file__)
+
+
+class DebugPanel(QWidget):
+    """Muestra CPU y RSS del propio proceso, las rutas más lentas y los colectores."""
+    def __init__(self, collectors=None, parent=None):
+        super().__init__(parent)
+        self.collectors = collectors
+        self.setWindowTitle("SystemManager - depuración")
+        self.resize(640, 360)
+        self.process = psutil.Process(os.getpid())
+        self.process.cpu_percent(interval=None)
+        self.profile_file = None
+
+        layout = QVBoxLayout(self)
+        self.usage_label = QLabel("CPU propia: - | RSS: -")
+        layout.addWidget(self.usage_label)
+
+        self.tree = QTreeWidget()
+        self.tree.setHeaderLabels(
+            ["Ruta", "Llamadas", "Media ms", "p95 ms", "Máx ms", "CPU total ms"]
+        )
+        self.tree.setRootIsDecorated(False)
+        layout.addWidget(self.tree)
+
+        # Colectores: intervalo vigente frente al declarado y coste frente al presupuesto
+        self.collectors_tree = QTreeWidget()
+        self.collectors_tree.setHeaderLabels(
+            ["Colector", "Intervalo s", "Declarado s", "Coste ms", "Presupuesto ms",
+             "Ejecuciones", "Estado"]
+        )
+        self.collectors_tree.setRootIsDecorated(False)
+        self.collectors_tree.setMaximumHeight(170)
+        if collectors is not None:
+            layout.addWidget(self.collectors_tree)
+
+        # Captura cProfile de los próximos N ticks
+        capture_bar = QHBoxLayout()
+        self.ticks_spin = QSpinBox()
+        self.ticks_spin.setRange(1, 1000)
+        self.ticks_spin.setValue(50)
+        self.ticks_spin.setSuffix(" ticks")
+        self.capture_button = QPushButton("Capturar cProfile")
+        self.capture_button.clicked.connect(self.start_capture)
+        self.capture_label = QLabel("")
+        capture_bar.addWidget(self.ticks_spin)
+        capture_bar.addWidget(self.capture_button)
+        capture_bar.addWidget(self.capture_label)
+        capture_bar.addStretch()
+        layout.addLayout(capture_bar)
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+
+    def showEvent(self, event):  # pylint: disable=invalid-name
+        """Solo se refresca mientras está visible."""
+        self.refresh()
+        self.timer.start(1000)
+        super().showEvent(event)
+
+    def hideEvent(self, event):  # pylint: disable=invalid-name
+        """Detiene el refresco al ocultarse."""
+        self.timer.stop()
+        super().hideEvent(event)
+
+    def refresh(self):
+        """Actualiza el uso propio y la tabla de rutas."""
+        try:
+            cpu = self.process.cpu_percent(interval=None)
+            rss_mb = self.process.memory_info().rss / (1024 * 1024)
+            self.usage_label.setText(f"CPU propia: {cpu:.1f}% | RSS: {rss_mb:.1f} MB")
+        except psutil.Error:
+            pass
+
+        self.tree.clear()
+        for row in PROFILER.snapshot():
+            QTreeWidgetItem(self.tree, [
+                row["name"],
+                str(row["count"]),
+                f"{row['mean_ms']:.2f}",
+                f"{row['p95_ms']:.2f}",
+                f"{row['max_ms']:.2f}",
+                f"{row['cpu_ms']:.0f}",
+            ])
+
+        self.collectors_tree.clear()
+        for row in self.collectors.status() if self.collectors is not None else []:
+            QTreeWidgetItem(self.collectors_tree, [
+                row["name"],
+                "-" if row["interval"] is None else f"{row['interval']:.2f}",
+                "-" if row["declared"] is None else f"{row['declared']:.2f}",
+                "-" if row["cost_ms"] is None else f"{row['cost_ms']:.2f}",
+                f"{row['budget_ms']:.1f}",
+                str(row["runs"]),
+                row["status"],
+            ])
+
+        if PROFILER.capturing:
+            self.capture_label.setText("Capturando...")
+        elif not self.capture_button.isEnabled():
+            self.capture_button.setEnabled(True)
+            self.capture_label.setText(f"Guardado en {self.profile_file}")
+
+    def start_capture(self):
+        """Inicia la captura cProfile."""
+        stamp = time.strftime("%Y%m%d_%H%M%S")
+        self.profile_file = os.path.join(PROFILE_DIR, f"systemmanager_profile_{stamp}.prof")
+        PROFILER.start_capture(self.ticks_spin.value(), self.profile_file)
+        self.capture_button.setEnabled(False)
+        self.capture_label.setText("Capturando...")
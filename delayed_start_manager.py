@@ -0,0 +1,153 @@
+"""Configuración del inicio escalonado y tiempos de las sesiones registradas."""
+from datetime import datetime
+# pylint: disable=no-name-in-module
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QFormLayout, QTableWidget, QTableWidgetItem,
+    QComboBox, QSpinBox, QDoubleSpinBox, QLabel, QDialogButtonBox,
+    QMessageBox, QHeaderView, QTreeWidget, QTreeWidgetItem
+)
+from PyQt5.QtCore import Qt
+from system_utils.delayed_start import MODES
+
+MODE_LABELS = {
+    "escalonado": "Escalonado (por prioridad, con reposo)",
+    "directo": "Directo (todo a la vez, para comparar)",
+}
+
+COLUMNS = ["Programa", "Comando", "Prioridad", "Activo"]
+
+
+class DelayedStartDialog(QDialog):
+    """Diálogo con las entradas del lanzador, sus ajustes y el historial."""
+    def __init__(self, store, parent=None):
+        super().__init__(parent)
+        self.store = store
+        self.setWindowTitle("Inicio escalonado")
+        self.resize(800, 600)
+        settings = store.settings
+
+        layout = QVBoxLayout(self)
+        layout.addWidget(QLabel(
+            "SystemManager lanza estas entradas al iniciar sesión, de menor a mayor "
+            "prioridad, sin superar los arranques simultáneos y esperando a que la "
+            "CPU y el disco estén en reposo."
+        ))
+
+        form = QFormLayout()
+        self.mode_combo = QComboBox()
+        for mode in MODES:
+            self.mode_combo.addItem(MODE_LABELS[mode], mode)
+        self.mode_combo.setCurrentIndex(max(0, self.mode_combo.findData(settings["mode"])))
+        self.delay_spin = self._seconds(settings["initial_delay"], 0, 600)
+        self.concurrent_spin = QSpinBox()
+        self.concurrent_spin.setRange(1, 16)
+        self.concurrent_spin.setValue(int(settings["max_concurrent"]))
+        self.cpu_spin = QSpinBox()
+        self.cpu_spin.setRange(5, 100)
+        self.cpu_spin.setSuffix(" %")
+        self.cpu_spin.setValue(int(settings["cpu_max"]))
+        self.disk_spin = QSpinBox()
+        self.disk_spin.setRange(1, 1000)
+        self.disk_spin.setSuffix(" MB/s")
+        self.disk_spin.setValue(int(settings["disk_max"] / (1024 * 1024)))
+        self.gate_spin = self._seconds(settings["gate_timeout"], 1, 600)
+        form.addRow("Modo:", self.mode_combo)
+        form.addRow("Retardo inicial:", self.delay_spin)
+        form.addRow("Arranques simultáneos:", self.concurrent_spin)
+        form.addRow("Reposo: CPU por debajo de", self.cpu_spin)
+        form.addRow("Reposo: disco por debajo de", self.disk_spin)
+        form.addRow("Lanzar igualmente tras", self.gate_spin)
+        layout.addLayout(form)
+
+        self.table = QTableWidget(0, len(COLUMNS))
+        self.table.setHorizontalHeaderLabels(COLUMNS)
+        self.table.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
+        for item in store.items:
+            self.add_row(item)
+        layout.addWidget(self.table)
+
+        layout.addWidget(QLabel("Sesiones registradas"))
+        self.summary = QLabel("\n".join(store.summary()) or "Sin sesiones registradas")
+        layout.addWidget(self.summary)
+        self.sessions = QTreeWidget()
+        self.sessions.setHeaderLabels(["Sesión / programa", "Modo", "Lanzado", "Listo", "Estado"])
+        self.load_sessions()
+        layout.addWidget(self.sessions)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.Save | QDialogButtonBox.Cancel)
+        buttons.accepted.connect(self.save)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+
+    @staticmethod
+    def _seconds(value, low, high):
+        """Selector de segundos."""
+        spin = QDoubleSpinBox()
+        spin.setRange(low, high)
+        spin.setSuffix(" s")
+        spin.setValue(float(value))
+        return spin
+
+    def add_row(self, item):
+        """Agrega una fila con una entrada del lanzador."""
+        row = self.table.rowCount()
+        self.table.insertRow(row)
+        name = QTableWidgetItem(item["name"])
+        name.setFlags(name.flags() & ~Qt.ItemFlag.ItemIsEditable)
+        name.setData(Qt.ItemDataRole.UserRole, item)
+        self.table.setItem(row, 0, name)
+        command = item["command"]
+        text = command if isinstance(command, str) else " ".join(command)
+        command_item = QTableWidgetItem(text)
+        command_item.setFlags(command_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
+        self.table.setItem(row, 1, command_item)
+        priority = QSpinBox()
+        priority.setRange(0, 9)
+        priority.setValue(int(item.get("priority", 5)))
+        self.table.setCellWidget(row, 2, priority)
+        enabled = QTableWidgetItem()
+        enabled.setFlags(enabled.flags() | Qt.ItemFlag.ItemIsUserCheckable)
+        enabled.setCheckState(
+            Qt.CheckState.Checked if item.get("enabled", True) else Qt.CheckState.Unchecked
+        )
+        self.table.setItem(row, 3, enabled)
+
+    def load_sessions(self):
+        """Muestra las sesiones (más recientes primero) con el detalle por programa."""
+        for session in reversed(self.store.sessions()):
+            fecha = datetime.fromtimestamp(session["started"]).strftime("%d/%m %H:%M")
+            usable = session.get("usable_after")
+            parent = QTreeWidgetItem(self.sessions, [
+                fecha, session.get("mode", ""), "",
+                f"{usable:.1f} s" if usable is not None else "-",
+                "Escritorio utilizable"
+                + (" (sin llegar al reposo)" if session.get("usable_timeout") else "")
+            ])
+            for record in session["items"]:
+                QTreeWidgetItem(parent, [
+                    record["name"], record.get("gate") or "",
+                    "-" if record["launched"] is None else f"{record['launched']:.1f} s",
+                    "-" if record["ready"] is None else f"{record['ready']:.1f} s",
+                    record["status"],
+                ])
+
+    def save(self):
+        """Guarda los ajustes y las prioridades."""
+        self.store.settings.update({
+            "mode": self.mode_combo.currentData(),
+            "initial_delay": self.delay_spin.value(),
+            "max_concurrent": self.concurrent_spin.value(),
+            "cpu_max": float(self.cpu_spin.value()),
+            "disk_max": self.disk_spin.value() * 1024 * 1024,
+            "gate_timeout": self.gate_spin.value(),
+        })
+        for row in range(self.table.rowCount()):
+            item = self.table.item(row, 0).data(Qt.ItemDataRole.UserRole)
+            item["priority"] = self.table.cellWidget(row, 2).value()
+            item["enabled"] = self.table.item(row, 3).checkState() == Qt.CheckState.Checked
+        try:
+            self.store.save()
+        except OSError as e:
+            QMessageBox.critical(self, "Error", f"No se pudo guardar la configuración: {e}")
+            return
+        self.accept()
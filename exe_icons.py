@@ -0,0 +1,33 @@
+"""Presentación de los metadatos de ejecutables (iconos y columnas) en el hilo de la interfaz."""
+# pylint: disable=no-name-in-module
+from PyQt5.QtWidgets import QApplication, QStyle
+from PyQt5.QtGui import QIcon, QImage, QPixmap
+from system_utils.exe_metadata import format_size
+
+
+def exe_icon(entry):
+    """QIcon de una entrada de la caché; se crea una sola vez por ejecutable."""
+    if entry.qicon is None:
+        if entry.icon is not None:
+            width, height, data = entry.icon
+            image = QImage(data, width, height, width * 4, QImage.Format_ARGB32).copy()
+            entry.qicon = QIcon(QPixmap.fromImage(image))
+        else:
+            entry.qicon = QApplication.style().standardIcon(QStyle.StandardPixmap.SP_FileIcon)
+    return entry.qicon
+
+
+def apply_exe_metadata(item, entry, first_column):
+    """
+    Pone el icono en la columna 0 y descripción, versión y tamaño a partir
+    de `first_column`; el editor va en el tooltip de la descripción.
+    """
+    item.setIcon(0, exe_icon(entry))
+    item.setText(first_column, entry.description)
+    item.setToolTip(first_column, f"{entry.description}\n{entry.company}".strip())
+    item.setText(first_column + 1, entry.version)
+    size_text = format_size(entry.size)
+    if hasattr(item, "set_value"):
+        item.set_value(first_column + 2, size_text, entry.size)
+    else:
+        item.setText(first_column + 2, size_text)
@@ -0,0 +1,196 @@
+"""
+fleet_manager.py
+Pestaña del modo flota: tabla ordenable de equipos con agente y detalle
+de los procesos de cada uno.
+"""
+# pylint: disable=no-name-in-module
+from PyQt5.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QTreeWidget, QPushButton, QLabel,
+    QSpinBox, QDialog, QLineEdit, QMessageBox
+)
+from PyQt5.QtCore import QTimer, Qt
+from PyQt5.QtGui import QBrush, QColor
+from process_manager import ProcessItem
+from system_utils.fleet_protocol import DEFAULT_PORT
+from system_utils.fleet_aggregator import FleetAggregator
+
+HOST_COLUMNS = ["Equipo", "Estado", "CPU %", "RAM %", "Disco %", "Procesos", "Última act.", "Descartes"]
+REMOTE_COLUMNS = ["Nombre", "PID", "CPU %", "RAM %", "RSS (MB)", "Lectura KB/s", "Escritura KB/s"]
+OFFLINE_BRUSH = QBrush(QColor("gray"))
+
+
+def _percent(value):
+    """Texto y valor de ordenación para un porcentaje opcional."""
+    return ("-", -1.0) if value is None else (f"{value:.1f}", value)
+
+
+class RemoteProcessDialog(QDialog):
+    """Procesos de un equipo remoto, refrescados desde el agregador."""
+    def __init__(self, aggregator, host_id, parent=None):
+        super().__init__(parent)
+        self.aggregator = aggregator
+        self.host_id = host_id
+        self.setWindowTitle(f"Procesos de {host_id}")
+        self.resize(800, 500)
+        layout = QVBoxLayout(self)
+
+        self.filter_input = QLineEdit()
+        self.filter_input.setPlaceholderText("Filtrar por nombre o PID...")
+        self.filter_input.textChanged.connect(self.refresh)
+        layout.addWidget(self.filter_input)
+
+        self.tree = QTreeWidget()
+        self.tree.setHeaderLabels(REMOTE_COLUMNS)
+        self.tree.setRootIsDecorated(False)
+        self.tree.setSortingEnabled(True)
+        self.tree.sortByColumn(2, Qt.SortOrder.DescendingOrder)
+        layout.addWidget(self.tree)
+
+        self.items = {}
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+        self.timer.start(2000)
+        self.refresh()
+
+    def refresh(self):
+        """Aplica las filas actuales reutilizando los elementos existentes."""
+        rows = self.aggregator.processes(self.host_id)
+        text = self.filter_input.text().strip().lower()
+        if text:
+            rows = {pid: row for pid, row in rows.items()
+                    if text in row[0].lower() or text in pid}
+
+        self.tree.setSortingEnabled(False)
+        for pid in [pid for pid in self.items if pid not in rows]:
+            item = self.items.pop(pid)
+            self.tree.takeTopLevelItem(self.tree.indexOfTopLevelItem(item))
+        for pid, (name, cpu, ram, rss, read_kbs, write_kbs) in rows.items():
+            item = self.items.get(pid)
+            if item is None:
+                item = ProcessItem(self.tree)
+                self.items[pid] = item
+                item.setText(0, name)
+                item.set_value(1, pid, int(pid))
+            item.set_value(2, f"{cpu:.1f}", cpu)
+            item.set_value(3, f"{ram:.1f}", ram)
+            item.set_value(4, f"{rss:.1f}", rss)
+            item.set_value(5, str(read_kbs), read_kbs)
+            item.set_value(6, str(write_kbs), write_kbs)
+        self.tree.setSortingEnabled(True)
+
+
+class FleetTab(QWidget):
+    """Pestaña del agregador: arranca el servidor bajo demanda y lista los equipos."""
+    def __init__(self):
+        super().__init__()
+        self.aggregator = None
+        self.items = {}
+        layout = QVBoxLayout(self)
+
+        controls = QHBoxLayout()
+        controls.addWidget(QLabel("Puerto:"))
+        self.port_spin = QSpinBox()
+        self.port_spin.setRange(1024, 65535)
+        self.port_spin.setValue(DEFAULT_PORT)
+        controls.addWidget(self.port_spin)
+        controls.addWidget(QLabel("Clave:"))
+        self.token_input = QLineEdit()
+        self.token_input.setEchoMode(QLineEdit.EchoMode.Password)
+        self.token_input.setPlaceholderText("vacía: solo agentes locales")
+        self.token_input.setToolTip(
+            "Con clave se aceptan agentes de la red que la envíen (--token); "
+            "sin clave solo se escucha en 127.0.0.1"
+        )
+        controls.addWidget(self.token_input)
+        self.btn_listen = QPushButton("Escuchar agentes")
+        self.btn_listen.clicked.connect(self.toggle_server)
+        controls.addWidget(self.btn_listen)
+        self.status_label = QLabel("Agregador detenido")
+        controls.addWidget(self.status_label)
+        controls.addStretch()
+        layout.addLayout(controls)
+
+        self.tree = QTreeWidget()
+        self.tree.setHeaderLabels(HOST_COLUMNS)
+        self.tree.setRootIsDecorated(False)
+        self.tree.setSortingEnabled(True)
+        self.tree.sortByColumn(0, Qt.SortOrder.AscendingOrder)
+        self.tree.itemDoubleClicked.connect(self.open_host)
+        layout.addWidget(self.tree)
+        layout.addWidget(QLabel(
+            "En cada equipo: python main.py --agent --server <esta IP> --port <puerto> "
+            "--token <clave>. "
+            "Doble clic en un equipo para ver sus procesos."
+        ))
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+
+    def toggle_server(self):
+        """Arranca o detiene el agregador."""
+        if self.aggregator is not None and self.aggregator.running:
+            self.stop()
+            return
+        self.aggregator = FleetAggregator(
+            port=self.port_spin.value(), token=self.token_input.text().strip() or None
+        )
+        try:
+            self.aggregator.start()
+        except OSError as e:
+            self.aggregator = None
+            QMessageBox.warning(self, "Error", f"No se pudo abrir el puerto: {e}")
+            return
+        self.port_spin.setEnabled(False)
+        self.token_input.setEnabled(False)
+        self.btn_listen.setText("Detener")
+        self.timer.start(1000)
+        self.refresh()
+
+    def stop(self):
+        """Detiene el agregador."""
+        if self.aggregator is not None:
+            self.aggregator.stop()
+        self.timer.stop()
+        self.port_spin.setEnabled(True)
+        self.token_input.setEnabled(True)
+        self.btn_listen.setText("Escuchar agentes")
+        self.status_label.setText("Agregador detenido")
+
+    def refresh(self):
+        """Actualiza la tabla de equipos."""
+        hosts = self.aggregator.hosts()
+        online = sum(1 for host in hosts if host.online)
+        self.status_label.setText(
+            f"Escuchando en {self.aggregator.bind}:{self.aggregator.port} | "
+            f"Equipos: {online}/{len(hosts)} | Tramas: {self.aggregator.frames}"
+        )
+
+        self.tree.setSortingEnabled(False)
+        current = {host.id for host in hosts}
+        for host_id in [host_id for host_id in self.items if host_id not in current]:
+            item = self.items.pop(host_id)
+            self.tree.takeTopLevelItem(self.tree.indexOfTopLevelItem(item))
+        for host in hosts:
+            item = self.items.get(host.id)
+            if item is None:
+                item = ProcessItem(self.tree)
+                item.setData(0, Qt.ItemDataRole.UserRole, host.id)
+                item.setText(0, host.id if host.id == host.host else f"{host.id} ({host.host})")
+                item.setToolTip(0, host.platform)
+                self.items[host.id] = item
+            item.setText(1, "Conectado" if host.online else "Desconectado")
+            for column, value in ((2, host.cpu), (3, host.ram), (4, host.disk)):
+                item.set_value(column, *_percent(value))
+            item.set_value(5, str(host.procs), host.procs)
+            item.set_value(6, f"hace {host.age:.0f} s", host.age)
+            item.set_value(7, str(host.skipped), host.skipped)
+            brush = OFFLINE_BRUSH if not host.online else QBrush()
+            for column in range(len(HOST_COLUMNS)):
+                item.setForeground(column, brush)
+        self.tree.setSortingEnabled(True)
+
+    def open_host(self, item):
+        """Abre el detalle de procesos del equipo."""
+        dialog = RemoteProcessDialog(self.aggregator, item.data(0, Qt.ItemDataRole.UserRole), self)
+        dialog.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+        dialog.show()
@@ -0,0 +1,143 @@
+"""Editor de reglas del gobernador de procesos."""
+from datetime import datetime
+# pylint: disable=no-name-in-module
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem,
+    QComboBox, QPushButton, QTextEdit, QLabel, QDialogButtonBox,
+    QMessageBox, QHeaderView
+)
+from system_utils.process_governor import IO_PRIORITIES, default_rule
+
+PRIORITY_LABELS = {
+    "idle": "Inactiva",
+    "below_normal": "Por debajo de lo normal",
+    "normal": "Normal",
+    "above_normal": "Por encima de lo normal",
+    "high": "Alta",
+}
+
+IO_LABELS = {
+    "very_low": "Muy baja",
+    "low": "Baja",
+    "normal": "Normal",
+    "high": "Alta",
+}
+
+COLUMNS = ["Ejecutable o ruta", "Prioridad", "Afinidad (CPUs)", "Prioridad E/S", "Límite CPU %"]
+
+
+class GovernorDialog(QDialog):
+    """Diálogo para editar las reglas y ver el registro de acciones."""
+    def __init__(self, governor, parent=None, new_match=None):
+        super().__init__(parent)
+        self.governor = governor
+        self.setWindowTitle("Reglas de procesos")
+        self.resize(750, 450)
+
+        layout = QVBoxLayout(self)
+        layout.addWidget(QLabel(
+            "Se aplican al aparecer un proceso cuyo nombre (o ruta, si contiene \\) "
+            "coincide. Admite comodines: *, ?"
+        ))
+
+        self.table = QTableWidget(0, len(COLUMNS))
+        self.table.setHorizontalHeaderLabels(COLUMNS)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        layout.addWidget(self.table)
+
+        for rule in governor.rules:
+            self.add_row(rule)
+        if new_match:
+            self.add_row(default_rule(new_match))
+
+        row_buttons = QHBoxLayout()
+        btn_add = QPushButton("Agregar regla")
+        btn_remove = QPushButton("Quitar regla")
+        btn_add.clicked.connect(lambda: self.add_row(default_rule()))
+        btn_remove.clicked.connect(self.remove_selected)
+        row_buttons.addWidget(btn_add)
+        row_buttons.addWidget(btn_remove)
+        row_buttons.addStretch()
+        layout.addLayout(row_buttons)
+
+        # Registro de acciones aplicadas
+        layout.addWidget(QLabel("Acciones realizadas"))
+        self.log = QTextEdit()
+        self.log.setReadOnly(True)
+        for timestamp, message in governor.actions:
+            hora = datetime.fromtimestamp(timestamp).strftime("%H:%M:%S")
+            self.log.append(f"[{hora}] {message}")
+        layout.addWidget(self.log)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.Save | QDialogButtonBox.Cancel)
+        buttons.accepted.connect(self.save)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+
+    @staticmethod
+    def _combo(labels, value):
+        """Crea un combo con opción vacía y los valores indicados."""
+        combo = QComboBox()
+        combo.addItem("(sin cambio)", None)
+        for key, label in labels.items():
+            combo.addItem(label, key)
+        index = combo.findData(value)
+        combo.setCurrentIndex(max(0, index))
+        return combo
+
+    def add_row(self, rule):
+        """Agrega una fila editable con los valores de una regla."""
+        row = self.table.rowCount()
+        self.table.insertRow(row)
+        self.table.setItem(row, 0, QTableWidgetItem(rule["match"]))
+        self.table.setCellWidget(row, 1, self._combo(PRIORITY_LABELS, rule["priority"]))
+        affinity = ",".join(str(cpu) for cpu in rule["affinity"] or [])
+        self.table.setItem(row, 2, QTableWidgetItem(affinity))
+        self.table.setCellWidget(
+            row, 3,
+            self._combo({k: IO_LABELS[k] for k in IO_PRIORITIES}, rule["io_priority"])
+        )
+        cap = "" if rule["cpu_cap"] is None else str(rule["cpu_cap"])
+        self.table.setItem(row, 4, QTableWidgetItem(cap))
+
+    def remove_selected(self):
+        """Elimina las filas seleccionadas."""
+        rows = sorted({index.row() for index in self.table.selectedIndexes()}, reverse=True)
+        for row in rows:
+            self.table.removeRow(row)
+
+    def read_rules(self):
+        """Convierte la tabla en una lista de reglas."""
+        rules = []
+        for row in range(self.table.rowCount()):
+            match = (self.table.item(row, 0).text() if self.table.item(row, 0) else "").strip()
+            if not match:
+                continue
+            rule = default_rule(match)
+            rule["priority"] = self.table.cellWidget(row, 1).currentData()
+            rule["io_priority"] = self.table.cellWidget(row, 3).currentData()
+
+            affinity = self.table.item(row, 2).text().strip() if self.table.item(row, 2) else ""
+            if affinity:
+                rule["affinity"] = [int(cpu) for cpu in affinity.split(",") if cpu.strip()]
+
+            cap = self.table.item(row, 4).text().strip() if self.table.item(row, 4) else ""
+            if cap:
+                rule["cpu_cap"] = float(cap)
+                if not 0 < rule["cpu_cap"] < 100:
+                    raise ValueError("El límite de CPU debe estar entre 0 y 100")
+            rules.append(rule)
+        return rules
+
+    def save(self):
+        """Valida y guarda las reglas."""
+        try:
+            rules = self.read_rules()
+        except ValueError as e:
+            QMessageBox.warning(self, "Reglas", f"Valor no válido: {e}")
+            return
+        if self.governor.save_rules(rules):
+            self.accept()
+        else:
+            QMessageBox.critical(self, "Error", "No se pudieron guardar las reglas")
+
@@ -0,0 +1,153 @@
+"""
+lock_finder_manager.py
+Diálogo "¿Quién bloquea este archivo?" para las rutas que la limpieza no
+pudo borrar o para cualquier ruta elegida por el usuario.
+"""
+from concurrent.futures import ThreadPoolExecutor
+import psutil
+# pylint: disable=no-name-in-module
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLineEdit, QPushButton, QTreeWidget,
+    QTreeWidgetItem, QLabel, QFileDialog, QMenu, QAction, QMessageBox
+)
+from PyQt5.QtCore import QTimer, Qt
+
+# Rutas mostradas como máximo (las fallidas de una limpieza pueden ser miles)
+MAX_ROWS = 500
+
+
+class LockFinderDialog(QDialog):
+    """
+    Busca en segundo plano con `LockFinder` y lista ruta → procesos.
+    Finalizar un proceso usa `ProcessTab.terminate_process` si se pasa la pestaña.
+    """
+    def __init__(self, finder, paths=None, process_tab=None, parent=None):
+        super().__init__(parent)
+        self.finder = finder
+        self.process_tab = process_tab
+        self.paths = list(paths or [])
+        self.future = None
+        self.closed = False
+        self.pool = ThreadPoolExecutor(max_workers=1)
+        self.setWindowTitle("¿Quién bloquea este archivo?")
+        self.resize(800, 450)
+
+        layout = QVBoxLayout(self)
+        bar = QHBoxLayout()
+        self.path_edit = QLineEdit()
+        self.path_edit.setPlaceholderText("Ruta de archivo o carpeta...")
+        btn_browse = QPushButton("Examinar...")
+        btn_browse.clicked.connect(self.browse)
+        self.btn_search = QPushButton("Buscar")
+        self.btn_search.clicked.connect(self.search_path)
+        bar.addWidget(self.path_edit)
+        bar.addWidget(btn_browse)
+        bar.addWidget(self.btn_search)
+        layout.addLayout(bar)
+
+        self.status = QLabel()
+        layout.addWidget(self.status)
+
+        self.tree = QTreeWidget()
+        self.tree.setHeaderLabels(["Ruta / Proceso", "PID", "Archivo abierto"])
+        self.tree.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+        self.tree.customContextMenuRequested.connect(self.open_context_menu)
+        layout.addWidget(self.tree)
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.check_result)
+
+        if self.paths:
+            self.start_search(self.paths)
+
+    def browse(self):
+        """Elige un archivo con el diálogo del sistema."""
+        path, _ = QFileDialog.getOpenFileName(self, "Elegir archivo")
+        if path:
+            self.path_edit.setText(path)
+            self.search_path()
+
+    def search_path(self):
+        """Busca la ruta escrita por el usuario."""
+        path = self.path_edit.text().strip()
+        if path:
+            self.start_search([path])
+
+    def start_search(self, paths):
+        """Lanza la búsqueda en segundo plano."""
+        # El reintento diferido de `terminate` puede llegar con el diálogo ya cerrado
+        if self.closed or (self.future is not None and not self.future.done()):
+            return
+        self.paths = paths
+        self.btn_search.setEnabled(False)
+        self.status.setText(f"Buscando procesos que bloquean {len(paths)} ruta(s)...")
+        self.future = self.pool.submit(self.finder.find, paths)
+        self.timer.start(100)
+
+    def check_result(self):
+        """Muestra el resultado cuando termina la búsqueda."""
+        if not self.future.done():
+            return
+        self.timer.stop()
+        self.btn_search.setEnabled(True)
+        try:
+            result = self.future.result()
+        # pylint: disable=broad-exception-caught
+        except Exception as e:
+            self.status.setText(f"Error buscando bloqueos: {e}")
+            return
+
+        self.tree.clear()
+        for path, holders in list(result.items())[:MAX_ROWS]:
+            parent = QTreeWidgetItem(self.tree, [path])
+            for holder in holders:
+                child = QTreeWidgetItem(parent, [holder.name, str(holder.pid), holder.path])
+                child.setData(0, Qt.ItemDataRole.UserRole, holder.pid)
+        self.tree.expandAll()
+
+        unresolved = len(self.paths) - len(result)
+        text = f"{len(result)} ruta(s) bloqueadas por algún proceso"
+        if unresolved:
+            text += (f"; {unresolved} sin proceso identificado "
+                     "(ya liberadas o sin acceso: ejecutar como administrador)")
+        if len(result) > MAX_ROWS:
+            text += f". Se muestran las primeras {MAX_ROWS}"
+        self.status.setText(text + ".")
+
+    def open_context_menu(self, pos):
+        """Menú para finalizar el proceso que bloquea."""
+        item = self.tree.itemAt(pos)
+        pid = item.data(0, Qt.ItemDataRole.UserRole) if item else None
+        if pid is None:
+            return
+        menu = QMenu(self)
+        kill_action = QAction(f"Finalizar {item.text(0)} (PID {pid})", self)
+        kill_action.triggered.connect(lambda: self.terminate(pid))
+        menu.addAction(kill_action)
+        if self.process_tab is not None:
+            show_action = QAction("Mostrar en Procesos", self)
+            show_action.triggered.connect(lambda: self.process_tab.select_process(pid))
+            menu.addAction(show_action)
+        viewport = self.tree.viewport()
+        if viewport is not None:
+            menu.exec_(viewport.mapToGlobal(pos))
+
+    def terminate(self, pid):
+        """Finaliza el proceso y repite la búsqueda con un índice nuevo."""
+        if self.process_tab is not None:
+            self.process_tab.terminate_process(pid)
+        else:
+            try:
+                psutil.Process(pid).terminate()
+            # pylint: disable=broad-exception-caught
+            except Exception:
+                QMessageBox.critical(self, "Error", "No se pudo finalizar el proceso")
+        self.finder.invalidate()
+        # Dar tiempo a que el proceso termine y suelte sus archivos
+        QTimer.singleShot(500, lambda: self.start_search(self.paths))
+
+    def done(self, result):  # pylint: disable=invalid-name
+        """Libera el hilo de búsqueda al cerrar."""
+        self.closed = True
+        self.pool.shutdown(wait=False)
+        super().done(result)
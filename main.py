@@ -1,12 +1,15 @@
 """Script principal para ejecutar la aplicación
 con privilegios de administrador
 """
+import os
 import sys
 import ctypes
+import logging
 import subprocess
 # pylint: disable=no-name-in-module
 from PyQt5.QtWidgets import QApplication, QMessageBox
-from monitor_manager import MonitorWindow
+
+LOG_FILE = os.path.join(os.path.dirname(__file__), "systemmanager.log")
 
 def run_as_admin():
     """Reinicia el script actual con privilegios de administrador."""
@@ -37,6 +40,24 @@ def open_monitor_ui():
         QMessageBox.critical(None, "Error", "No se pudo abrir la interfaz")
 
 if __name__ == "__main__":
+    logging.basicConfig(
+        filename=LOG_FILE, level=logging.INFO, encoding="utf-8",
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s"
+    )
+    if "--agent" in sys.argv:
+        # Modo flota: sin interfaz ni elevación, también en Linux
+        # pylint: disable=import-outside-toplevel
+        from system_utils.fleet_agent import run_agent
+        sys.exit(run_agent(sys.argv[1:]))
+    if "--delayed-start" in sys.argv:
+        # Inicio escalonado al iniciar sesión: sin interfaz ni elevación
+        # pylint: disable=import-outside-toplevel
+        from system_utils.delayed_start import run_launcher
+        sys.exit(run_launcher(sys.argv[1:]))
+
+    # La interfaz importa módulos exclusivos de Windows
+    # pylint: disable=import-outside-toplevel
+    from monitor_manager import MonitorWindow
     run_as_admin()
     open_monitor_ui()
     app = QApplication(sys.argv)
@@ -0,0 +1,166 @@
+"""Composición de la memoria física y vaciado de la caché de archivos."""
+from concurrent.futures import ThreadPoolExecutor
+# pylint: disable=no-name-in-module
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton
+from PyQt5.QtGui import QPainter, QColor
+from PyQt5.QtCore import QTimer, QRectF, Qt
+from system_utils.memory_composition import default_memory_backend
+from system_utils.effect_meter import describe
+
+# (campo, etiqueta, color) en el orden de la barra
+SEGMENTS = [
+    ("in_use", "En uso", QColor(70, 130, 200)),
+    ("modified", "Modificada", QColor(230, 140, 40)),
+    ("standby", "En espera", QColor(140, 180, 230)),
+    ("free", "Libre", QColor(225, 225, 225)),
+]
+
+
+def format_bytes(value):
+    """Bytes en MB o GB."""
+    if value >= 1024 ** 3:
+        return f"{value / 1024 ** 3:.1f} GB"
+    return f"{value / 1024 ** 2:.0f} MB"
+
+
+class CompositionBar(QWidget):
+    """Barra horizontal con un tramo por lista de memoria."""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.composition = None
+        self.setMinimumHeight(22)
+
+    def set_composition(self, composition):
+        """Cambia los datos y repinta."""
+        self.composition = composition
+        self.setToolTip("\n".join(
+            f"{label}: {format_bytes(getattr(composition, field))}"
+            for field, label, _ in SEGMENTS
+        ))
+        self.update()
+
+    def paintEvent(self, _event):  # pylint: disable=invalid-name
+        """Pinta los tramos proporcionales al total."""
+        painter = QPainter(self)
+        rect = QRectF(self.rect().adjusted(0, 0, -1, -1))
+        painter.setPen(Qt.PenStyle.NoPen)
+        composition = self.composition
+        if composition is not None and composition.total:
+            x = rect.left()
+            for field, _, color in SEGMENTS:
+                width = rect.width() * getattr(composition, field) / composition.total
+                painter.fillRect(QRectF(x, rect.top(), width, rect.height()), color)
+                x += width
+        painter.setPen(QColor("gray"))
+        painter.setBrush(Qt.BrushStyle.NoBrush)
+        painter.drawRect(rect)
+
+
+class MemoryPanel(QWidget):
+    """
+    Lee la salida "memory.composition" de los colectores. El vaciado de la
+    caché usa su propio backend en un hilo y, si hay medidor de efecto, se
+    mide como acción "purge" (los fallos de página duros que provoca
+    después indican si mereció la pena).
+    """
+    def __init__(self, collectors, backend=None, effect_meter=None, parent=None):
+        super().__init__(parent)
+        self.collectors = collectors
+        self.backend = backend if backend is not None else default_memory_backend()
+        self.effects = effect_meter
+        self.last_sample = None
+        self.future = None
+        self.pending_run = None
+        self.pool = ThreadPoolExecutor(max_workers=1)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(QLabel("Composición de la memoria"))
+        self.bar = CompositionBar()
+        layout.addWidget(self.bar)
+        self.legend = QLabel("Sin datos")
+        layout.addWidget(self.legend)
+
+        row = QHBoxLayout()
+        self.purge_button = QPushButton("Vaciar caché de archivos")
+        self.purge_button.setToolTip(
+            "Descarta la memoria en espera (caché de archivos). Los programas "
+            "tendrán que volver a leer del disco lo que necesiten."
+        )
+        self.purge_button.clicked.connect(self.purge)
+        self.purge_label = QLabel()
+        row.addWidget(self.purge_button)
+        row.addWidget(self.purge_label, 1)
+        layout.addLayout(row)
+
+        if self.backend is None:
+            self.legend.setText("Composición de memoria no disponible en este sistema")
+            self.purge_button.setEnabled(False)
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+        self.timer.start(1000)
+
+    def refresh(self):
+        """Muestra la última composición y los resultados pendientes."""
+        self.check_purge()
+        sample = self.collectors.get("memory.composition")
+        if sample is None or sample is self.last_sample:
+            return
+        self.last_sample = sample
+        c = sample.value
+        self.bar.set_composition(c)
+        parts = [f"{label} {format_bytes(getattr(c, field))}" for field, label, _ in SEGMENTS]
+        if c.compressed is not None:
+            parts[0] += f" (comprimida {format_bytes(c.compressed)})"
+        parts.append(f"Confirmada {format_bytes(c.committed)} / {format_bytes(c.commit_limit)}")
+        self.legend.setText(" | ".join(parts))
+
+    def _run_purge(self):
+        """Vaciado en el hilo del pool, medido si hay medidor de efecto."""
+        if self.effects is None:
+            return self.backend.purge_cache(), None
+        with self.effects.track("purge", "Vaciar caché de archivos") as run:
+            result = self.backend.purge_cache()
+        if not result.ok:
+            self.effects.cancel(run)
+            run = None
+        return result, run
+
+    def purge(self):
+        """Lanza el vaciado de la caché en segundo plano."""
+        if self.backend is None or (self.future is not None and not self.future.done()):
+            return
+        self.purge_button.setEnabled(False)
+        self.purge_label.setText("Vaciando la caché...")
+        self.future = self.pool.submit(self._run_purge)
+
+    def check_purge(self):
+        """Muestra el resultado del vaciado y, más tarde, su efecto medido."""
+        if self.future is not None and self.future.done():
+            future, self.future = self.future, None
+            self.purge_button.setEnabled(True)
+            try:
+                result, self.pending_run = future.result()
+            # pylint: disable=broad-exception-caught
+            except Exception as e:
+                self.purge_label.setText(f"Error al vaciar la caché: {e}")
+                return
+            text = result.message if result.ok else f"No se pudo vaciar: {result.message}"
+            if self.pending_run is not None:
+                text += ". Midiendo el efecto..."
+            self.purge_label.setText(text)
+
+        run = self.pending_run
+        if run is not None and run.done.is_set():
+            self.pending_run = None
+            lines = describe(run.result)
+            if lines:
+                self.purge_label.setText(
+                    self.purge_label.text().replace("Midiendo el efecto...", lines[0])
+                )
+            self.purge_label.setToolTip("\n".join(lines))
+
+    def stop(self):
+        """Libera el hilo de vaciado."""
+        self.pool.shutdown(wait=False)
@@ -1,27 +1,51 @@
 """
 monitor_manager.py
 """
-import platform
+import time
 import psutil
-import cpuinfo
+import numpy as np
 # pylint: disable=no-name-in-module
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel,
     QProgressBar, QTextEdit, QTabWidget, QPushButton,
-    QMessageBox)
+    QMessageBox, QTreeWidget, QTreeWidgetItem, QSystemTrayIcon, QStyle,
+    QShortcut)
 
 from PyQt5.QtCore import QTimer
+from PyQt5.QtGui import QKeySequence
 from system_utils.memory_cleaner import trim_working_set_all
+from system_utils.top_consumers import TopConsumersTracker, TopEntry
+from system_utils.io_rates import format_bytes_rate
+from system_utils.throttle_detector import ThrottleDetector
+from system_utils.collectors import CollectorRuntime
+from system_utils.profiler import instrument
+from system_utils.startup_impact import StartupImpactTracker
+from system_utils.exe_metadata import ExeMetadataCache
+from system_utils.effect_meter import EffectMeter, describe
 
 # Importar otras pestañas
+from core_heatmap import CoreHeatmap
+from memory_panel import MemoryPanel
+from debug_panel import DebugPanel
 from process_manager import ProcessTab
 from startup_manager import StartupTab
 from optimizer_manager import OptimizerTab
+from services_manager import ServicesTab
+from fleet_manager import FleetTab
 
 class MonitorTab(QWidget):
     """Pestaña de monitorización del sistema."""
-    def __init__(self):
+    def __init__(self, effect_meter=None, collectors=None):
         super().__init__()
+        # Métricas publicadas por los colectores (hilo propio, no el temporizador)
+        if collectors is None:
+            collectors = CollectorRuntime()
+            collectors.start()
+        self.collectors = collectors
+        self.last_reading = None
+        # Efecto antes/después de la limpieza de memoria
+        self.effects = effect_meter or EffectMeter()
+        self.pending_effects = []
 
         # --- Layout general ---
         main_layout = QVBoxLayout(self)
@@ -39,17 +63,51 @@ class MonitorTab(QWidget):
 
         main_layout.addLayout(self.stats_layout)
 
+        # --- Mapa de calor por núcleo (4 Hz) ---
+        self.core_heatmap = CoreHeatmap(self.collectors, interval_ms=250)
+        main_layout.addWidget(self.core_heatmap)
+
+        # --- Limitación térmica / de energía ---
+        self.throttle = ThrottleDetector()
+        self.throttle_label = QLabel("Frecuencia: sin datos")
+        self.throttle_tree = QTreeWidget()
+        self.throttle_tree.setHeaderLabels(
+            ["Inicio", "Duración", "Frecuencia mín.", "Temp. máx.", "Causa"]
+        )
+        self.throttle_tree.setRootIsDecorated(False)
+        self.throttle_tree.setMaximumHeight(90)
+        main_layout.addWidget(self.throttle_label)
+        main_layout.addWidget(self.throttle_tree)
+
         # --- Especificaciones ---
         self.specs = QTextEdit()
         self.specs.setReadOnly(True)
-        self.specs.setText(self.get_specs())
+        self.specs.setText("Cargando especificaciones...")
+        self.specs_loaded = False
         main_layout.addWidget(self.specs)
 
+        # --- Mayores consumidores (1/5/15 min) ---
+        self.top_tracker = TopConsumersTracker()
+        self.top_n = 3
+        # Tabla de columnas de ProcessTab para la fila "Ahora" (la asigna la ventana)
+        self.process_table = None
+        self.top_tree = QTreeWidget()
+        self.top_tree.setHeaderLabels(["Ventana", "CPU", "RAM", "Disco"])
+        self.top_tree.setRootIsDecorated(False)
+        main_layout.addWidget(QLabel("Mayores consumidores"))
+        main_layout.addWidget(self.top_tree)
+
+        # --- Composición de la memoria y vaciado de caché ---
+        self.memory_panel = MemoryPanel(self.collectors, effect_meter=self.effects)
+        main_layout.addWidget(self.memory_panel)
+
         # --- Refrescar memoria ---
         self.refresh_button = QPushButton("Limpiar memoria")
         self.refresh_button.clicked.connect(self.refresh_memory)
 
+        self.effect_label = QLabel()
         main_layout.addWidget(self.refresh_button)
+        main_layout.addWidget(self.effect_label)
         main_layout.addStretch()
         self.setLayout(main_layout)
 
@@ -58,60 +116,74 @@ class MonitorTab(QWidget):
         self.timer.timeout.connect(self.update_stats)
         self.timer.start(1000)
 
-    def get_specs(self):
-        """Obtiene las especificaciones del sistema."""
-        cpu_info = cpuinfo.get_cpu_info()
-        discos = psutil.disk_partitions()
-
-        nuc_fisicos = psutil.cpu_count(logical=False)
-        nuc_logicos = psutil.cpu_count(logical=True)
-
-        ram_total_gb = round(psutil.virtual_memory().total / (1024**3), 2)
-
-        info = (
-            f"Sistema: {platform.system()} {platform.release()}\n"
-            f"Versión: {platform.version()}\n"
-            f"Nombre del equipo: {platform.node()}\n"
-            f"Detalles del CPU: {platform.processor()}\n"
-            f"Procesador: {cpu_info['brand_raw']}\n"
-            f"Arquitectura: {cpu_info['arch']}\n"
-            f"Núcleos: {nuc_fisicos} físicos / {nuc_logicos} lógicos\n"
-            f"RAM disponible: {ram_total_gb} GB\n"
-        )
-
-        discos_info = []
-        for disco in discos:
-            try:
-                if 'fixed' in disco.opts:
-                    uso = psutil.disk_usage(disco.mountpoint)
-                    total_gb = round(uso.total / (1024**3), 2)
-                    usado_gb = round(uso.used / (1024**3), 2)
-                    discos_info.append(
-                        f"Disco {disco.device.split(':')[0]}: {total_gb} GB "
-                        f"(En uso {usado_gb} GB)"
-                    )
-            # pylint: disable=broad-exception-caught
-            except Exception:
-                continue
-
-        if discos_info:
-            info += "\nDiscos detectados:\n" + "\n".join(discos_info) + "\n"
-
-        return info
-
     def refresh_memory(self):
-        """Llama a la función de limpieza de memoria."""
-        before = psutil.virtual_memory().used
-        trim_working_set_all()
-        after = psutil.virtual_memory().used
-        freed = before - after
-
-        if freed > 0:
-            freed_mb = freed / (1024 * 1024)
-            msg = f"Se liberaron {freed_mb:.2f} MB de memoria."
-        else:
-            msg = "No se liberó memoria."
-        QMessageBox.information(self, "Memory Cleaner", msg)
+        """Recorta la memoria y mide el efecto comparando ventanas antes/después."""
+        with self.effects.track("trim", "Recortar memoria de procesos") as run:
+            trim_working_set_all()
+        self.pending_effects.append(run)
+        wait = self.effects.settle + self.effects.window * self.effects.interval
+        self.effect_label.setText(f"Midiendo el efecto del recorte (unos {wait:.0f} s)...")
+
+    def refresh_effects(self):
+        """Muestra el resultado de las mediciones terminadas."""
+        for run in [run for run in self.pending_effects if run.done.is_set()]:
+            self.pending_effects.remove(run)
+            lines = describe(run.result)
+            self.effect_label.setText(f"Último recorte: {lines[0]}" if lines else "")
+            self.effect_label.setToolTip("\n".join(lines))
+
+    @instrument("MonitorTab.update_top_consumers")
+    def update_top_consumers(self, infos):
+        """Alimenta el tracker con un recorrido de procesos y refresca el panel."""
+        self.top_tracker.update(infos)
+        summary = self.top_tracker.summary(self.top_n)
+
+        self.top_tree.clear()
+        if self.process_table is not None:
+            self.add_top_rows("Ahora", self.current_top(self.top_n), rate=True)
+        for window, by_metric in summary.items():
+            self.add_top_rows(f"Últimos {window // 60} min", by_metric)
+        self.top_tree.expandAll()
+
+    def current_top(self, n):
+        """
+        Mayores consumidores del último tick desde las columnas de la tabla:
+        CPU por proceso, RAM sumada por nombre y E/S de disco por segundo.
+        """
+        table = self.process_table
+        disk = np.nan_to_num(table.column("read_rate")) + np.nan_to_num(table.column("write_rate"))
+        ram = []
+        for group in table.group_by("rss")[:n]:
+            name = group.name if group.count == 1 else f"{group.name} ×{group.count}"
+            ram.append(TopEntry(group.pids[0], name, group.total))
+        return {
+            "cpu": [TopEntry(*entry) for entry in table.top("cpu_percent", n) if entry[2] > 0],
+            "ram": [entry for entry in ram if entry.value > 0],
+            "disk": [TopEntry(*entry) for entry in table.top(disk, n) if entry[2] > 0],
+        }
+
+    def add_top_rows(self, title, by_metric, rate=False):
+        """Agrega un grupo del panel de mayores consumidores."""
+        header = QTreeWidgetItem(self.top_tree, [title])
+        for rank in range(self.top_n):
+            row = [f"  #{rank + 1}"]
+            for metric in ("cpu", "ram", "disk"):
+                entries = by_metric[metric]
+                if rank < len(entries):
+                    row.append(self.format_top_entry(metric, entries[rank], rate))
+                else:
+                    row.append("")
+            if any(row[1:]):
+                QTreeWidgetItem(header, row)
+
+    @staticmethod
+    def format_top_entry(metric, entry, rate=False):
+        """Formatea una entrada del top según la métrica."""
+        if metric == "cpu":
+            return f"{entry.name} ({entry.value:.1f}%)"
+        if metric == "disk" and rate:
+            return f"{entry.name} ({format_bytes_rate(entry.value)})"
+        return f"{entry.name} ({entry.value / (1024 * 1024):.1f} MB)"
 
     def create_basic_layouts(self):
         """Crea los layouts básicos (CPU, RAM, RED)"""
@@ -169,24 +241,76 @@ class MonitorTab(QWidget):
             except Exception:
                 continue
 
+    @instrument("MonitorTab.update_stats")
     def update_stats(self):
         """Actualiza las estadísticas incluyendo todos los discos"""
-        self.cpu_bar.setValue(int(psutil.cpu_percent()))
-        self.ram_bar.setValue(int(psutil.virtual_memory().percent))
+        collectors = self.collectors
+        self.cpu_bar.setValue(int(collectors.latest("cpu.percent", 0)))
+        memory = collectors.latest("memory.virtual")
+        if memory is not None:
+            self.ram_bar.setValue(int(memory.percent))
 
         # Actualizar red
-        net_io = psutil.net_io_counters()
-        net_activity = (net_io.bytes_sent + net_io.bytes_recv) / (1024 * 1024)
+        net_activity = collectors.latest("net.total", 0) / (1024 * 1024)
         self.net_bar.setValue(min(100, int(net_activity % 100)))
 
         # Actualizar todos los discos
+        usage = collectors.latest("disk.usage", {})
         for letra, bar in self.disk_bars.items():
-            try:
-                uso = psutil.disk_usage(f"{letra}:")
-                bar.setValue(int(uso.percent))
-            # pylint: disable=broad-exception-caught
-            except Exception:
-                continue
+            if letra in usage:
+                bar.setValue(int(usage[letra]))
+
+        if not self.specs_loaded:
+            specs = collectors.latest("system.specs")
+            if specs is not None:
+                self.specs.setText(specs)
+                self.specs_loaded = True
+
+        self.update_throttling()
+        if self.pending_effects:
+            self.refresh_effects()
+
+    @instrument("MonitorTab.update_throttling")
+    def update_throttling(self, reading=None):
+        """Aplica la última lectura de sensores y actualiza los episodios de limitación."""
+        reading = reading or self.collectors.latest("sensors.reading")
+        if reading is None or reading is self.last_reading:
+            return
+        self.last_reading = reading
+        event = self.throttle.update(reading)
+        self.core_heatmap.throttling = self.throttle.current is not None
+
+        parts = []
+        if reading.freq:
+            parts.append(f"Frecuencia: {sum(reading.freq) / len(reading.freq):.0f} MHz")
+        if self.throttle.ratio is not None:
+            parts.append(f"{self.throttle.ratio * 100:.0f}% del máximo bajo carga")
+        if self.throttle.temp is not None:
+            parts.append(f"Temp.: {self.throttle.temp:.0f} °C")
+        if reading.battery is not None:
+            percent, plugged = reading.battery
+            parts.append(f"Batería: {percent:.0f}% ({'cargando' if plugged else 'descargando'})")
+        if self.throttle.current is not None:
+            parts.append(f"LIMITADA ({self.throttle.current.cause})")
+        self.throttle_label.setText(" | ".join(parts) or "Frecuencia: sin datos")
+
+        if event is not None or self.throttle.current is not None:
+            self.refresh_throttle_episodes(reading.time)
+
+    def refresh_throttle_episodes(self, now):
+        """Lista los episodios de limitación, el más reciente primero."""
+        self.throttle_tree.clear()
+        for episode in reversed(self.throttle.episodes):
+            duration = f"{episode.duration(now):.0f} s"
+            if episode.end is None:
+                duration += " (en curso)"
+            QTreeWidgetItem(self.throttle_tree, [
+                time.strftime("%H:%M:%S", time.localtime(episode.wall_start)),
+                duration,
+                f"{episode.min_ratio * 100:.0f}%",
+                f"{episode.max_temp:.0f} °C" if episode.max_temp is not None else "-",
+                episode.cause,
+            ])
 
 # ---- Ventana principal con pestañas ----
 class MonitorWindow(QTabWidget):
@@ -196,9 +320,102 @@ class MonitorWindow(QTabWidget):
         self.setWindowTitle("SystemManager v1")
         self.resize(900, 500)
 
+        # Colectores de métricas en su propio hilo, compartidos por las pestañas
+        self.collectors = CollectorRuntime()
+        self.collectors.start()
+        # Muestreo compartido para medir el efecto de las acciones de limpieza
+        self.effect_meter = EffectMeter()
+        self.monitor_tab = MonitorTab(self.effect_meter, self.collectors)
+        # Caché de metadatos de ejecutables compartida por Procesos e Inicio
+        self.exe_metadata = ExeMetadataCache()
+        self.process_tab = ProcessTab(metadata=self.exe_metadata)
+        self.monitor_tab.process_table = self.process_tab.table
+        self.process_tab.snapshot_ready.connect(self.monitor_tab.update_top_consumers)
+        self.process_tab.runaway_detected.connect(self.notify_runaways)
+        self.process_tab.leak_detected.connect(self.notify_leaks)
+
+        # Icono de bandeja para notificaciones; (título, PID, nombre) de la última
+        self.last_alert = None
+        self.tray = QSystemTrayIcon(
+            self.style().standardIcon(QStyle.StandardPixmap.SP_ComputerIcon), self
+        )
+        self.tray.setToolTip("SystemManager")
+        self.tray.messageClicked.connect(self.on_alert_clicked)
+        self.tray.show()
+
+        # Panel de depuración oculto
+        self.debug_panel = None
+        QShortcut(QKeySequence("Ctrl+Shift+D"), self, self.toggle_debug_panel)
+
         # Aquí se agregan las pestañas
-        self.addTab(MonitorTab(), "Monitor")
-        self.addTab(ProcessTab(), "Procesos")
-        self.addTab(StartupTab(), "Inicio")
+        self.addTab(self.monitor_tab, "Monitor")
+        self.addTab(self.process_tab, "Procesos")
+        self.services_tab = ServicesTab(self.process_tab.watch)
+        self.addTab(self.services_tab, "Servicios")
+        # Impacto de arranque medido con los eventos del vigilante de procesos
+        self.startup_impact = StartupImpactTracker()
+        self.process_tab.watch.subscribe(self.startup_impact.on_process_events)
+        self.addTab(StartupTab(self.startup_impact, self.exe_metadata), "Inicio")
         # self.addTab(RendimientoTab(), "Rendimiento")
-        self.addTab(OptimizerTab(), "Optimización")
+        self.optimizer_tab = OptimizerTab(self.process_tab, self.effect_meter)
+        self.addTab(self.optimizer_tab, "Optimización")
+        self.fleet_tab = FleetTab()
+        self.addTab(self.fleet_tab, "Flota")
+
+    def toggle_debug_panel(self):
+        """Muestra u oculta el panel con el coste propio de SystemManager."""
+        if self.debug_panel is None:
+            self.debug_panel = DebugPanel(self.collectors)
+        self.debug_panel.setVisible(not self.debug_panel.isVisible())
+
+    def closeEvent(self, event):
+        """Reanuda los procesos limitados y detiene los hilos de fondo antes de salir."""
+        self.process_tab.boost.stop()
+        self.process_tab.governor.stop()
+        self.optimizer_tab.scheduler.stop()
+        self.fleet_tab.stop()
+        self.services_tab.stop()
+        self.monitor_tab.memory_panel.stop()
+        self.effect_meter.stop()
+        self.collectors.stop()
+        super().closeEvent(event)
+
+    def notify_runaways(self, alerts):
+        """Muestra una notificación por los procesos desbocados detectados."""
+        alert, name = alerts[-1]
+        self.last_alert = ("Proceso desbocado", alert.pid, name)
+        msg = (
+            f"{name} (PID {alert.pid}) lleva {alert.duration:.0f} s por encima "
+            f"de lo normal ({alert.reason}). Haz clic para finalizarlo."
+        )
+        if len(alerts) > 1:
+            msg += f"\n(+{len(alerts) - 1} procesos más, ver registro)"
+        self.tray.showMessage(
+            self.last_alert[0], msg, QSystemTrayIcon.MessageIcon.Warning, 10000
+        )
+
+    def notify_leaks(self, leaks):
+        """Muestra una notificación por las posibles fugas de memoria."""
+        report, name = max(leaks, key=lambda leak: leak[0].mb_per_hour)
+        self.last_alert = ("Posible fuga de memoria", report.pid, name)
+        msg = (
+            f"{name} (PID {report.pid}) crece {report.mb_per_hour:.1f} MB/h; "
+            f"agotaría la memoria disponible en ~{report.hours_to_exhaustion:.1f} h. "
+            "Haz clic para finalizarlo."
+        )
+        if len(leaks) > 1:
+            msg += f"\n(+{len(leaks) - 1} procesos más, ver pestaña Procesos)"
+        self.tray.showMessage(
+            self.last_alert[0], msg, QSystemTrayIcon.MessageIcon.Warning, 10000
+        )
+
+    def on_alert_clicked(self):
+        """Ofrece finalizar el último proceso notificado."""
+        if not self.last_alert:
+            return
+        title, pid, name = self.last_alert
+        answer = QMessageBox.question(
+            self, title, f"¿Finalizar {name} (PID {pid})?"
+        )
+        if answer == QMessageBox.StandardButton.Yes:
+            self.process_tab.terminate_process(pid)
@@ -1,11 +1,33 @@
 """Interfaz flotante de monitor de sistema."""
+import os
+import sys
+import math
+import time
 import tkinter as tk
 from tkinter import messagebox
-import threading
-import time
+from collections import deque
 import subprocess
 import psutil
 from system_utils.memory_cleaner import trim_working_set_all
+from system_utils.io_rates import format_bytes_rate
+from system_utils.profiler import PROFILER, instrument
+from system_utils.effect_meter import EffectMeter, describe
+from system_utils.collectors import (
+    CollectorRuntime, CpuCollector, MemoryCollector, DiskIOCollector, NetCollector
+)
+
+# Intervalo de refresco en ms (argumento --rate=MS o variable SM_OVERLAY_MS)
+REFRESH_MS = int(os.environ.get("SM_OVERLAY_MS", "250"))
+for _arg in sys.argv[1:]:
+    if _arg.startswith("--rate="):
+        REFRESH_MS = int(_arg.split("=", 1)[1])
+REFRESH_MS = max(50, REFRESH_MS)
+
+BG_COLOR = "#0ab1ff"
+SPARK_WIDTH = 40
+SPARK_HEIGHT = 14
+# Escala logarítmica para tasas en bytes/s (tope en 1 GB/s)
+BYTES_SCALE = math.log10(1 + 1024 ** 3)
 
 def exit_app():
     """Cierra el UI flotante."""
@@ -16,6 +38,8 @@ def right_click(event):
     menu = tk.Menu(root, tearoff=0)
     menu.add_command(label="Limpiar RAM", command=limpiar_memoria)
     menu.add_command(label="Limpiar papelera", command=limpiar_papelera)
+    menu.add_command(label="Estadísticas internas", command=mostrar_estadisticas)
+    menu.add_command(label="Capturar perfil (50 ticks)", command=capturar_perfil)
     menu.add_command(label="Cerrar monitor", command=exit_app)
     if root.attributes("-topmost"):
         menu.add_command(label="Llevar atras", command=topmost_toggle)
@@ -23,6 +47,23 @@ def right_click(event):
         menu.add_command(label="Llevar adelante", command=topmost_toggle)
     menu.tk_popup(event.x_root, event.y_root)
 
+def mostrar_estadisticas():
+    """Muestra el coste propio del monitor flotante."""
+    proc = psutil.Process()
+    rss_mb = proc.memory_info().rss / (1024 * 1024)
+    messagebox.showinfo(
+        "Estadísticas internas",
+        f"RSS: {rss_mb:.1f} MB | refresco: {REFRESH_MS} ms\n\n{PROFILER.report()}"
+    )
+
+def capturar_perfil():
+    """Captura con cProfile los próximos 50 ticks del monitor."""
+    path = os.path.join(
+        os.path.dirname(os.path.abspath(__file__)),
+        f"monitor_ui_profile_{time.strftime('%Y%m%d_%H%M%S')}.prof"
+    )
+    PROFILER.start_capture(50, path)
+
 def move_window(event):
     """Mueve la ventana al arrastrarla."""
     root.geometry(f'+{event.x_root}+{event.y_root}')
@@ -36,20 +77,61 @@ root.title("System Monitor")
 root.overrideredirect(True)  # sin barra de título
 root.attributes("-topmost", False)  # siempre encima
 root.attributes("-alpha", 0.8)  # transparencia
-root.geometry("150x20")
-root.configure(bg="#0ab1ff")
+root.geometry("300x36")
+root.configure(bg=BG_COLOR)
+
+
+class Sparkline:
+    """
+    Gráfico mínimo en un Canvas: en cada muestra desplaza las columnas
+    existentes un píxel y dibuja solo la nueva.
+    """
+    def __init__(self, parent, color):
+        self.canvas = tk.Canvas(
+            parent, width=SPARK_WIDTH, height=SPARK_HEIGHT,
+            bg=BG_COLOR, highlightthickness=0
+        )
+        self.color = color
+        self.columns = deque()
+
+    def push(self, fraction):
+        """Agrega una muestra normalizada entre 0 y 1."""
+        fraction = min(1.0, max(0.0, fraction))
+        self.canvas.move("col", -1, 0)
+        if len(self.columns) >= SPARK_WIDTH:
+            self.canvas.delete(self.columns.popleft())
+        top = SPARK_HEIGHT - max(1, round(fraction * SPARK_HEIGHT))
+        self.columns.append(self.canvas.create_line(
+            SPARK_WIDTH - 1, SPARK_HEIGHT, SPARK_WIDTH - 1, top,
+            fill=self.color, tags="col"
+        ))
+
+
+class Metric:
+    """Etiqueta + sparkline; solo reconfigura la etiqueta si cambia el texto."""
+    def __init__(self, row, column, text, color):
+        self.label = tk.Label(
+            root, text=text, fg="red", bg=BG_COLOR,
+            anchor="w", width=16, font=("Consolas", 8)
+        )
+        self.label.grid(row=row, column=column * 2, sticky="w")
+        self.spark = Sparkline(root, color)
+        self.spark.canvas.grid(row=row, column=column * 2 + 1, padx=2)
+        self.text = text
 
-# --- Etiquetas dinámicas ---
-cpu_label = tk.Label(
-    root, text="CPU: 0%", fg="red", bg="#0ab1ff",
-    anchor="w", font=("Consolas", 8)
-)
-cpu_label.pack(fill="x", pady=2, side="left")
+    def update(self, text, fraction):
+        """Actualiza el texto y agrega una columna al sparkline."""
+        if text != self.text:
+            self.label.config(text=text)
+            self.text = text
+        self.spark.push(fraction)
 
-ram_label = tk.Label(
-    root, text="RAM: 0%", fg="red", bg="#0ab1ff",
-    anchor="w", font=("Consolas", 8))
-ram_label.pack(fill="x", pady=2, side="right")
+
+# --- Etiquetas dinámicas ---
+cpu_metric = Metric(0, 0, "CPU: 0%", "red")
+ram_metric = Metric(0, 1, "RAM: 0%", "yellow")
+disk_metric = Metric(1, 0, "Disco: 0 B/s", "white")
+net_metric = Metric(1, 1, "Red: 0 B/s", "navy")
 
 # --- Eventos de arrastre y clic derecho ---
 root.bind("<B1-Motion>", move_window)
@@ -57,40 +139,57 @@ root.bind("<Button-3>", right_click)
 
 # --- Botón limpiar ---
 def limpiar_memoria():
-    """Limpia la memoria RAM y muestra un mensaje con el resultado."""
+    """Limpia la memoria RAM y mide el efecto con ventanas antes/después."""
+    with effect_meter.track("trim", "Recortar memoria de procesos") as run:
+        trim_working_set_all()
+    wait = effect_meter.settle + effect_meter.window * effect_meter.interval
+    messagebox.showinfo(
+        "Memory Cleaner", f"Memoria recortada. Midiendo el efecto durante unos {wait:.0f} s."
+    )
+    root.after(1000, lambda: mostrar_efecto(run))
 
-    # RAM usada antes
-    before = psutil.virtual_memory().used
 
-    # Ejecuta la limpieza
-    trim_working_set_all()
+def mostrar_efecto(run):
+    """Muestra el efecto medido cuando termina la ventana posterior."""
+    if not run.done.is_set():
+        root.after(1000, lambda: mostrar_efecto(run))
+        return
+    messagebox.showinfo("Memory Cleaner", "\n".join(describe(run.result)))
 
-    # RAM usada después
-    after = psutil.virtual_memory().used
 
-    # Calcular diferencia
-    freed = before - after
-    if freed > 0:
-        freed_mb = freed / (1024 * 1024)
-        msg = f"Se liberaron {freed_mb:.2f} MB de memoria."
-    else:
-        msg = "No se liberó memoria."
-
-    messagebox.showinfo("Memory Cleaner", msg)
+def _overlay_collectors():
+    """Colectores del monitor flotante, al ritmo de refresco de la ventana."""
+    collectors = [CpuCollector(), MemoryCollector(), DiskIOCollector(), NetCollector()]
+    for collector in collectors:
+        collector.interval = REFRESH_MS / 1000
+    runtime = CollectorRuntime(collectors)
+    runtime.start()
+    return runtime
 
 
-def actualizar_labels():
-    """Función de actualización."""
-    while True:
-        cpu = psutil.cpu_percent(interval=1)
-        ram = psutil.virtual_memory().percent
-        # disk = psutil.disk_usage('/').percent
+collectors = _overlay_collectors()
+effect_meter = EffectMeter()
 
-        cpu_label.config(text=f"CPU: {cpu:.1f}%")
-        ram_label.config(text=f"RAM: {ram:.1f}%")
-        # activity_label.config(text=f"Almacenamiento: {disk:.1f}%")
 
-        time.sleep(1)
+@instrument("monitor_ui.actualizar_labels")
+def actualizar_labels():
+    """Función de actualización, programada en el bucle de eventos de Tk."""
+    cpu = collectors.latest("cpu.percent", 0.0)
+    memory = collectors.latest("memory.virtual")
+    ram = memory.percent if memory is not None else 0.0
+    disk = collectors.latest("disk.read_rate", 0.0) + collectors.latest("disk.write_rate", 0.0)
+    net = collectors.latest("net.sent_rate", 0.0) + collectors.latest("net.recv_rate", 0.0)
+
+    cpu_metric.update(f"CPU: {cpu:.1f}%", cpu / 100)
+    ram_metric.update(f"RAM: {ram:.1f}%", ram / 100)
+    disk_metric.update(
+        f"Disco: {format_bytes_rate(disk)}", math.log10(1 + disk) / BYTES_SCALE
+    )
+    net_metric.update(
+        f"Red: {format_bytes_rate(net)}", math.log10(1 + net) / BYTES_SCALE
+    )
+
+    root.after(REFRESH_MS, actualizar_labels)
 
 def limpiar_papelera():
     """Vacía la papelera de reciclaje desde el monitor"""
@@ -136,7 +235,7 @@ def limpiar_papelera():
     except Exception as e:
         messagebox.showerror("Error", f"Error vaciando papelera: {e}")
 
-# --- Hilo aparte para refrescar ---
-threading.Thread(target=actualizar_labels, daemon=True).start()
+# --- Refresco en el bucle de eventos de Tk ---
+root.after(REFRESH_MS, actualizar_labels)
 
 root.mainloop()
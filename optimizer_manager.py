@@ -1,24 +1,68 @@
 """optimizer_manager.py"""
 import os
 import json
-import tempfile
+import time
 import subprocess
-import shutil
+from contextlib import contextmanager
 import psutil
 # pylint: disable=no-name-in-module
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QPushButton, QTextEdit, QMessageBox,
-    QInputDialog, QDialog, QFormLayout, QSpinBox, QLabel, QDialogButtonBox
+    QInputDialog, QDialog, QFormLayout, QSpinBox, QLabel, QDialogButtonBox,
+    QCheckBox, QTreeWidget, QTreeWidgetItem
 )
+from PyQt5.QtCore import QTimer
+from system_utils.profiler import instrument
+from system_utils.temp_cleaner import clean_temp, iter_clean_temp
+from system_utils.recycle_bin import empty_recycle_bin
+from system_utils.maintenance_scheduler import (
+    MaintenanceScheduler, MaintenanceJob, single_step
+)
+from system_utils.lock_finder import LockFinder
+from system_utils.effect_meter import EffectMeter, describe
+from lock_finder_manager import LockFinderDialog
 
 CONFIG_FILE = os.path.join(
     os.path.dirname(__file__), "virtual_memory_config.json"
     )
 
+HOUR = 3600
+
+
+def _trim_working_sets():
+    """Recorte de memoria por pasos (importación diferida: requiere administrador)."""
+    # pylint: disable=import-outside-toplevel
+    from system_utils.memory_cleaner import iter_trim_working_set
+    return (yield from iter_trim_working_set())
+
+
+def maintenance_jobs():
+    """Trabajos que se ejecutan automáticamente con el equipo en reposo."""
+    return [
+        MaintenanceJob(
+            "temp", "Limpiar archivos temporales", iter_clean_temp, 24 * HOUR
+            ),
+        MaintenanceJob(
+            "recycle", "Vaciar papelera",
+            lambda: single_step(empty_recycle_bin), 7 * 24 * HOUR,
+            summary=lambda result: result[1]
+            ),
+        MaintenanceJob(
+            "trim", "Recortar memoria de procesos", _trim_working_sets, 6 * HOUR,
+            summary=lambda r: f"Procesos totales: {r[0]} | Recortados: {r[1]} | Fallidos: {r[2]}"
+            ),
+    ]
+
 class OptimizerTab(QWidget):
     """Pestaña de optimización del sistema."""
-    def __init__(self):
+    def __init__(self, process_tab=None, effect_meter=None):
         super().__init__()
+        self.process_tab = process_tab
+        # Efecto antes/después de cada acción, guardado por acción
+        self.effects = effect_meter or EffectMeter()
+        self.pending_effects = []
+        self.lock_finder = LockFinder()
+        self.last_failed_paths = []
         layout = QVBoxLayout(self)
 
         self.log = QTextEdit()
@@ -37,52 +81,125 @@ class OptimizerTab(QWidget):
         layout.addWidget(btn_temp)
         layout.addWidget(btn_mem)
         layout.addWidget(btn_recycle)
+
+        # ¿Quién bloquea los archivos que no se pudieron borrar?
+        self.btn_locks = QPushButton("¿Quién bloquea estos archivos?")
+        self.btn_locks.setEnabled(False)
+        self.btn_locks.clicked.connect(lambda: self.open_lock_finder(self.last_failed_paths))
+        btn_find_lock = QPushButton("Buscar qué proceso bloquea un archivo...")
+        btn_find_lock.clicked.connect(lambda: self.open_lock_finder())
+        layout.addWidget(self.btn_locks)
+        layout.addWidget(btn_find_lock)
+
+        btn_effects = QPushButton("Ver efecto medido de las acciones")
+        btn_effects.clicked.connect(self.show_effects_summary)
+        layout.addWidget(btn_effects)
+
+        # Mantenimiento automático en reposo
+        self.scheduler = MaintenanceScheduler(maintenance_jobs(), effects=self.effects)
+        self.chk_idle = QCheckBox("Mantenimiento automático con el equipo en reposo")
+        self.chk_idle.setChecked(self.scheduler.enabled)
+        self.chk_idle.toggled.connect(self.scheduler.set_enabled)
+        self.idle_label = QLabel()
+        self.jobs_tree = QTreeWidget()
+        self.jobs_tree.setHeaderLabels(
+            ["Tarea", "Estado", "Última ejecución", "Duración", "Resultado"]
+            )
+        self.jobs_tree.setRootIsDecorated(False)
+        self.jobs_tree.setMaximumHeight(110)
+        layout.addWidget(self.chk_idle)
+        layout.addWidget(self.idle_label)
+        layout.addWidget(self.jobs_tree)
         layout.addWidget(self.log)
 
+        self.maintenance_timer = QTimer(self)
+        self.maintenance_timer.timeout.connect(self.refresh_maintenance)
+        self.maintenance_timer.start(2000)
+        self.refresh_maintenance()
+        if self.scheduler.enabled:
+            self.scheduler.start()
+
         # Cargar configuración previa si existe
         self.last_config = self.load_config()
 
+    def refresh_maintenance(self):
+        """Actualiza el estado de los trabajos de mantenimiento."""
+        self.refresh_effects()
+        if not self.scheduler.enabled:
+            self.idle_label.setText("Estado: desactivado")
+        else:
+            self.idle_label.setText(f"Estado: {self.scheduler.detector.reason}")
+
+        status = self.scheduler.status()
+        if self.jobs_tree.topLevelItemCount() != len(status):
+            self.jobs_tree.clear()
+            for _ in status:
+                self.jobs_tree.addTopLevelItem(QTreeWidgetItem())
+        for row, (job, state) in enumerate(status):
+            last_run = state.get("last_run")
+            values = [
+                job.label,
+                state.get("status", "Pendiente"),
+                time.strftime("%d/%m %H:%M", time.localtime(last_run)) if last_run else "-",
+                f"{state['duration']:.1f} s" if "duration" in state else "-",
+                state.get("result", ""),
+            ]
+            item = self.jobs_tree.topLevelItem(row)
+            for col, value in enumerate(values):
+                item.setText(col, value)
+
+    @contextmanager
+    def measured(self, name, label):
+        """Envuelve una acción para medir su efecto; el resultado se registra al terminar."""
+        with self.effects.track(name, label) as run:
+            yield run
+        self.pending_effects.append(run)
+
+    def refresh_effects(self):
+        """Registra las mediciones de efecto terminadas."""
+        for run in [run for run in self.pending_effects if run.done.is_set()]:
+            self.pending_effects.remove(run)
+            self.log_message(f"Efecto medido de «{run.label}»:")
+            for line in describe(run.result):
+                self.log.append(f"    {line}")
+
+    def show_effects_summary(self):
+        """Efecto medio de cada acción en todas las ejecuciones guardadas."""
+        lines = self.effects.store.describe_summary()
+        if not lines:
+            self.log_message("Todavía no hay efectos medidos.")
+            return
+        self.log_message("Efecto medio por acción (IC 95 % entre ejecuciones):")
+        for line in lines:
+            self.log.append(f"    {line}")
+
     def log_message(self, message):
         """Agrega un mensaje al log."""
         self.log.append(f"[+] {message}")
 
+    @instrument("OptimizerTab.clean_temp_files")
     def clean_temp_files(self):
         """
         Limpieza de temporales
         """
-        temp_dirs = [
-            tempfile.gettempdir(),
-            r"C:\Windows\Temp",
-            os.path.expandvars(r"%LocalAppData%\Temp"),
-            os.path.expandvars(r"%AppData%\Temp"),
-        ]
-        total_deleted = 0
-        total_failed = 0
-
-        for folder in temp_dirs:
-            if os.path.exists(folder):
-                for root, dirs, files in os.walk(folder, topdown=False):
-                    for f in files:
-                        try:
-                            os.remove(os.path.join(root, f))
-                            total_deleted += 1
-                        # pylint: disable=broad-exception-caught
-                        except Exception:
-                            total_failed += 1
-                    for d in dirs:
-                        path = os.path.join(root, d)
-                        try:
-                            shutil.rmtree(path, ignore_errors=True)
-                        # pylint: disable=broad-exception-caught
-                        except Exception:
-                            total_failed += 1
-
-        self.log_message(f"Archivos temporales eliminados: {total_deleted}")
-        if total_failed > 0:
+        with self.measured("temp", "Limpiar archivos temporales"):
+            result = clean_temp()
+
+        self.log_message(f"Archivos temporales eliminados: {result.deleted}")
+        if result.failed > 0:
             self.log_message(
-                f"No se pudieron eliminar {total_failed}"
+                f"No se pudieron eliminar {result.failed}"
                 + " archivos o carpetas (en uso)."
                 )
+        self.last_failed_paths = result.failed_paths
+        self.btn_locks.setEnabled(bool(result.failed_paths))
+
+    def open_lock_finder(self, paths=None):
+        """
+        Abre el buscador de procesos que bloquean archivos
+        """
+        dialog = LockFinderDialog(self.lock_finder, paths, self.process_tab, self)
+        dialog.exec_()
 
     def show_current_virtual_memory(self):
         """
@@ -227,41 +344,9 @@ class OptimizerTab(QWidget):
 
     def clean_recycle_bin(self):
         """Vacía la papelera de reciclaje."""
-        try:
-            # Primero verificar si hay elementos en la papelera
-            ps_script = r"""
-            $shell = New-Object -ComObject Shell.Application
-            $recycleBin = $shell.NameSpace(10)
-            $itemCount = $recycleBin.Items().Count
-            Write-Output $itemCount
-            """
-            # pylint: disable=subprocess-run-check
-            result = subprocess.run(
-                ["powershell", "-ExecutionPolicy", "Bypass", "-Command", ps_script],
-                capture_output=True, text=True, encoding="utf-8"
-            )
-
-            item_count = result.stdout.strip()
-
-            if item_count == "0":
-                self.log_message("La papelera de reciclaje ya está vacía.")
-                return
-
-            # Vaciar la papelera
-            # pylint: disable=subprocess-run-check
-            result = subprocess.run(
-                ["powershell", "-ExecutionPolicy", "Bypass", "-Command",
-                "Clear-RecycleBin -Force -Confirm:$false -ErrorAction SilentlyContinue"],
-                capture_output=True, text=True, encoding="utf-8"
-            )
-
-            self.log_message(
-                f"Papelera de reciclaje vaciada correctamente ({item_count}"
-                + " elementos eliminados)."
-                )
-        # pylint: disable=broad-exception-caught
-        except Exception as e:
-            self.log_message(f"Error vaciando papelera: {e}")
+        with self.measured("recycle", "Vaciar papelera"):
+            _, message = empty_recycle_bin()
+        self.log_message(message)
 
     def load_config(self):
         """Carga configuración previa de virtual_memory_config.json"""
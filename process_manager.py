@@ -1,15 +1,33 @@
 """Módulo para la gestión de procesos en una interfaz PyQt5."""
 import os
+import math
+import time
 from ctypes import wintypes
 import ctypes
 import subprocess
 # pylint: disable=no-name-in-module
-from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QTreeWidget,
-QTreeWidgetItem, QMenu, QAction, QMessageBox)
-from PyQt5.QtCore import QTimer, Qt
+from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTreeWidget,
+QTreeWidgetItem, QMenu, QAction, QMessageBox, QLineEdit, QLabel, QSpinBox,
+QTabWidget)
+from PyQt5.QtCore import QTimer, Qt, pyqtSignal
+from PyQt5.QtGui import QBrush, QColor
 import psutil
 import win32process
 import win32gui
+from system_utils.process_index import ProcessIndex
+from system_utils.io_rates import IORates, format_bytes_rate
+from system_utils.runaway_detector import RunawayDetector
+from system_utils.process_governor import ProcessGovernor
+from system_utils.profiler import instrument
+from system_utils.uss_worker import UssWorker, UNAVAILABLE
+from system_utils.leak_detector import LeakDetector
+from system_utils.process_watch import ProcessWatch
+from system_utils.process_table import ProcessTable
+from system_utils.exe_metadata import ExeMetadataCache
+from exe_icons import apply_exe_metadata
+from governor_manager import GovernorDialog
+from system_utils.foreground_boost import ForegroundBoost
+from boost_manager import BoostDialog
 
 user32 = ctypes.windll.user32
 
@@ -43,7 +61,8 @@ def classify_process(proc, foreground_pid):
             "NT AUTHORITY\\NETWORK SERVICE"
         ]:
             return "Servicio"
-        if has_visible_window(proc.pid):
+        # La ventana en primer plano es visible: evita enumerar ventanas
+        if proc.pid == foreground_pid or has_visible_window(proc.pid):
             return "Aplicación"
         return "Segundo plano"
     # pylint: disable=broad-exception-caught
@@ -51,21 +70,110 @@ def classify_process(proc, foreground_pid):
         return "Desconocido"
 
 
+# Atributos leídos en un solo recorrido (oneshot) por proceso
+PROCESS_ATTRS = [
+    'pid', 'ppid', 'name', 'exe', 'create_time', 'cpu_percent',
+    'memory_percent', 'cpu_times', 'memory_info', 'io_counters'
+]
+
+PROCESS_COLUMNS = [
+    "Nombre", "PID", "CPU %", "RAM %", "Privada",
+    "Lectura/s", "Escritura/s", "E/S ops/s", "Red/otros/s", "Fuga",
+    "Descripción", "Versión", "Tamaño"
+]
+
+PRIVATE_COLUMN = 4
+LEAK_COLUMN = 9
+# Descripción, versión y tamaño del ejecutable (caché de metadatos)
+METADATA_COLUMN = 10
+# Antigüedad a partir de la cual el dato de memoria privada se muestra como viejo
+PRIVATE_STALE_AFTER = 10.0
+STALE_BRUSH = QBrush(QColor("gray"))
+
+# Rol con el valor numérico de cada columna para ordenar
+SORT_ROLE = Qt.ItemDataRole.UserRole + 1
+
+
+class ProcessItem(QTreeWidgetItem):
+    """Fila de proceso que ordena por valor numérico en vez de por texto."""
+    def __lt__(self, other):
+        column = self.treeWidget().sortColumn() if self.treeWidget() else 0
+        mine = self.data(column, SORT_ROLE)
+        theirs = other.data(column, SORT_ROLE)
+        if mine is not None and theirs is not None:
+            return mine < theirs
+        return super().__lt__(other)
+
+    def set_value(self, column, text, value):
+        """Asigna el texto visible y el valor de ordenación de una columna."""
+        self.setText(column, text)
+        self.setData(column, SORT_ROLE, value)
+
+
+class CategoryItem(QTreeWidgetItem):
+    """Cabecera de categoría: conserva su posición con cualquier orden de columna."""
+    def __init__(self, tree, title, rank):
+        super().__init__(tree, [title])
+        self.rank = rank
+
+    def __lt__(self, other):
+        tree = self.treeWidget()
+        if tree is None or not isinstance(other, CategoryItem):
+            return super().__lt__(other)
+        # Qt invierte el resultado en orden descendente
+        if tree.header().sortIndicatorOrder() == Qt.SortOrder.DescendingOrder:
+            return self.rank > other.rank
+        return self.rank < other.rank
+
+
 class ProcessTab(QWidget):
     """Pestaña de gestión de procesos."""
-    def __init__(self):
+    # Emite la lista de `proc.info` de cada recorrido (incluye servicios)
+    snapshot_ready = pyqtSignal(list)
+    # Emite [(RunawayAlert, nombre), ...] cuando se detectan procesos desbocados
+    runaway_detected = pyqtSignal(list)
+    # Emite [(LeakReport, nombre), ...] cuando se detectan fugas nuevas
+    leak_detected = pyqtSignal(list)
+    # Procesos aparecidos (lista de `proc.info`) y terminados (lista de PIDs)
+    processes_started = pyqtSignal(list)
+    processes_exited = pyqtSignal(list)
+
+    def __init__(self, watch=None, metadata=None):
         super().__init__()
 
         layout = QVBoxLayout(self)
 
+        # Filtro por nombre, PID, ruta o línea de comandos
+        self.filter_edit = QLineEdit()
+        self.filter_edit.setPlaceholderText("Buscar por nombre, PID, ruta o comando...")
+        self.filter_edit.setClearButtonEnabled(True)
+        self.filter_edit.textChanged.connect(self.apply_filter)
+
+        # Estado del último recorrido en columnas NumPy (tasas de E/S, detectores)
+        self.table = ProcessTable(smoothing=3)
+
+        # Ventana de suavizado de las tasas de E/S
+        self.smoothing_spin = QSpinBox()
+        self.smoothing_spin.setRange(1, 20)
+        self.smoothing_spin.setValue(self.table.smoothing)
+        self.smoothing_spin.setSuffix(" muestras")
+        self.smoothing_spin.valueChanged.connect(self.table.set_smoothing)
+
+        top_bar = QHBoxLayout()
+        top_bar.addWidget(self.filter_edit)
+        top_bar.addWidget(QLabel("Suavizado E/S:"))
+        top_bar.addWidget(self.smoothing_spin)
+        layout.addLayout(top_bar)
+
         self.tree = QTreeWidget()
-        self.tree.setHeaderLabels(["Nombre", "PID", "CPU %", "RAM %"])
+        self.tree.setHeaderLabels(PROCESS_COLUMNS)
+        self.tree.setSortingEnabled(True)
         self.tree.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self.tree.customContextMenuRequested.connect(self.open_context_menu)
 
         # Categorías
-        self.apps_item = QTreeWidgetItem(self.tree, ["Aplicaciones"])
-        self.bg_item = QTreeWidgetItem(self.tree, ["Procesos en segundo plano"])
+        self.apps_item = CategoryItem(self.tree, "Aplicaciones", 0)
+        self.bg_item = CategoryItem(self.tree, "Procesos en segundo plano", 1)
 
         layout.addWidget(self.tree)
         self.setLayout(layout)
@@ -73,6 +181,42 @@ class ProcessTab(QWidget):
         # Diccionario PID -> QTreeWidgetItem
         self.proc_map = {}
 
+        # Índice incremental para el filtro y PIDs actualmente ocultos
+        self.index = ProcessIndex()
+        self.hidden_pids = set()
+
+        # Vigilante de procesos desbocados (líneas base EWMA)
+        self.runaway = RunawayDetector()
+
+        # Memoria privada (USS) calculada en segundo plano
+        self.uss_worker = UssWorker(workers=2)
+
+        # Detector de fugas (muestra cada 30 s, analiza cada 5 min)
+        self.leaks = LeakDetector()
+        self.leak_pids = set()
+
+        # Gobernador: reglas aplicadas solo a los PIDs nuevos
+        self.governor = ProcessGovernor()
+        self.processes_started.connect(self.governor.on_processes_started)
+        self.processes_exited.connect(self.governor.on_processes_exited)
+
+        # Modo primer plano: sigue el foco por eventos y restaura al salir
+        self.boost = ForegroundBoost()
+        self.processes_started.connect(self.boost.on_processes_started)
+        self.processes_exited.connect(self.boost.on_processes_exited)
+        # El limitador de CPU no reanuda lo que el modo primer plano suspendió
+        self.governor.throttler.skip = self.boost.is_suspended
+        if self.boost.start():
+            self.boost.notify(get_foreground_pid())
+
+        # Metadatos e iconos de ejecutables, cargados en segundo plano
+        self.metadata = metadata or ExeMetadataCache()
+        self.metadata_ready = self.metadata.subscribe()
+
+        # Vigilante compartido: un recorrido por tick para todos los suscriptores
+        self.watch = watch or ProcessWatch(PROCESS_ATTRS)
+        self.watch.subscribe(self.on_process_events)
+
         # Inicializar medición de CPU
         for proc in psutil.process_iter():
             try:
@@ -87,12 +231,35 @@ class ProcessTab(QWidget):
         self.timer.timeout.connect(self.update_processes)
         self.timer.start(1500)
 
+    @instrument("ProcessTab.update_processes")
     def update_processes(self):
-        """Actualiza la lista de procesos."""
-        current_pids = set()
-        foreground_pid = get_foreground_pid()
+        """Avanza el vigilante; la pestaña se actualiza como un suscriptor más."""
+        self.watch.poll()
+
+    def on_process_events(self, events):
+        """Aplica los eventos de un tick a la lista de procesos."""
+        # Columnas del tick (filas alineadas con `events.snapshot`)
+        rows = self.table.update(events.snapshot, events.now)
+
+        # Sin ordenación durante la actualización: se ordena una vez al final
+        self.tree.setSortingEnabled(False)
+
+        # Limpiar procesos cerrados (antes de reutilizar su PID)
+        for info in events.exited:
+            pid = info['pid']
+            self.uss_worker.discard(pid)
+            item = self.proc_map.pop(pid, None)
+            if item is None:
+                continue
+            self.index.remove(pid)
+            self.hidden_pids.discard(pid)
+            parent = item.parent()
+            if parent:
+                parent.removeChild(item)
 
-        for proc in psutil.process_iter(['pid', 'name', 'exe']):
+        foreground_pid = get_foreground_pid()
+        io_rates = self.io_rates(rows)
+        for proc, rates in zip(events.procs, io_rates):
             try:
                 estado = classify_process(proc, foreground_pid)
                 if estado == "Servicio":
@@ -101,21 +268,14 @@ class ProcessTab(QWidget):
                 pid = proc.info['pid']
                 name = proc.info['name']
                 exe = proc.info['exe'] or ""
-                cpu_percent = proc.cpu_percent(interval=0.0)
-                ram_percent = proc.memory_percent()
-                current_pids.add(pid)
 
                 if pid in self.proc_map:
                     item = self.proc_map[pid]
-                    item.setText(2, f"{cpu_percent:.1f}%")
-                    item.setText(3, f"{ram_percent:.1f}%")
+                    self.set_item_values(item, proc.info, rates)
                 else:
-                    item = QTreeWidgetItem([
-                        name,
-                        str(pid),
-                        f"{cpu_percent:.1f}%",
-                        f"{ram_percent:.1f}%"
-                    ])
+                    item = ProcessItem([name])
+                    item.set_value(1, str(pid), pid)
+                    self.set_item_values(item, proc.info, rates)
                     item.setData(0, Qt.ItemDataRole.UserRole, {
                         "pid": pid,
                         "exe": exe
@@ -127,19 +287,199 @@ class ProcessTab(QWidget):
                         self.bg_item.addChild(item)
 
                     self.proc_map[pid] = item
+                    self.index_process(proc, pid, name, exe)
+                    entry = self.metadata.get(exe)
+                    if entry is not None:
+                        apply_exe_metadata(item, entry, METADATA_COLUMN)
 
             except (psutil.NoSuchProcess, psutil.AccessDenied):
                 continue
 
-        # Limpiar procesos cerrados
-        for pid in list(self.proc_map.keys()):
-            if pid not in current_pids:
-                item = self.proc_map.pop(pid)
-                parent = item.parent()
-                if parent:
-                    parent.removeChild(item)
-
+        self.apply_ready_metadata()
+        snapshot = events.snapshot
+        self.refresh_private_memory(snapshot)
+        self.check_leaks(snapshot, rows)
+        self.tree.setSortingEnabled(True)
         self.tree.expandAll()
+        if events.exited:
+            self.processes_exited.emit([info['pid'] for info in events.exited])
+        if events.started:
+            self.processes_started.emit(events.started)
+        self.check_runaways(rows)
+        self.snapshot_ready.emit(snapshot)
+
+    def private_bytes(self, info):
+        """
+        Memoria privada para el detector de fugas: bytes privados (Windows)
+        o USS en caché. None si no hay dato: mezclar RSS y USS en la misma
+        serie falsearía la pendiente, así que esa muestra queda como hueco.
+        """
+        mem = info['memory_info']
+        if mem is None:
+            return None
+        private = getattr(mem, 'private', None)
+        if private is not None:
+            return private
+        cached = self.uss_worker.get(info['pid'], info['create_time'])
+        return cached[0] if cached not in (None, UNAVAILABLE) else None
+
+    def check_leaks(self, snapshot, rows):
+        """Muestrea la memoria privada y, cada pocos minutos, busca fugas."""
+        now = time.monotonic()
+        if not snapshot or not self.leaks.due(now):
+            return
+        self.leaks.sample(
+            self.table.pid[rows].tolist(),
+            self.table.create_time[rows],
+            [self.private_bytes(info) for info in snapshot],
+            now
+        )
+        if not self.leaks.analysis_due(now):
+            return
+
+        new = self.leaks.analyze(psutil.virtual_memory().available, now)
+        for pid in self.leak_pids - set(self.leaks.reports):
+            item = self.proc_map.get(pid)
+            if item is not None:
+                item.set_value(LEAK_COLUMN, "", 0.0)
+                item.setToolTip(LEAK_COLUMN, "")
+        for pid, report in self.leaks.reports.items():
+            item = self.proc_map.get(pid)
+            if item is not None:
+                item.set_value(LEAK_COLUMN, f"+{report.mb_per_hour:.1f} MB/h",
+                               report.mb_per_hour)
+                item.setToolTip(
+                    LEAK_COLUMN,
+                    f"R² {report.r2:.2f}, {report.samples} muestras. "
+                    f"Agotaría la memoria disponible en ~{report.hours_to_exhaustion:.1f} h"
+                )
+        self.leak_pids = set(self.leaks.reports)
+
+        if new:
+            self.leak_detected.emit([(report, self.table.name(report.pid)) for report in new])
+
+    def check_runaways(self, rows):
+        """Pasa las columnas de la tabla al detector de procesos desbocados."""
+        if not rows.size:
+            return
+        table = self.table
+        alerts = self.runaway.update(
+            table.pid[rows].tolist(), table.create_time[rows], table.cpu_percent[rows],
+            table.rss[rows], table.read_bytes[rows] + table.write_bytes[rows],
+            time.monotonic()
+        )
+        if alerts:
+            self.runaway_detected.emit(
+                [(alert, table.name(alert.pid)) for alert in alerts]
+            )
+
+    def io_rates(self, rows):
+        """Tasas de E/S suavizadas de la tabla, alineadas con las filas del recorrido."""
+        table = self.table
+        columns = [table.read_rate[rows], table.write_rate[rows],
+                   table.ops_rate[rows], table.other_rate[rows]]
+        read, write, ops, other = [column.tolist() for column in columns]
+        # NaN: sin muestra previa (0) o sin contador en el sistema (None)
+        return [
+            IORates(0.0 if math.isnan(r) else r, 0.0 if math.isnan(w) else w,
+                    0.0 if math.isnan(o) else o, None if math.isnan(x) else x)
+            for r, w, o, x in zip(read, write, ops, other)
+        ]
+
+    @staticmethod
+    def set_item_values(item, info, rates):
+        """Actualiza las columnas de uso de una fila con los datos del recorrido."""
+        cpu_percent = info['cpu_percent'] or 0.0
+        ram_percent = info['memory_percent'] or 0.0
+
+        item.set_value(2, f"{cpu_percent:.1f}%", cpu_percent)
+        item.set_value(3, f"{ram_percent:.1f}%", ram_percent)
+        item.set_value(5, format_bytes_rate(rates.read_bps), rates.read_bps)
+        item.set_value(6, format_bytes_rate(rates.write_bps), rates.write_bps)
+        item.set_value(7, f"{rates.ops_ps:.0f}", rates.ops_ps)
+        item.set_value(8, format_bytes_rate(rates.other_bps), rates.other_bps or 0.0)
+
+    def apply_ready_metadata(self):
+        """Aplica los metadatos resueltos desde el último tick a todas sus filas."""
+        ready = set()
+        while not self.metadata_ready.empty():
+            ready.add(self.metadata_ready.get())
+        if not ready:
+            return
+        for item in self.proc_map.values():
+            exe = item.data(0, Qt.ItemDataRole.UserRole)["exe"]
+            if exe in ready:
+                entry = self.metadata.get(exe)
+                if entry is not None:
+                    apply_exe_metadata(item, entry, METADATA_COLUMN)
+
+    def visible_pids(self):
+        """PIDs de las filas que se ven en pantalla (recorre solo esas filas)."""
+        viewport = self.tree.viewport()
+        item = self.tree.itemAt(0, 0)
+        bottom = viewport.height() if viewport is not None else 0
+        pids = set()
+        while item is not None and self.tree.visualItemRect(item).top() < bottom:
+            data = item.data(0, Qt.ItemDataRole.UserRole)
+            if isinstance(data, dict):
+                pids.add(data["pid"])
+            item = self.tree.itemBelow(item)
+        return pids
+
+    def refresh_private_memory(self, snapshot):
+        """Pide al pool los datos viejos y muestra los ya calculados con su antigüedad."""
+        visible = self.visible_pids()
+        self.uss_worker.request(
+            (info['pid'], info['create_time'],
+             info['memory_info'].rss if info['memory_info'] else 0,
+             info['pid'] in visible)
+            for info in snapshot if info['pid'] in self.proc_map
+        )
+
+        for info in snapshot:
+            item = self.proc_map.get(info['pid'])
+            if item is None:
+                continue
+            cached = self.uss_worker.get(info['pid'], info['create_time'])
+            if cached is None:
+                item.set_value(PRIVATE_COLUMN, "…", -1)
+                continue
+            if cached is UNAVAILABLE:
+                item.set_value(PRIVATE_COLUMN, "N/A", -1)
+                continue
+            value, age = cached
+            text = f"{value / (1024 * 1024):.1f} MB"
+            if age > PRIVATE_STALE_AFTER:
+                text += f" (hace {age:.0f} s)"
+                item.setForeground(PRIVATE_COLUMN, STALE_BRUSH)
+            else:
+                item.setData(PRIVATE_COLUMN, Qt.ItemDataRole.ForegroundRole, None)
+            item.set_value(PRIVATE_COLUMN, text, value)
+
+    def index_process(self, proc, pid, name, exe):
+        """Agrega un proceso nuevo al índice y le aplica el filtro activo."""
+        try:
+            cmdline = proc.cmdline()
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            cmdline = None
+        self.index.add(pid, name, exe, cmdline)
+
+        query = self.filter_edit.text()
+        if query and not self.index.matches(pid, query):
+            self.proc_map[pid].setHidden(True)
+            self.hidden_pids.add(pid)
+
+    @instrument("ProcessTab.apply_filter")
+    def apply_filter(self, text):
+        """Oculta los procesos que no coinciden; solo toca las filas que cambian."""
+        matched = self.index.search(text)
+        hidden = set(self.proc_map) - matched
+
+        for pid in hidden - self.hidden_pids:
+            self.proc_map[pid].setHidden(True)
+        for pid in self.hidden_pids - hidden:
+            self.proc_map[pid].setHidden(False)
+        self.hidden_pids = hidden
 
     def open_context_menu(self, pos):
         """Abre el menú contextual para un proceso."""
@@ -158,6 +498,22 @@ class ProcessTab(QWidget):
         kill_action.triggered.connect(lambda: self.terminate_process(data["pid"]))
         menu.addAction(kill_action)
 
+        # Reglas del gobernador
+        rule_action = QAction("Crear regla para este proceso...", self)
+        rule_action.triggered.connect(lambda: self.open_governor(item.text(0)))
+        menu.addAction(rule_action)
+        rules_action = QAction("Reglas de procesos...", self)
+        rules_action.triggered.connect(lambda: self.open_governor())
+        menu.addAction(rules_action)
+
+        # Modo primer plano
+        boost_action = QAction("Frenar procesos cuando esta aplicación esté delante...", self)
+        boost_action.triggered.connect(lambda: self.open_boost(item.text(0)))
+        menu.addAction(boost_action)
+        profiles_action = QAction("Modo primer plano...", self)
+        profiles_action.triggered.connect(lambda: self.open_boost())
+        menu.addAction(profiles_action)
+
         # Propiedades
         if data["exe"] and os.path.exists(data["exe"]):
             prop_action = QAction("Propiedades", self)
@@ -168,6 +524,30 @@ class ProcessTab(QWidget):
         if viewport is not None:
             menu.exec_(viewport.mapToGlobal(pos))
 
+    def open_governor(self, new_match=None):
+        """Abre el editor de reglas; las nuevas reglas se aplican a los procesos nuevos."""
+        dialog = GovernorDialog(self.governor, self, new_match)
+        dialog.exec_()
+
+    def open_boost(self, new_app=None):
+        """Abre el editor de perfiles del modo primer plano."""
+        dialog = BoostDialog(self.boost, self, new_app)
+        dialog.exec_()
+
+    def select_process(self, pid):
+        """Muestra la pestaña y selecciona la fila del proceso (quitando el filtro si la oculta)."""
+        item = self.proc_map.get(pid)
+        if item is None:
+            return False
+        if item.isHidden():
+            self.filter_edit.clear()
+        tabs = self.window()
+        if isinstance(tabs, QTabWidget):
+            tabs.setCurrentWidget(self)
+        self.tree.setCurrentItem(item)
+        self.tree.scrollToItem(item)
+        return True
+
     def terminate_process(self, pid):
         """Finaliza un proceso dado su PID."""
         try:
@@ -0,0 +1,130 @@
+"""
+services_manager.py
+Pestaña de servicios: estado, tipo de inicio y uso de recursos de sus
+procesos anfitriones, atribuido desde el recorrido de ProcessWatch.
+"""
+# pylint: disable=no-name-in-module
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QTreeWidget, QLineEdit, QLabel
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QBrush, QColor
+from process_manager import ProcessItem
+from system_utils.services import ServiceCatalog, attribute_usage, default_backend
+
+SERVICE_COLUMNS = ["Nombre", "Descripción", "Estado", "Inicio", "PID", "CPU %", "Memoria", "Proceso"]
+STOPPED_BRUSH = QBrush(QColor("gray"))
+
+
+class ServicesTab(QWidget):
+    """
+    Suscriptor de ProcessWatch: no recorre procesos por su cuenta. Mientras
+    la pestaña no está visible solo guarda la última instantánea.
+    """
+    def __init__(self, watch, backend=None):
+        super().__init__()
+        backend = backend if backend is not None else default_backend()
+        self.catalog = ServiceCatalog(backend) if backend is not None else None
+        self.processes = {}
+        self.items = {}
+
+        layout = QVBoxLayout(self)
+        self.filter_edit = QLineEdit()
+        self.filter_edit.setPlaceholderText("Filtrar por nombre o descripción...")
+        self.filter_edit.setClearButtonEnabled(True)
+        self.filter_edit.textChanged.connect(lambda _: self.refresh())
+        layout.addWidget(self.filter_edit)
+
+        self.status = QLabel()
+        layout.addWidget(self.status)
+
+        self.tree = QTreeWidget()
+        self.tree.setHeaderLabels(SERVICE_COLUMNS)
+        self.tree.setRootIsDecorated(False)
+        self.tree.setSortingEnabled(True)
+        self.tree.sortByColumn(5, Qt.SortOrder.DescendingOrder)
+        layout.addWidget(self.tree)
+
+        if self.catalog is None:
+            self.status.setText("No hay un gestor de servicios compatible en este sistema.")
+            return
+        self.status.setText(f"Cargando servicios ({backend.name})...")
+        self.catalog.services()
+        watch.subscribe(self.on_process_events)
+
+    def on_process_events(self, events):
+        """Guarda la instantánea del tick y refresca si la pestaña se ve."""
+        self.processes = events.processes
+        if self.isVisible():
+            self.refresh()
+
+    def showEvent(self, event):  # pylint: disable=invalid-name
+        """Refresca al mostrar la pestaña con la última instantánea."""
+        super().showEvent(event)
+        self.refresh()
+
+    def refresh(self):
+        """Aplica la lista de servicios y su uso reutilizando las filas."""
+        if self.catalog is None:
+            return
+        services = self.catalog.services()
+        if not self.catalog.loaded:
+            return
+        usage = attribute_usage(services, self.processes)
+
+        text = self.filter_edit.text().strip().lower()
+        if text:
+            services = [s for s in services
+                        if text in s.name.lower() or text in s.display_name.lower()]
+
+        self.tree.setSortingEnabled(False)
+        current = {service.name for service in services}
+        for name in [name for name in self.items if name not in current]:
+            item = self.items.pop(name)
+            self.tree.takeTopLevelItem(self.tree.indexOfTopLevelItem(item))
+
+        running = 0
+        for service in services:
+            item = self.items.get(service.name)
+            if item is None:
+                item = ProcessItem(self.tree)
+                item.setText(0, service.name)
+                self.items[service.name] = item
+            self.set_item_values(item, service, usage[service.name])
+            running += bool(service.pids)
+        self.tree.setSortingEnabled(True)
+
+        summary = f"{len(services)} servicios, {running} con proceso en ejecución"
+        if self.catalog.error:
+            summary += f" (error al actualizar: {self.catalog.error})"
+        self.status.setText(summary)
+
+    @staticmethod
+    def set_item_values(item, service, usage):
+        """Rellena una fila con el servicio y el uso atribuido."""
+        item.setText(1, service.display_name)
+        item.setText(2, service.status)
+        item.setText(3, service.start_type)
+        pids = ", ".join(str(pid) for pid in service.pids[:3])
+        if len(service.pids) > 3:
+            pids += f" (+{len(service.pids) - 3})"
+        item.set_value(4, pids, service.pids[0] if service.pids else 0)
+
+        estimated = "≈" if usage.shared > 1 else ""
+        item.set_value(5, f"{estimated}{usage.cpu:.1f}", usage.cpu)
+        item.set_value(6, f"{estimated}{usage.rss / (1024 * 1024):.1f} MB", usage.rss)
+        host = ", ".join(sorted(set(usage.hosts)))
+        tooltip = ""
+        if usage.shared > 1:
+            host += f" (compartido entre {usage.shared} servicios)"
+            tooltip = "Uso del proceso anfitrión repartido a partes iguales"
+        item.setToolTip(5, tooltip)
+        item.setToolTip(6, tooltip)
+        item.setText(7, host)
+
+        brush = STOPPED_BRUSH if not service.pids else QBrush()
+        for column in range(len(SERVICE_COLUMNS)):
+            item.setForeground(column, brush)
+
+    def stop(self):
+        """Detiene el hilo de actualización de la lista."""
+        if self.catalog is not None:
+            self.catalog.stop()
@@ -8,13 +8,35 @@ from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QTreeWidget, QTreeWidgetItem,
     QMenu, QAction, QMessageBox
 )
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QTimer
+from system_utils.profiler import instrument
+from system_utils.exe_metadata import ExeMetadataCache
+from system_utils.delayed_start import DelayedStartStore, LAUNCHER_VALUE
+from exe_icons import apply_exe_metadata
+from delayed_start_manager import DelayedStartDialog
+
+# Primera columna de descripción, versión y tamaño
+METADATA_COLUMN = 5
+
+DELAYED_LOCATION = "Inicio escalonado"
 
 class StartupTab(QWidget):
     """Pestaña de gestión de aplicaciones de inicio."""
-    def __init__(self):
+    def __init__(self, impact_tracker=None, metadata=None):
         super().__init__()
 
+        # Metadatos e iconos, compartidos con la pestaña de procesos si se pasa la caché
+        self.metadata = metadata or ExeMetadataCache()
+        self.metadata_ready = self.metadata.subscribe()
+        self.metadata_timer = QTimer(self)
+        self.metadata_timer.timeout.connect(self.apply_ready_metadata)
+        self.metadata_timer.start(500)
+
+        # Mediciones reales de arranque (StartupImpactTracker), si las hay
+        self.impact_tracker = impact_tracker
+        if impact_tracker is not None:
+            impact_tracker.on_update = self.refresh_impacts
+
         self.run_paths = [
             (
                 winreg.HKEY_CURRENT_USER,
@@ -26,6 +48,7 @@ class StartupTab(QWidget):
         self.approved_path = [
             r"Software\Microsoft\Windows\CurrentVersion\Explorer\StartupApproved\Run"
             ]
+        self.hives = {winreg.HKEY_CURRENT_USER: "HKCU", winreg.HKEY_LOCAL_MACHINE: "HKLM"}
         self.startup_folders = [
             os.path.join(os.environ["APPDATA"],
                         r"Microsoft\Windows\Start Menu\Programs\Startup"
@@ -35,10 +58,16 @@ class StartupTab(QWidget):
                         )
         ]
 
+        # Entradas que lanza SystemManager escalonadas al iniciar sesión
+        self.delayed = DelayedStartStore()
+
         # Layout principal
         layout = QVBoxLayout(self)
         self.tree = QTreeWidget()
-        self.tree.setHeaderLabels(["Nombre", "Ruta", "Ubicación", "Estado", "Impacto"])
+        self.tree.setHeaderLabels([
+            "Nombre", "Ruta", "Ubicación", "Estado", "Impacto",
+            "Descripción", "Versión", "Tamaño"
+        ])
         self.tree.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self.tree.customContextMenuRequested.connect(self.open_context_menu)
         layout.addWidget(self.tree)
@@ -85,7 +114,14 @@ class StartupTab(QWidget):
         return self._set_registry_value(root, self.approved_path[0], name, data, winreg.REG_BINARY)
 
     def estimate_startup_impact(self, path):
-        """Estima el impacto en el inicio según el tamaño del ejecutable."""
+        """
+        Impacto en el inicio: el medido en el último arranque si existe,
+        si no una estimación según el tamaño del ejecutable.
+        """
+        if self.impact_tracker is not None:
+            measured = self.impact_tracker.impact(path)
+            if measured is not None:
+                return measured[0]
         try:
             size_mb = os.path.getsize(path) / (1024 * 1024)
             if size_mb > 50:
@@ -169,7 +205,7 @@ class StartupTab(QWidget):
                     while True:
                         try:
                             # Get registry value first
-                            name, value, _ = winreg.EnumValue(key, i)
+                            name, value, value_type = winreg.EnumValue(key, i)
                             # Then extract path and name
                             exe_path = os.path.expandvars(self.extract_exe_path(value))
                             exe_name = os.path.basename(exe_path) if exe_path else name
@@ -181,7 +217,11 @@ class StartupTab(QWidget):
                                 "location": location,
                                 "enabled": state,
                                 "impact": self.estimate_startup_impact(exe_path),
-                                "root": root
+                                "root": root,
+                                "hive": self.hives.get(root),
+                                "value_name": name,
+                                "command": value,
+                                "value_type": value_type
                             })
                             i += 1
                         except OSError:
@@ -203,6 +243,22 @@ class StartupTab(QWidget):
                         "root": None
                     })
 
+        # Inicio escalonado
+        for entry in self.delayed.items:
+            command = entry["command"]
+            if not isinstance(command, str):
+                command = " ".join(command)
+            exe_path = self.extract_exe_path(command) if entry["kind"] == "run" else command
+            items.append({
+                "name": entry["name"],
+                "path": exe_path,
+                "location": DELAYED_LOCATION,
+                "enabled": entry["enabled"],
+                "impact": self.estimate_startup_impact(exe_path),
+                "root": None,
+                "delayed": entry
+            })
+
         # Tareas programadas
         items.extend(self.get_scheduled_tasks())
         return items
@@ -225,6 +281,38 @@ class StartupTab(QWidget):
             self.set_startup_state(name, root, False)
         self.refresh()
 
+    def move_to_delayed(self, data):
+        """Saca una entrada del inicio de Windows y la pasa al inicio escalonado."""
+        try:
+            if data["location"] == "Carpeta Startup":
+                self.delayed.move_folder_entry(data["path"])
+            else:
+                self.delayed.move_run_entry(
+                    data["hive"], data["value_name"], data["command"], data["name"],
+                    data["value_type"]
+                )
+            self.delayed.sync_registration()
+        # pylint: disable=broad-exception-caught
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"No se pudo mover al inicio escalonado: {e}")
+        self.refresh()
+
+    def restore_from_delayed(self, entry):
+        """Devuelve una entrada del inicio escalonado a su ubicación original."""
+        try:
+            self.delayed.restore(entry)
+            self.delayed.sync_registration()
+        # pylint: disable=broad-exception-caught
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"No se pudo devolver al inicio normal: {e}")
+        self.refresh()
+
+    def open_delayed_start(self):
+        """Abre la configuración del inicio escalonado."""
+        if DelayedStartDialog(self.delayed, self).exec_():
+            self.refresh()
+
+    @instrument("StartupTab.refresh")
     def refresh(self):
         """Refresca la lista de ítems de inicio."""
         self.tree.clear()
@@ -233,11 +321,47 @@ class StartupTab(QWidget):
                 item["name"],
                 item["path"],
                 item["location"],
-                "Habilitado" if item["enabled"] else "Deshabilitado"
+                "Habilitado" if item["enabled"] else "Deshabilitado",
+                item["impact"]
             ])
             row.setData(0, Qt.ItemDataRole.UserRole, item)  # guardar datos completos
+            self.set_impact_tooltip(row, item["path"])
+            entry = self.metadata.get(item["path"])
+            if entry is not None:
+                apply_exe_metadata(row, entry, METADATA_COLUMN)
             self.tree.addTopLevelItem(row)
 
+    def apply_ready_metadata(self):
+        """Aplica los metadatos que terminaron de cargarse en segundo plano."""
+        ready = set()
+        while not self.metadata_ready.empty():
+            ready.add(self.metadata_ready.get())
+        if not ready:
+            return
+        for i in range(self.tree.topLevelItemCount()):
+            row = self.tree.topLevelItem(i)
+            path = row.data(0, Qt.ItemDataRole.UserRole)["path"]
+            if path in ready:
+                entry = self.metadata.get(path)
+                if entry is not None:
+                    apply_exe_metadata(row, entry, METADATA_COLUMN)
+
+    def set_impact_tooltip(self, row, path):
+        """Indica si el impacto está medido o estimado."""
+        measured = self.impact_tracker.impact(path) if self.impact_tracker else None
+        row.setToolTip(
+            4, measured[1] if measured else "Estimado por el tamaño del ejecutable"
+        )
+
+    def refresh_impacts(self):
+        """Actualiza la columna de impacto con las mediciones nuevas sin releer el registro."""
+        for i in range(self.tree.topLevelItemCount()):
+            row = self.tree.topLevelItem(i)
+            item = row.data(0, Qt.ItemDataRole.UserRole)
+            item["impact"] = self.estimate_startup_impact(item["path"])
+            row.setText(4, item["impact"])
+            self.set_impact_tooltip(row, item["path"])
+
     def open_context_menu(self, pos):
         """Abre el menú contextual para un ítem de inicio."""
         item = self.tree.itemAt(pos)
@@ -269,6 +393,20 @@ class StartupTab(QWidget):
                     )
             menu.addAction(toggle_action)
 
+        # Inicio escalonado
+        if data["location"] == DELAYED_LOCATION:
+            restore_action = QAction("Devolver al inicio normal", self)
+            restore_action.triggered.connect(lambda: self.restore_from_delayed(data["delayed"]))
+            menu.addAction(restore_action)
+        elif (data["location"] in ["Usuario actual", "Todos los usuarios", "Carpeta Startup"]
+              and data.get("value_name") != LAUNCHER_VALUE):
+            move_action = QAction("Mover a inicio escalonado", self)
+            move_action.triggered.connect(lambda: self.move_to_delayed(data))
+            menu.addAction(move_action)
+        delayed_action = QAction("Inicio escalonado...", self)
+        delayed_action.triggered.connect(self.open_delayed_start)
+        menu.addAction(delayed_action)
+
         viewport = self.tree.viewport()
         if viewport is not None:
             menu.exec_(viewport.mapToGlobal(pos))
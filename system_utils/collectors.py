@@ -0,0 +1,409 @@
+"""
+collectors.py
+Colectores de métricas como plugins: cada uno declara sus salidas, su
+intervalo y su coste esperado. Un único hilo los ejecuta, mide su coste
+real (también visible en el profiler) y ralentiza o desactiva los que se
+pasan del presupuesto. Los widgets, el monitor flotante y los
+exportadores leen o se suscriben a las salidas en vez de llamar a psutil.
+"""
+import time
+import heapq
+import logging
+import platform
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+import psutil
+from system_utils.profiler import PROFILER
+from system_utils.throttle_detector import PsutilSensorSource
+from system_utils.memory_composition import default_memory_backend
+
+logger = logging.getLogger(__name__)
+
+# Último valor publicado de una salida
+Sample = namedtuple("Sample", ["time", "value"])
+
+# Clases de colector registradas con @register (las que usa default_collectors)
+COLLECTOR_TYPES = []
+
+
+def register(cls):
+    """Decorador de clase: añade el colector a los predeterminados."""
+    COLLECTOR_TYPES.append(cls)
+    return cls
+
+
+class Collector:
+    """
+    Base de los colectores. `collect(now)` devuelve {salida: valor} con
+    claves de `outputs`. `interval` None significa una sola ejecución;
+    `budget_ms` es el coste medio aceptable por ejecución.
+    """
+    name = ""
+    outputs = ()
+    interval = 1.0
+    budget_ms = 5.0
+
+    def collect(self, now):
+        """Lee las métricas (se ejecuta en el hilo del runtime)."""
+        raise NotImplementedError
+
+
+@register
+class CpuCollector(Collector):
+    """Carga y frecuencia por núcleo con sus propios `cpu_times`."""
+    name = "cpu"
+    outputs = ("cpu.percent", "cpu.per_core", "cpu.freq", "cpu.max_freq")
+    interval = 0.25
+    budget_ms = 3.0
+
+    def __init__(self):
+        self.source = PsutilSensorSource()
+
+    def collect(self, now):
+        loads = self.source.loads()
+        freq, max_freq = self.source.freqs()
+        return {
+            "cpu.percent": sum(loads) / len(loads) if loads else 0.0,
+            "cpu.per_core": loads,
+            "cpu.freq": freq,
+            "cpu.max_freq": max_freq,
+        }
+
+
+@register
+class SensorCollector(Collector):
+    """Lectura completa de sensores (frecuencia, temperaturas, batería)."""
+    name = "sensors"
+    outputs = ("sensors.reading",)
+    interval = 1.0
+    budget_ms = 20.0
+
+    def __init__(self):
+        self.source = PsutilSensorSource()
+
+    def collect(self, now):
+        return {"sensors.reading": self.source.read(now)}
+
+
+@register
+class MemoryCollector(Collector):
+    """Memoria virtual del sistema."""
+    name = "memory"
+    outputs = ("memory.virtual",)
+    interval = 1.0
+    budget_ms = 2.0
+
+    def collect(self, now):
+        return {"memory.virtual": psutil.virtual_memory()}
+
+
+@register
+class MemoryCompositionCollector(Collector):
+    """Listas de memoria física y carga confirmada (None sin backend)."""
+    name = "memory_composition"
+    outputs = ("memory.composition",)
+    interval = 2.0
+    budget_ms = 5.0
+
+    def __init__(self):
+        self.backend = default_memory_backend()
+
+    def collect(self, now):
+        if self.backend is None:
+            return {}
+        return {"memory.composition": self.backend.composition()}
+
+
+class _RateCollector(Collector):
+    """Tasas por segundo de contadores acumulados entre ejecuciones."""
+    def __init__(self):
+        self._last = None
+
+    def rates(self, now, totals):
+        """Tasas desde la ejecución anterior (ceros la primera vez)."""
+        previous, self._last = self._last, (now, totals)
+        if previous is None or now <= previous[0]:
+            return [0.0] * len(totals)
+        elapsed = now - previous[0]
+        return [max(0.0, (new - old) / elapsed) for old, new in zip(previous[1], totals)]
+
+
+@register
+class DiskIOCollector(_RateCollector):
+    """Bytes/s leídos y escritos por todos los discos."""
+    name = "disk_io"
+    outputs = ("disk.read_rate", "disk.write_rate")
+    budget_ms = 3.0
+
+    def collect(self, now):
+        io = psutil.disk_io_counters()
+        read, write = self.rates(now, (io.read_bytes, io.write_bytes) if io else (0, 0))
+        return {"disk.read_rate": read, "disk.write_rate": write}
+
+
+@register
+class NetCollector(_RateCollector):
+    """Bytes/s enviados y recibidos y total acumulado."""
+    name = "net"
+    outputs = ("net.sent_rate", "net.recv_rate", "net.total")
+    budget_ms = 3.0
+
+    def collect(self, now):
+        io = psutil.net_io_counters()
+        sent, recv = self.rates(now, (io.bytes_sent, io.bytes_recv))
+        return {"net.sent_rate": sent, "net.recv_rate": recv,
+                "net.total": io.bytes_sent + io.bytes_recv}
+
+
+@register
+class DiskUsageCollector(Collector):
+    """% de uso de cada disco fijo, por letra de unidad."""
+    name = "disk_usage"
+    outputs = ("disk.usage",)
+    interval = 5.0
+    budget_ms = 20.0
+
+    def collect(self, now):
+        usage = {}
+        for disk in psutil.disk_partitions():
+            if 'fixed' not in disk.opts:
+                continue
+            try:
+                usage[disk.device.split(':')[0]] = psutil.disk_usage(disk.mountpoint).percent
+            # pylint: disable=broad-exception-caught
+            except Exception:
+                continue
+        return {"disk.usage": usage}
+
+
+@register
+class SpecsCollector(Collector):
+    """Especificaciones del equipo (cpuinfo tarda cerca de un segundo: una sola vez)."""
+    name = "specs"
+    outputs = ("system.specs",)
+    interval = None
+    budget_ms = 5000.0
+
+    def collect(self, now):
+        # pylint: disable=import-outside-toplevel
+        import cpuinfo
+        cpu_info = cpuinfo.get_cpu_info()
+        ram_total_gb = round(psutil.virtual_memory().total / (1024**3), 2)
+        info = (
+            f"Sistema: {platform.system()} {platform.release()}\n"
+            f"Versión: {platform.version()}\n"
+            f"Nombre del equipo: {platform.node()}\n"
+            f"Detalles del CPU: {platform.processor()}\n"
+            f"Procesador: {cpu_info['brand_raw']}\n"
+            f"Arquitectura: {cpu_info['arch']}\n"
+            f"Núcleos: {psutil.cpu_count(logical=False)} físicos / "
+            f"{psutil.cpu_count(logical=True)} lógicos\n"
+            f"RAM disponible: {ram_total_gb} GB\n"
+        )
+        discos_info = []
+        for disco in psutil.disk_partitions():
+            try:
+                if 'fixed' in disco.opts:
+                    uso = psutil.disk_usage(disco.mountpoint)
+                    discos_info.append(
+                        f"Disco {disco.device.split(':')[0]}: "
+                        f"{round(uso.total / (1024**3), 2)} GB "
+                        f"(En uso {round(uso.used / (1024**3), 2)} GB)"
+                    )
+            # pylint: disable=broad-exception-caught
+            except Exception:
+                continue
+        if discos_info:
+            info += "\nDiscos detectados:\n" + "\n".join(discos_info) + "\n"
+        return {"system.specs": info}
+
+
+def default_collectors():
+    """Instancias de los colectores registrados."""
+    return [cls() for cls in COLLECTOR_TYPES]
+
+
+# pylint: disable=too-few-public-methods,too-many-instance-attributes
+class CollectorState:
+    """Intervalo vigente, coste medido y estado de un colector."""
+    def __init__(self, collector):
+        self.collector = collector
+        self.interval = collector.interval
+        self.cost_ms = None
+        self.runs = 0
+        self.over = 0
+        self.under = 0
+        self.errors = 0
+        self.status = "activo"
+        self.running = False
+
+
+class CollectorRuntime:
+    """
+    Ejecuta los colectores en un hilo según su intervalo. Tras `strikes`
+    ejecuciones seguidas por encima del presupuesto (media móvil) duplica
+    el intervalo, hasta `max_backoff` veces el declarado; si aun así se
+    pasa, o falla `strikes` veces seguidas, lo desactiva. Con el coste por
+    debajo de la mitad del presupuesto durante 10 ejecuciones recupera el
+    intervalo paso a paso. Los colectores con presupuesto mayor que
+    `slow_ms` corren en un hilo aparte para no retrasar a los rápidos.
+    """
+    # pylint: disable=too-many-arguments
+    def __init__(self, collectors=None, strikes=3, max_backoff=8, slow_ms=100.0,
+                 clock=time.monotonic):
+        self.states = [CollectorState(c) for c in (collectors or default_collectors())]
+        self.strikes = strikes
+        self.max_backoff = max_backoff
+        self.clock = clock
+        self.slow_ms = slow_ms
+        self.values = {}
+        self._slow_pool = ThreadPoolExecutor(max_workers=1)
+        self._subscribers = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = False
+        self._thread = None
+        self._queue = [(0.0, index) for index in range(len(self.states))]
+
+    # --- Lectura y suscripción (cualquier hilo) ---
+    def get(self, output):
+        """Último Sample de una salida o None."""
+        return self.values.get(output)
+
+    def latest(self, output, default=None):
+        """Último valor de una salida."""
+        sample = self.values.get(output)
+        return default if sample is None else sample.value
+
+    def subscribe(self, output, callback):
+        """`callback(output, sample)` en el hilo del runtime por cada valor nuevo."""
+        with self._lock:
+            self._subscribers.setdefault(output, []).append(callback)
+
+    def unsubscribe(self, output, callback):
+        """Elimina una suscripción."""
+        with self._lock:
+            callbacks = self._subscribers.get(output, [])
+            if callback in callbacks:
+                callbacks.remove(callback)
+
+    # --- Ejecución ---
+    def start(self):
+        """Arranca el hilo del runtime."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Detiene el hilo."""
+        self._stop = True
+        self._wake.set()
+        self._slow_pool.shutdown(wait=False)
+
+    def _run(self):
+        while not self._stop:
+            delay = self.run_due()
+            self._wake.wait(delay if delay is not None else 1.0)
+            self._wake.clear()
+
+    def run_due(self, now=None):
+        """Ejecuta los colectores vencidos; devuelve los segundos hasta el siguiente."""
+        now = self.clock() if now is None else now
+        while self._queue and self._queue[0][0] <= now:
+            _, index = heapq.heappop(self._queue)
+            state = self.states[index]
+            if state.collector.budget_ms <= self.slow_ms:
+                self.run_collector(state, now)
+            elif not state.running:
+                state.running = True
+                self._slow_pool.submit(self.run_collector, state, now)
+            if state.status != "desactivado" and state.interval is not None:
+                heapq.heappush(self._queue, (now + state.interval, index))
+        return self._queue[0][0] - now if self._queue else None
+
+    def run_collector(self, state, now):
+        """Ejecuta un colector, mide su coste y publica sus salidas."""
+        collector = state.collector
+        wall0 = time.perf_counter()
+        cpu0 = time.thread_time()
+        try:
+            values = collector.collect(now)
+            state.errors = 0
+        # pylint: disable=broad-exception-caught
+        except Exception:
+            logger.exception("Error en el colector %s", collector.name)
+            values = {}
+            state.errors += 1
+        wall = time.perf_counter() - wall0
+        PROFILER.record(f"Collector.{collector.name}", wall, time.thread_time() - cpu0)
+
+        state.runs += 1
+        cost = wall * 1000
+        state.cost_ms = cost if state.cost_ms is None else 0.7 * state.cost_ms + 0.3 * cost
+        self._apply_budget(state)
+        state.running = False
+
+        for output, value in values.items():
+            sample = Sample(now, value)
+            self.values[output] = sample
+            with self._lock:
+                callbacks = list(self._subscribers.get(output, ()))
+            for callback in callbacks:
+                try:
+                    callback(output, sample)
+                # pylint: disable=broad-exception-caught
+                except Exception:
+                    logger.exception("Error en un suscriptor de %s", output)
+
+    def _apply_budget(self, state):
+        """Ralentiza, desactiva o recupera un colector según su coste."""
+        collector = state.collector
+        if state.errors >= self.strikes:
+            state.status = "desactivado"
+            logger.warning("Colector %s desactivado tras %d errores", collector.name, state.errors)
+            return
+        if state.interval is None:
+            return
+
+        if state.cost_ms > collector.budget_ms:
+            state.over += 1
+            state.under = 0
+        elif state.cost_ms < collector.budget_ms / 2:
+            state.under += 1
+            state.over = 0
+        else:
+            state.over = state.under = 0
+
+        if state.over >= self.strikes:
+            state.over = 0
+            if state.interval >= collector.interval * self.max_backoff:
+                state.status = "desactivado"
+                logger.warning(
+                    "Colector %s desactivado: %.1f ms por ejecución, presupuesto %.1f ms",
+                    collector.name, state.cost_ms, collector.budget_ms
+                )
+            else:
+                state.interval *= 2
+                state.status = "ralentizado"
+        elif state.under >= 10 and state.interval > collector.interval:
+            state.under = 0
+            state.interval = max(collector.interval, state.interval / 2)
+            if state.interval == collector.interval:
+                state.status = "activo"
+
+    def status(self):
+        """Lista de dicts por colector para el panel de depuración."""
+        return [
+            {
+                "name": s.collector.name,
+                "outputs": s.collector.outputs,
+                "interval": s.interval,
+                "declared": s.collector.interval,
+                "cost_ms": s.cost_ms,
+                "budget_ms": s.collector.budget_ms,
+                "runs": s.runs,
+                "status": s.status,
+            }
+            for s in self.states
+        ]
@@ -0,0 +1,496 @@
+"""
+delayed_start.py
+Inicio escalonado: las entradas de inicio elegidas (valores Run del
+registro y accesos de la carpeta Startup) se sacan del arranque de
+Windows y las lanza SystemManager al iniciar sesión, por orden de
+prioridad, con un máximo de arranques simultáneos y esperando a que la
+CPU y el disco estén en reposo.
+
+Cada sesión guarda cuándo se lanzó cada programa, cuándo se asentó y
+cuándo quedó el escritorio utilizable, para comparar el modo escalonado
+con el lanzamiento directo (todo a la vez). Funciona en Linux con
+ejecutables de prueba:
+
+    python -m system_utils.delayed_start --dummy 6 --mode directo
+    python -m system_utils.delayed_start --dummy 6 --mode escalonado
+    python -m system_utils.delayed_start --summary
+"""
+import os
+import sys
+import json
+import time
+import shlex
+import shutil
+import logging
+import argparse
+import subprocess
+import psutil
+from system_utils.maintenance_scheduler import IdleDetector
+from system_utils.effect_meter import mean_interval, welch_interval
+
+logger = logging.getLogger(__name__)
+
+_ROOT = os.path.dirname(os.path.dirname(__file__))
+LAUNCHER_FILE = os.path.join(_ROOT, "delayed_start.json")
+TIMINGS_FILE = os.path.join(_ROOT, "delayed_start_timings.json")
+# Accesos directos sacados de la carpeta Startup
+STORE_DIR = os.path.join(_ROOT, "delayed_start")
+
+RUN_KEY = r"Software\Microsoft\Windows\CurrentVersion\Run"
+LAUNCHER_VALUE = "SystemManager (inicio escalonado)"
+MODES = ("escalonado", "directo")
+KEEP_SESSIONS = 50
+
+# Programa de prueba: CPU ocupada `segundos`, luego en reposo hasta que lo terminen
+DUMMY_SCRIPT = (
+    "import sys, time\n"
+    "end = time.monotonic() + float(sys.argv[1])\n"
+    "while time.monotonic() < end: pass\n"
+    "time.sleep(float(sys.argv[2]))\n"
+)
+
+
+def default_settings():
+    """Configuración por defecto del lanzador."""
+    return {
+        "mode": "escalonado",
+        "initial_delay": 10.0,
+        "max_concurrent": 2,
+        # Reposo para lanzar el siguiente: % de CPU total y bytes/s de disco
+        "cpu_max": 30.0,
+        "disk_max": 10 * 1024 * 1024,
+        # Tras este tiempo esperando reposo se lanza igualmente
+        "gate_timeout": 30.0,
+        # Un programa está listo cuando usa menos de `ready_cpu` % de un núcleo
+        # durante `ready_quiet` s (o termina); se deja de esperar tras `ready_timeout`
+        "ready_cpu": 5.0,
+        "ready_quiet": 2.0,
+        "ready_timeout": 60.0,
+        # Espera máxima de reposo tras el último programa (escritorio utilizable)
+        "usable_timeout": 120.0,
+    }
+
+
+def default_item(name, command, kind, origin=None, priority=5):
+    """
+    Entrada del lanzador. kind: "run" (valor del registro), "folder"
+    (acceso directo movido) o "command" (prueba). `origin` permite devolverla.
+    """
+    return {
+        "name": name,
+        "command": command,
+        "kind": kind,
+        "origin": origin or {},
+        "priority": priority,
+        "enabled": True,
+    }
+
+
+def dummy_items(count, busy=(0.5, 2.0), idle=30.0):
+    """Entradas de prueba con ocupaciones de CPU repartidas entre `busy`."""
+    low, high = busy
+    items = []
+    for i in range(count):
+        seconds = low + (high - low) * i / max(1, count - 1)
+        items.append(default_item(
+            f"prueba-{i + 1}", [sys.executable, "-c", DUMMY_SCRIPT, f"{seconds:.2f}", str(idle)],
+            "command", priority=i % 3
+        ))
+    return items
+
+
+def launch(item):
+    """Lanza una entrada; devuelve el PID o None si el sistema no lo da (accesos .lnk)."""
+    command = item["command"]
+    if item["kind"] == "folder" and sys.platform == "win32":
+        os.startfile(command)  # pylint: disable=no-member
+        return None
+    if isinstance(command, str):
+        # Los valores REG_EXPAND_SZ guardan %ProgramFiles% y similares sin expandir
+        command = os.path.expandvars(command)
+        if sys.platform != "win32":
+            command = shlex.split(command)
+    kwargs = {}
+    if sys.platform != "win32":
+        kwargs["start_new_session"] = True
+    proc = subprocess.Popen(  # pylint: disable=consider-using-with
+        command, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL, close_fds=True, **kwargs
+    )
+    return proc.pid
+
+
+class _Readiness:
+    """CPU de un proceso lanzado (con sus hijos) para saber cuándo se asentó."""
+    def __init__(self, pid):
+        self.proc = psutil.Process(pid)
+        self.last = None
+        self.quiet_since = None
+
+    def cpu_seconds(self):
+        """CPU acumulada del proceso y de sus descendientes vivos."""
+        procs = [self.proc]
+        try:
+            procs += self.proc.children(recursive=True)
+        except psutil.Error:
+            pass
+        total = 0.0
+        for proc in procs:
+            try:
+                times = proc.cpu_times()
+                total += times.user + times.system
+            except psutil.Error:
+                continue
+        return total
+
+    def check(self, now, ready_cpu, quiet):
+        """Devuelve "listo", "terminado" o None mientras sigue arrancando."""
+        try:
+            if not self.proc.is_running() or self.proc.status() == psutil.STATUS_ZOMBIE:
+                return "terminado"
+        except psutil.NoSuchProcess:
+            return "terminado"
+        cpu = self.cpu_seconds()
+        last, self.last = self.last, (now, cpu)
+        if last is None or now - last[0] <= 0:
+            return None
+        percent = (cpu - last[1]) / (now - last[0]) * 100
+        if percent >= ready_cpu:
+            self.quiet_since = None
+            return None
+        if self.quiet_since is None:
+            # El reposo empezó al principio de este intervalo
+            self.quiet_since = last[0]
+        return "listo" if now - self.quiet_since >= quiet else None
+
+
+class DelayedLauncher:
+    """
+    Lanza las entradas de una sesión y devuelve sus tiempos. En modo
+    "directo" se lanza todo a la vez, sin retardo ni control de reposo,
+    para tener la referencia con la que comparar.
+    """
+    # pylint: disable=too-many-arguments,too-many-instance-attributes
+    def __init__(self, items, settings=None, gate=None, clock=time.monotonic,
+                 sleep=time.sleep, launcher=launch, poll=0.25):
+        self.items = sorted(
+            (item for item in items if item.get("enabled", True)),
+            key=lambda item: item.get("priority", 5)
+        )
+        self.settings = dict(default_settings(), **(settings or {}))
+        self.gate = gate or IdleDetector(
+            cpu_max=self.settings["cpu_max"], disk_max=self.settings["disk_max"],
+            input_idle_min=0.0, input_idle=lambda: None
+        )
+        self.clock = clock
+        self.sleep = sleep
+        self.launcher = launcher
+        self.poll = poll
+        self.stopped = False
+        self.records = []
+
+    @property
+    def staggered(self):
+        """True en modo escalonado."""
+        return self.settings["mode"] != "directo"
+
+    def _update_starting(self, starting, now, start):
+        """Marca como listos los programas asentados, terminados o que agotaron la espera."""
+        settings = self.settings
+        for record, tracker in list(starting):
+            state = None
+            if tracker is None:
+                state = "sin seguimiento"
+            else:
+                state = tracker.check(now, settings["ready_cpu"], settings["ready_quiet"])
+            if state is None and now - start - record["launched"] >= settings["ready_timeout"]:
+                state = "sin asentarse"
+            if state is not None:
+                record["status"] = state
+                record["ready"] = round(now - start, 3)
+                record["startup"] = round(record["ready"] - record["launched"], 3)
+                starting.remove((record, tracker))
+                logger.info("%s: %s a los %.1f s", record["name"], state, record["ready"])
+
+    def _launch(self, item, record, now, start):
+        """Lanza una entrada y devuelve su seguimiento (None sin PID)."""
+        record["launched"] = round(now - start, 3)
+        try:
+            pid = self.launcher(item)
+        # pylint: disable=broad-exception-caught
+        except Exception as e:
+            record["status"] = "error"
+            record["error"] = str(e)
+            record["ready"] = record["launched"]
+            record["startup"] = 0.0
+            logger.warning("No se pudo lanzar %s: %s", item["name"], e)
+            return False, None
+        record["pid"] = pid
+        try:
+            return True, _Readiness(pid) if pid else None
+        except psutil.NoSuchProcess:
+            return True, None
+
+    def run(self):
+        """Ejecuta la sesión completa (bloquea) y devuelve su registro."""
+        settings = self.settings
+        start = self.clock()
+        session = {
+            "started": time.time(),
+            "since_boot": round(time.time() - psutil.boot_time(), 1),
+            "mode": settings["mode"],
+            "items": [],
+        }
+        records = [{"name": item["name"], "priority": item.get("priority", 5),
+                    "launched": None, "ready": None, "startup": None,
+                    "pid": None, "status": "pendiente", "gate": None}
+                   for item in self.items]
+        session["items"] = records
+        self.records = records
+        pending = list(zip(self.items, records))
+        starting = []
+        waiting_since = None
+
+        if self.staggered and settings["initial_delay"] > 0:
+            self.sleep(settings["initial_delay"])
+
+        while (pending or starting) and not self.stopped:
+            now = self.clock()
+            self._update_starting(starting, now, start)
+            # Directo: todo a la vez. Escalonado: límite de arranques y reposo
+            while pending and (not self.staggered or len(starting) < settings["max_concurrent"]):
+                if self.staggered:
+                    waiting_since = now if waiting_since is None else waiting_since
+                    idle = self.gate.check(now)
+                    forced = now - waiting_since >= settings["gate_timeout"]
+                    if not idle and not forced:
+                        break
+                    gate = "reposo" if idle else f"forzado ({self.gate.reason})"
+                else:
+                    gate = "sin control"
+                item, record = pending.pop(0)
+                record["gate"] = gate
+                launched, tracker = self._launch(item, record, now, start)
+                if launched:
+                    starting.append((record, tracker))
+                waiting_since = None
+                if self.staggered:
+                    break  # Medir de nuevo el reposo antes del siguiente
+            self.sleep(self.poll)
+
+        # Escritorio utilizable: todo asentado y el equipo en reposo
+        deadline = self.clock() + settings["usable_timeout"]
+        while not self.stopped and not self.gate.check(self.clock()):
+            if self.clock() >= deadline:
+                session["usable_timeout"] = True
+                break
+            self.sleep(self.poll * 4)
+        session["usable_after"] = round(self.clock() - start, 3)
+        logger.info("Sesión %s: escritorio utilizable a los %.1f s",
+                    settings["mode"], session["usable_after"])
+        return session
+
+    def stop(self):
+        """Interrumpe la sesión en curso."""
+        self.stopped = True
+
+
+class DelayedStartStore:
+    """Entradas y configuración del lanzador, y el historial de sesiones."""
+    def __init__(self, config_file=LAUNCHER_FILE, timings_file=TIMINGS_FILE,
+                 store_dir=STORE_DIR):
+        self.config_file = config_file
+        self.timings_file = timings_file
+        self.store_dir = store_dir
+        config = self._load(config_file, {})
+        self.settings = dict(default_settings(), **config.get("settings", {}))
+        self.items = [dict(default_item("", "", "command"), **item)
+                      for item in config.get("items", [])]
+
+    @staticmethod
+    def _load(path, default):
+        """JSON guardado o `default` si no existe o no se puede leer."""
+        if os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    return json.load(f)
+            # pylint: disable=broad-exception-caught
+            except Exception as e:
+                logger.warning("No se pudo leer %s: %s", path, e)
+        return default
+
+    def save(self):
+        """Guarda las entradas y la configuración."""
+        with open(self.config_file, "w", encoding="utf-8") as f:
+            json.dump({"settings": self.settings, "items": self.items}, f,
+                      indent=4, ensure_ascii=False)
+
+    # --- Entradas de inicio de Windows ---
+    @staticmethod
+    def _hive(name):
+        # pylint: disable=import-outside-toplevel
+        import winreg
+        return {"HKCU": winreg.HKEY_CURRENT_USER, "HKLM": winreg.HKEY_LOCAL_MACHINE}[name]
+
+    def move_run_entry(self, hive, value_name, command, name, value_type=None):
+        """
+        Saca un valor Run del registro y lo añade al lanzador. El valor se
+        borra primero: si falta permiso (HKLM sin administrador) la entrada
+        no llega al lanzador y el programa no arranca dos veces.
+        """
+        # pylint: disable=import-outside-toplevel
+        import winreg
+        if value_type is None:
+            value_type = winreg.REG_SZ
+        with winreg.OpenKey(self._hive(hive), RUN_KEY, 0, winreg.KEY_SET_VALUE) as key:
+            winreg.DeleteValue(key, value_name)
+        item = default_item(name, command, "run",
+                            {"hive": hive, "value": value_name, "type": value_type})
+        self.items.append(item)
+        try:
+            self.save()
+        except OSError:
+            # Sin guardar, el lanzador no la conocería: devolver el valor
+            self.items.remove(item)
+            with winreg.OpenKey(self._hive(hive), RUN_KEY, 0, winreg.KEY_SET_VALUE) as key:
+                winreg.SetValueEx(key, value_name, 0, value_type, command)
+            raise
+        return item
+
+    def move_folder_entry(self, path):
+        """Mueve un acceso de la carpeta Startup al almacén del lanzador."""
+        os.makedirs(self.store_dir, exist_ok=True)
+        target = os.path.join(self.store_dir, os.path.basename(path))
+        shutil.move(path, target)
+        item = default_item(os.path.basename(path), target, "folder", {"path": path})
+        self.items.append(item)
+        self.save()
+        return item
+
+    def restore(self, item):
+        """Devuelve una entrada a su ubicación original y la quita del lanzador."""
+        origin = item["origin"]
+        if item["kind"] == "run":
+            # pylint: disable=import-outside-toplevel
+            import winreg
+            with winreg.OpenKey(self._hive(origin["hive"]), RUN_KEY, 0,
+                                winreg.KEY_SET_VALUE) as key:
+                winreg.SetValueEx(key, origin["value"], 0,
+                                  origin.get("type", winreg.REG_SZ), item["command"])
+        elif item["kind"] == "folder":
+            shutil.move(item["command"], origin["path"])
+        self.items.remove(item)
+        self.save()
+
+    @staticmethod
+    def launcher_command():
+        """Línea de comandos que ejecuta el lanzador al iniciar sesión."""
+        python = sys.executable
+        pythonw = os.path.join(os.path.dirname(python), "pythonw.exe")
+        if os.path.exists(pythonw):
+            python = pythonw
+        return f'"{python}" "{os.path.join(_ROOT, "main.py")}" --delayed-start'
+
+    def sync_registration(self):
+        """Registra el lanzador al iniciar sesión solo si tiene entradas."""
+        # pylint: disable=import-outside-toplevel
+        import winreg
+        with winreg.OpenKey(winreg.HKEY_CURRENT_USER, RUN_KEY, 0, winreg.KEY_SET_VALUE) as key:
+            if self.items:
+                winreg.SetValueEx(key, LAUNCHER_VALUE, 0, winreg.REG_SZ, self.launcher_command())
+            else:
+                try:
+                    winreg.DeleteValue(key, LAUNCHER_VALUE)
+                except FileNotFoundError:
+                    pass
+
+    # --- Historial de tiempos ---
+    def sessions(self):
+        """Sesiones guardadas, de la más antigua a la más reciente."""
+        return self._load(self.timings_file, [])
+
+    def record_session(self, session):
+        """Añade una sesión al historial (se conservan las últimas)."""
+        sessions = (self.sessions() + [session])[-KEEP_SESSIONS:]
+        with open(self.timings_file, "w", encoding="utf-8") as f:
+            json.dump(sessions, f, indent=4, ensure_ascii=False)
+
+    def summary(self):
+        """Líneas con el tiempo hasta el escritorio utilizable por modo y su diferencia."""
+        by_mode = {mode: [s["usable_after"] for s in self.sessions()
+                          if s.get("mode") == mode and "usable_after" in s]
+                   for mode in MODES}
+        lines = []
+        for mode, values in by_mode.items():
+            if not values:
+                continue
+            mean, low, high = mean_interval(values)
+            ci = f" (IC 95 % {low:.1f}-{high:.1f} s)" if low is not None else ""
+            lines.append(f"{mode.capitalize()}: {mean:.1f} s de media en "
+                         f"{len(values)} {'sesión' if len(values) == 1 else 'sesiones'}{ci}")
+        direct, staggered = by_mode["directo"], by_mode["escalonado"]
+        if direct and staggered:
+            effect = welch_interval(direct, staggered)
+            text = f"Escalonado frente a directo: {effect.delta:+.1f} s"
+            if effect.low is not None:
+                text += f" (IC 95 % {effect.low:+.1f} a {effect.high:+.1f} s)"
+            lines.append(text)
+        return lines
+
+
+def run_launcher(argv=None):
+    """Punto de entrada del lanzador al iniciar sesión (sin interfaz ni elevación)."""
+    parser = argparse.ArgumentParser(description="Inicio escalonado de SystemManager")
+    parser.add_argument("--delayed-start", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--mode", choices=MODES, help="por defecto, el configurado")
+    parser.add_argument("--config", default=LAUNCHER_FILE)
+    parser.add_argument("--timings", default=TIMINGS_FILE)
+    parser.add_argument("--dummy", type=int, default=0,
+                        help="lanzar N programas de prueba en vez de las entradas")
+    parser.add_argument("--summary", action="store_true",
+                        help="mostrar la comparación de sesiones y salir")
+    args = parser.parse_args(argv)
+
+    store = DelayedStartStore(args.config, args.timings)
+    if args.summary:
+        print("\n".join(store.summary()) or "Sin sesiones registradas")
+        return 0
+
+    settings = dict(store.settings)
+    items = store.items
+    if args.dummy:
+        items = dummy_items(args.dummy)
+        settings["initial_delay"] = 0.0
+    if args.mode:
+        settings["mode"] = args.mode
+
+    launcher = DelayedLauncher(items, settings)
+    try:
+        session = launcher.run()
+    except KeyboardInterrupt:
+        return 1
+    finally:
+        if args.dummy:
+            for record in launcher.records:
+                _terminate(record.get("pid"))
+    store.record_session(session)
+    for record in session["items"]:
+        print(f"{record['name']:24} lanzado {record['launched']:6.1f} s  "
+              f"listo {record['ready']:6.1f} s  ({record['status']}, {record['gate']})")
+    print(f"Escritorio utilizable a los {session['usable_after']:.1f} s")
+    return 0
+
+
+def _terminate(pid):
+    """Termina un programa de prueba."""
+    if not pid:
+        return
+    try:
+        psutil.Process(pid).terminate()
+    except psutil.Error:
+        pass
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    sys.exit(run_launcher())
@@ -0,0 +1,404 @@
+"""
+effect_meter.py
+Efecto medido de las acciones de optimización: un hilo muestrea memoria,
+fallos de página, CPU y disco cada segundo; al ejecutar una acción se
+compara la ventana anterior con la posterior (diferencia de medias con
+intervalo de confianza del 95 %) y el resultado se guarda por acción.
+"""
+import os
+import sys
+import json
+import time
+import math
+import socket
+import logging
+import threading
+from collections import deque, namedtuple
+from contextlib import contextmanager
+import psutil
+
+logger = logging.getLogger(__name__)
+
+EFFECTS_FILE = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), "optimizer_effects.json"
+    )
+
+MB = 1024 * 1024
+
+# (clave, etiqueta, unidad, divisor para mostrar)
+METRICS = [
+    ("used", "RAM usada", "MB", MB),
+    ("faults", "Fallos de página", "/s", 1),
+    ("hard_faults", "Fallos de página duros", "/s", 1),
+    ("cpu", "CPU", "%", 1),
+    ("disk_read", "Lectura de disco", "MB/s", MB),
+    ("disk_write", "Escritura de disco", "MB/s", MB),
+]
+
+# t de Student bilateral al 95 % para 1..30 grados de libertad
+T_95 = [12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+        2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+        2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042]
+
+# before/after: medias; low/high: intervalo del 95 % de la diferencia (None si n < 2)
+MetricEffect = namedtuple("MetricEffect", ["before", "after", "delta", "low", "high"])
+
+
+def t_critical(df):
+    """Valor crítico de t al 95 % (bilateral)."""
+    if df < 1:
+        return float("inf")
+    if df <= len(T_95):
+        return T_95[int(df) - 1]
+    return 2.0 if df <= 60 else 1.98 if df <= 120 else 1.96
+
+
+def _mean_var(values):
+    """Media y varianza muestral."""
+    n = len(values)
+    mean = sum(values) / n
+    var = sum((v - mean) ** 2 for v in values) / (n - 1) if n > 1 else 0.0
+    return mean, var
+
+
+def welch_interval(before, after):
+    """
+    MetricEffect de `after - before` con el intervalo de Welch. Las muestras
+    consecutivas están algo correlacionadas, así que el intervalo es orientativo.
+    """
+    mean_b, var_b = _mean_var(before)
+    mean_a, var_a = _mean_var(after)
+    delta = mean_a - mean_b
+    if len(before) < 2 or len(after) < 2:
+        return MetricEffect(mean_b, mean_a, delta, None, None)
+    se_b, se_a = var_b / len(before), var_a / len(after)
+    se = math.sqrt(se_b + se_a)
+    if se == 0:
+        return MetricEffect(mean_b, mean_a, delta, delta, delta)
+    df = (se_b + se_a) ** 2 / (
+        se_b ** 2 / (len(before) - 1) + se_a ** 2 / (len(after) - 1)
+    )
+    margin = t_critical(df) * se
+    return MetricEffect(mean_b, mean_a, delta, delta - margin, delta + margin)
+
+
+def mean_interval(values):
+    """(media, bajo, alto) al 95 % de una lista de diferencias (entre ejecuciones)."""
+    mean, var = _mean_var(values)
+    if len(values) < 2:
+        return mean, None, None
+    margin = t_critical(len(values) - 1) * math.sqrt(var / len(values))
+    return mean, mean - margin, mean + margin
+
+
+class _PdhFaults:
+    """Fallos de página por segundo con contadores PDH (Windows, pywin32)."""
+    def __init__(self):
+        # pylint: disable=import-outside-toplevel
+        import win32pdh
+        self.pdh = win32pdh
+        self.query = win32pdh.OpenQuery()
+        self.counters = {
+            "faults": win32pdh.AddEnglishCounter(self.query, r"\Memory\Page Faults/sec"),
+            "hard_faults": win32pdh.AddEnglishCounter(self.query, r"\Memory\Page Reads/sec"),
+        }
+        win32pdh.CollectQueryData(self.query)
+
+    def read(self):
+        """{métrica: tasa} desde la lectura anterior."""
+        self.pdh.CollectQueryData(self.query)
+        return {
+            key: self.pdh.GetFormattedCounterValue(counter, self.pdh.PDH_FMT_DOUBLE)[1]
+            for key, counter in self.counters.items()
+        }
+
+
+def _vmstat_faults():
+    """Fallos de página acumulados (total, duros) de /proc/vmstat."""
+    values = {}
+    with open("/proc/vmstat", "r", encoding="ascii") as f:
+        for line in f:
+            key, _, value = line.partition(" ")
+            if key in ("pgfault", "pgmajfault"):
+                values[key] = int(value)
+    return values["pgfault"], values["pgmajfault"]
+
+
+class SystemSampler:
+    """
+    Cada `sample()` devuelve las tasas del intervalo desde la llamada
+    anterior (None la primera vez). Calcula la CPU con `cpu_times` para no
+    alterar la referencia de `psutil.cpu_percent` que usa el monitor.
+    """
+    def __init__(self):
+        self._last = None
+        self._pdh = None
+        if sys.platform == "win32":
+            try:
+                self._pdh = _PdhFaults()
+            # pylint: disable=broad-exception-caught
+            except Exception as e:
+                logger.info("Sin contadores de fallos de página: %s", e)
+
+    @staticmethod
+    def _counters():
+        """Contadores acumulados del sistema."""
+        times = psutil.cpu_times()
+        idle = times.idle + getattr(times, "iowait", 0.0)
+        io = psutil.disk_io_counters()
+        counters = {
+            "cpu_total": sum(times),
+            "cpu_idle": idle,
+            "disk_read": io.read_bytes if io else 0,
+            "disk_write": io.write_bytes if io else 0,
+        }
+        if os.path.exists("/proc/vmstat"):
+            counters["faults"], counters["hard_faults"] = _vmstat_faults()
+        return counters
+
+    def sample(self, now=None):
+        """{'time', 'used', 'faults', ...} o None si aún no hay intervalo."""
+        now = time.monotonic() if now is None else now
+        counters = self._counters()
+        previous, self._last = self._last, (now, counters)
+        rates = self._pdh.read() if self._pdh is not None else {}
+        if previous is None or now <= previous[0]:
+            return None
+
+        elapsed = now - previous[0]
+        old = previous[1]
+        busy_total = counters["cpu_total"] - old["cpu_total"]
+        busy = busy_total - (counters["cpu_idle"] - old["cpu_idle"])
+        sample = {
+            "time": now,
+            "used": psutil.virtual_memory().used,
+            "cpu": 100.0 * busy / busy_total if busy_total > 0 else 0.0,
+        }
+        for key in ("disk_read", "disk_write", "faults", "hard_faults"):
+            if key in counters and key in old:
+                sample[key] = max(0, counters[key] - old[key]) / elapsed
+        sample.update(rates)
+        return sample
+
+
+# pylint: disable=too-few-public-methods,too-many-instance-attributes
+class EffectRun:
+    """Medición en curso de una acción; `done` se activa al tener el resultado."""
+    def __init__(self, name, label, before):
+        self.name = name
+        self.label = label
+        self.before = before
+        self.after = []
+        self.duration = 0.0
+        self.after_start = None
+        self.result = None
+        self.done = threading.Event()
+
+
+def compare(before, after):
+    """{métrica: MetricEffect} y la recuperación de RAM dentro de la ventana posterior."""
+    effects = {}
+    for key, *_ in METRICS:
+        b = [s[key] for s in before if key in s]
+        a = [s[key] for s in after if key in s]
+        if b and a:
+            effects[key] = welch_interval(b, a)
+    # RAM que vuelve a ocuparse durante la ventana posterior (páginas recargadas)
+    used = [s["used"] for s in after]
+    half = len(used) // 2
+    if half:
+        effects["rebound"] = welch_interval(used[:half], used[-half:])
+    return effects
+
+
+def _format_effect(key, effect):
+    """Línea legible de un efecto."""
+    label, unit, scale = next(
+        ((l, u, d) for k, l, u, d in METRICS if k == key),
+        ("Recuperación de RAM tras la acción", "MB", MB)
+    )
+    text = f"{label}: {effect.delta / scale:+.1f} {unit}"
+    if effect.low is not None:
+        text += f" (IC 95 %: {effect.low / scale:+.1f} a {effect.high / scale:+.1f})"
+        if effect.low <= 0 <= effect.high:
+            text += ", sin efecto claro"
+    return text
+
+
+def describe(result):
+    """Líneas de texto con el efecto de una ejecución."""
+    return [_format_effect(key, effect) for key, effect in result.items()]
+
+
+class EffectStore:
+    """
+    Resultados por acción en un JSON; se guardan las últimas `keep`
+    ejecuciones. La ventana principal y el monitor flotante son procesos
+    distintos que escriben el mismo archivo: cada guardado vuelve a leerlo
+    y mezcla las ejecuciones del otro antes de reemplazarlo.
+    """
+    def __init__(self, path=EFFECTS_FILE, keep=100):
+        self.path = path
+        self.keep = keep
+        self.data = self.load()
+
+    def load(self):
+        """Carga los resultados guardados."""
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    return json.load(f)
+            # pylint: disable=broad-exception-caught
+            except Exception:
+                return {}
+        return {}
+
+    @staticmethod
+    def _run_key(run):
+        """Identifica una ejecución guardada."""
+        return run["time"], run["host"], run["duration"]
+
+    def merge(self, data):
+        """Añade a `data` propio las ejecuciones de otro proceso que faltan."""
+        for name, other in data.items():
+            entry = self.data.setdefault(name, {"label": other["label"], "runs": []})
+            known = {self._run_key(run) for run in entry["runs"]}
+            entry["runs"].extend(
+                run for run in other["runs"] if self._run_key(run) not in known
+            )
+            entry["runs"].sort(key=lambda run: run["time"])
+            del entry["runs"][:-self.keep]
+
+    def save(self):
+        """Guarda los resultados de forma atómica, mezclados con los del archivo."""
+        self.merge(self.load())
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self.data, f, indent=4, ensure_ascii=False)
+            os.replace(tmp, self.path)
+        # pylint: disable=broad-exception-caught
+        except Exception as e:
+            logger.warning("No se pudieron guardar los efectos medidos: %s", e)
+
+    def record(self, run):
+        """Añade el resultado de una ejecución."""
+        entry = self.data.setdefault(run.name, {"label": run.label, "runs": []})
+        entry["label"] = run.label
+        entry["runs"].append({
+            "time": time.time(),
+            "host": socket.gethostname(),
+            "duration": run.duration,
+            "samples": [len(run.before), len(run.after)],
+            "effects": {key: effect._asdict() for key, effect in run.result.items()},
+        })
+        del entry["runs"][:-self.keep]
+        self.save()
+
+    def summary(self):
+        """{acción: (etiqueta, ejecuciones, {métrica: (media, bajo, alto)})} entre ejecuciones."""
+        summary = {}
+        for name, entry in self.data.items():
+            deltas = {}
+            for run in entry["runs"]:
+                for key, effect in run["effects"].items():
+                    deltas.setdefault(key, []).append(effect["delta"])
+            summary[name] = (
+                entry["label"], len(entry["runs"]),
+                {key: mean_interval(values) for key, values in deltas.items()}
+            )
+        return summary
+
+    def describe_summary(self):
+        """Líneas de texto con el efecto medio de cada acción."""
+        lines = []
+        for label, runs, metrics in self.summary().values():
+            lines.append(f"{label} ({runs} ejecuciones):")
+            for key, (mean, low, high) in metrics.items():
+                effect = MetricEffect(None, None, mean, low, high)
+                lines.append(f"    {_format_effect(key, effect)}")
+        return lines
+
+
+class EffectMeter:
+    """
+    Muestreo continuo en un hilo, así la ventana «antes» ya existe al
+    pulsar el botón y la acción no espera. `track` envuelve la acción;
+    la ventana «después» empieza `settle` s tras terminar y dura `window`
+    muestras.
+    """
+    # pylint: disable=too-many-arguments
+    def __init__(self, sampler=None, interval=1.0, window=10, settle=2.0,
+                 store=None, start=True):
+        self.sampler = sampler or SystemSampler()
+        self.interval = interval
+        self.window = window
+        self.settle = settle
+        self.store = store if store is not None else EffectStore()
+        self.history = deque(maxlen=window)
+        self.active = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        if start:
+            self.start()
+
+    def start(self):
+        """Arranca el hilo de muestreo."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Detiene el hilo de muestreo."""
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.add_sample(self.sampler.sample())
+            # pylint: disable=broad-exception-caught
+            except Exception:
+                logger.exception("Error muestreando el sistema")
+
+    def add_sample(self, sample):
+        """Añade una muestra y cierra las mediciones con la ventana completa."""
+        if sample is None:
+            return
+        finished = []
+        with self._lock:
+            self.history.append(sample)
+            for run in self.active:
+                # Solo intervalos que empiezan después de la acción y el asentamiento
+                if sample["time"] - self.interval >= run.after_start:
+                    run.after.append(sample)
+                if len(run.after) >= self.window:
+                    finished.append(run)
+            for run in finished:
+                self.active.remove(run)
+        for run in finished:
+            run.result = compare(run.before, run.after)
+            self.store.record(run)
+            run.done.set()
+
+    @contextmanager
+    def track(self, name, label):
+        """Mide la acción ejecutada dentro del bloque; devuelve la EffectRun."""
+        with self._lock:
+            run = EffectRun(name, label, list(self.history))
+        start = time.monotonic()
+        try:
+            yield run
+        finally:
+            end = time.monotonic()
+            run.duration = end - start
+            run.after_start = end + self.settle
+            with self._lock:
+                self.active.append(run)
+
+    def cancel(self, run):
+        """Descarta una medición en curso (la acción falló): no se guarda."""
+        with self._lock:
+            if run in self.active:
+                self.active.remove(run)
@@ -0,0 +1,229 @@
+"""
+exe_metadata.py
+Metadatos de ejecutables (descripción, editor, versión, tamaño e icono)
+leídos en un hilo de fondo y guardados en una caché LRU acotada con clave
+(ruta, mtime, tamaño): todos los procesos de un mismo ejecutable
+comparten una sola lectura.
+"""
+import os
+import sys
+import time
+import queue
+import ctypes
+import threading
+from collections import OrderedDict
+
+
+# pylint: disable=too-few-public-methods,too-many-instance-attributes
+class ExeMetadata:
+    """
+    Datos de un ejecutable. `icon` son píxeles BGRA (ancho, alto, bytes) o
+    None; `qicon` lo rellena la interfaz en su hilo la primera vez.
+    """
+    def __init__(self, path, size, mtime, description="", company="", version="", icon=None):
+        self.path = path
+        self.size = size
+        self.mtime = mtime
+        self.description = description
+        self.company = company
+        self.version = version
+        self.icon = icon
+        self.qicon = None
+
+
+def format_size(size):
+    """Tamaño de archivo legible."""
+    if size is None:
+        return ""
+    if size >= 1024 * 1024:
+        return f"{size / (1024 * 1024):.1f} MB"
+    return f"{size / 1024:.0f} KB"
+
+
+def _version_info(path):
+    """(descripción, editor, versión) del recurso VERSIONINFO en Windows."""
+    try:
+        # pylint: disable=import-outside-toplevel
+        import win32api
+    except ImportError:
+        return "", "", ""
+    try:
+        fixed = win32api.GetFileVersionInfo(path, "\\")
+        ms, ls = fixed["FileVersionMS"], fixed["FileVersionLS"]
+        version = f"{ms >> 16}.{ms & 0xFFFF}.{ls >> 16}.{ls & 0xFFFF}"
+    # pylint: disable=broad-exception-caught
+    except Exception:
+        return "", "", ""
+
+    strings = {}
+    try:
+        lang, codepage = win32api.GetFileVersionInfo(path, "\\VarFileInfo\\Translation")[0]
+        for name in ("FileDescription", "CompanyName"):
+            key = f"\\StringFileInfo\\{lang:04X}{codepage:04X}\\{name}"
+            strings[name] = win32api.GetFileVersionInfo(path, key) or ""
+    # pylint: disable=broad-exception-caught
+    except Exception:
+        pass
+    return strings.get("FileDescription", ""), strings.get("CompanyName", ""), version
+
+
+# pylint: disable=too-few-public-methods,invalid-name
+class _BITMAP(ctypes.Structure):
+    _fields_ = [("bmType", ctypes.c_long), ("bmWidth", ctypes.c_long),
+                ("bmHeight", ctypes.c_long), ("bmWidthBytes", ctypes.c_long),
+                ("bmPlanes", ctypes.c_ushort), ("bmBitsPixel", ctypes.c_ushort),
+                ("bmBits", ctypes.c_void_p)]
+
+
+class _BITMAPINFOHEADER(ctypes.Structure):
+    _fields_ = [("biSize", ctypes.c_uint32), ("biWidth", ctypes.c_long),
+                ("biHeight", ctypes.c_long), ("biPlanes", ctypes.c_ushort),
+                ("biBitCount", ctypes.c_ushort), ("biCompression", ctypes.c_uint32),
+                ("biSizeImage", ctypes.c_uint32), ("biXPelsPerMeter", ctypes.c_long),
+                ("biYPelsPerMeter", ctypes.c_long), ("biClrUsed", ctypes.c_uint32),
+                ("biClrImportant", ctypes.c_uint32)]
+
+
+class _ICONINFO(ctypes.Structure):
+    _fields_ = [("fIcon", ctypes.c_int), ("xHotspot", ctypes.c_uint32),
+                ("yHotspot", ctypes.c_uint32), ("hbmMask", ctypes.c_void_p),
+                ("hbmColor", ctypes.c_void_p)]
+
+
+def _icon_pixels(path):
+    """
+    Icono pequeño del ejecutable como (ancho, alto, BGRA). Solo usa GDI,
+    así que puede ejecutarse fuera del hilo de la interfaz.
+    """
+    if sys.platform != "win32":
+        return None
+    shell32, user32, gdi32 = ctypes.windll.shell32, ctypes.windll.user32, ctypes.windll.gdi32
+    hicon = ctypes.c_void_p()
+    if not shell32.ExtractIconExW(path, 0, None, ctypes.byref(hicon), 1) or not hicon:
+        return None
+    info = _ICONINFO()
+    hdc = None
+    try:
+        if not user32.GetIconInfo(hicon, ctypes.byref(info)) or not info.hbmColor:
+            return None
+        bitmap = _BITMAP()
+        gdi32.GetObjectW(ctypes.c_void_p(info.hbmColor), ctypes.sizeof(bitmap), ctypes.byref(bitmap))
+        width, height = bitmap.bmWidth, bitmap.bmHeight
+        header = _BITMAPINFOHEADER(
+            ctypes.sizeof(_BITMAPINFOHEADER), width, -height, 1, 32, 0, 0, 0, 0, 0, 0
+        )
+        pixels = ctypes.create_string_buffer(width * height * 4)
+        hdc = user32.GetDC(None)
+        if not gdi32.GetDIBits(hdc, ctypes.c_void_p(info.hbmColor), 0, height,
+                               pixels, ctypes.byref(header), 0):
+            return None
+        data = bytearray(pixels.raw)
+        # Iconos antiguos sin canal alfa: hacerlos opacos
+        if not any(data[3::4]):
+            data[3::4] = b"\xff" * (width * height)
+        return width, height, bytes(data)
+    finally:
+        if hdc:
+            user32.ReleaseDC(None, hdc)
+        for handle in (info.hbmColor, info.hbmMask):
+            if handle:
+                gdi32.DeleteObject(ctypes.c_void_p(handle))
+        user32.DestroyIcon(hicon)
+
+
+def read_metadata(path, stat=None):
+    """Lee todos los metadatos de un ejecutable (operación lenta)."""
+    stat = stat or os.stat(path)
+    description, company, version = _version_info(path)
+    try:
+        icon = _icon_pixels(path)
+    # pylint: disable=broad-exception-caught
+    except Exception:
+        icon = None
+    return ExeMetadata(
+        path, stat.st_size, stat.st_mtime,
+        description or os.path.basename(path), company, version, icon
+    )
+
+
+class ExeMetadataCache:
+    """
+    `get(path)` nunca bloquea: devuelve lo que haya en caché y encola la
+    ruta si falta o si hace más de `revalidate` s que no se comprobó.
+    Cada suscriptor recibe en su cola las rutas con datos nuevos.
+    """
+    # pylint: disable=too-many-instance-attributes
+    def __init__(self, capacity=512, revalidate=300.0, reader=read_metadata):
+        self.capacity = capacity
+        self.revalidate = revalidate
+        self.reader = reader
+        self._entries = OrderedDict()
+        self._by_path = {}
+        self._pending = set()
+        self._listeners = []
+        self._lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def subscribe(self):
+        """Cola (thread-safe) donde se publican las rutas resueltas."""
+        listener = queue.SimpleQueue()
+        self._listeners.append(listener)
+        return listener
+
+    def get(self, path, now=None):
+        """ExeMetadata en caché para `path`, o None (y se pide en segundo plano)."""
+        if not path:
+            return None
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            known = self._by_path.get(path)
+            entry = self._entries.get(known[0]) if known else None
+            if entry is not None:
+                self._entries.move_to_end(known[0])
+            stale = known is None or now - known[1] > self.revalidate
+            if stale and path not in self._pending:
+                self._pending.add(path)
+                self._queue.put(path)
+        return entry
+
+    def stop(self):
+        """Detiene el hilo de lectura."""
+        self._queue.put(None)
+
+    def _run(self):
+        """Hilo de lectura: stat, y lectura completa solo si la clave es nueva."""
+        while True:
+            path = self._queue.get()
+            if path is None:
+                break
+            try:
+                stat = os.stat(path)
+                key = (os.path.normcase(path), stat.st_mtime, stat.st_size)
+                with self._lock:
+                    entry = self._entries.get(key)
+                if entry is None:
+                    entry = self.reader(path, stat)
+            # pylint: disable=broad-exception-caught
+            except Exception:
+                key, entry = None, None
+
+            with self._lock:
+                self._pending.discard(path)
+                previous = self._by_path.get(path)
+                changed = previous is None or previous[0] != key
+                self._by_path[path] = (key, time.monotonic())
+                if entry is not None:
+                    self._entries[key] = entry
+                    self._entries.move_to_end(key)
+                    while len(self._entries) > self.capacity:
+                        self._entries.popitem(last=False)
+                # Las rutas apuntan a claves; se podan junto con la caché
+                if len(self._by_path) > self.capacity * 4:
+                    self._by_path = {
+                        p: v for p, v in self._by_path.items() if v[0] in self._entries
+                    }
+            if entry is not None and changed:
+                for listener in self._listeners:
+                    listener.put(path)
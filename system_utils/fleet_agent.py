@@ -0,0 +1,226 @@
+"""
+fleet_agent.py
+Agente del modo flota: recorre los procesos como ProcessTab (un único
+`process_iter` por tick) y envía instantáneas compactas al agregador.
+
+Contrapresión: como mucho hay una trama pendiente de envío. Si el socket
+no ha vaciado la anterior, el tick no envía nada y el siguiente delta se
+calcula contra lo último enviado, así que los cambios se acumulan en vez
+de encolarse.
+
+Uso:
+    python main.py --agent --server 10.0.0.5 --port 47800 --token <clave>
+    python -m system_utils.fleet_agent --server 127.0.0.1 --name pc-01
+"""
+import os
+import sys
+import math
+import time
+import socket
+import select
+import logging
+import argparse
+import platform
+import psutil
+from system_utils.process_table import ProcessTable
+from system_utils.fleet_protocol import (
+    DEFAULT_PORT, ProtocolError, FrameReader, encode_frame, diff_rows
+)
+
+logger = logging.getLogger(__name__)
+
+# Subconjunto de PROCESS_ATTRS de ProcessTab que usa la vista remota
+AGENT_ATTRS = ['pid', 'name', 'cpu_percent', 'memory_percent', 'memory_info', 'io_counters',
+               'create_time']
+
+# Cada cuántos envíos se manda una instantánea completa aunque no la pidan
+FULL_EVERY = 120
+
+MB = 1024 * 1024
+
+
+def system_disk():
+    """Ruta de la unidad del sistema."""
+    return os.environ.get("SystemDrive", "C:") + "\\" if sys.platform == "win32" else "/"
+
+
+class SnapshotCollector:
+    """
+    Toma la instantánea local: métricas del sistema y una fila por proceso
+    [nombre, CPU %, RAM %, RSS MB, lectura KB/s, escritura KB/s], redondeada
+    para que los deltas solo incluyan cambios visibles. Las tasas de E/S
+    salen de la misma ProcessTable (media exponencial) que la vista local.
+    """
+    def __init__(self):
+        self.table = ProcessTable()
+        self.disk = system_disk()
+        psutil.cpu_percent()
+
+    def collect(self, now=None):
+        """Devuelve (sistema, filas) con filas indexadas por PID en texto."""
+        now = time.monotonic() if now is None else now
+        snapshot = [proc.info for proc in psutil.process_iter(AGENT_ATTRS)]
+        table_rows = self.table.update(snapshot, now)
+        read = self.table.read_rate[table_rows].tolist()
+        write = self.table.write_rate[table_rows].tolist()
+        rows = {}
+        for info, read_bps, write_bps in zip(snapshot, read, write):
+            mem = info['memory_info']
+            # NaN: sin lectura previa o sin contador
+            rows[str(info['pid'])] = [
+                info['name'] or "",
+                round(info['cpu_percent'] or 0.0, 1),
+                round(info['memory_percent'] or 0.0, 1),
+                round(mem.rss / MB, 1) if mem else 0.0,
+                0 if math.isnan(read_bps) else round(read_bps / 1024),
+                0 if math.isnan(write_bps) else round(write_bps / 1024),
+            ]
+
+        try:
+            disk = psutil.disk_usage(self.disk).percent
+        # pylint: disable=broad-exception-caught
+        except Exception:
+            disk = None
+        system = {
+            "cpu": psutil.cpu_percent(),
+            "ram": psutil.virtual_memory().percent,
+            "disk": disk,
+            "procs": len(rows),
+        }
+        return system, rows
+
+
+class FleetAgent:
+    """Conexión con el agregador, reconexión con espera creciente y envío por ticks."""
+    # pylint: disable=too-many-instance-attributes,too-many-arguments
+    def __init__(self, server="127.0.0.1", port=DEFAULT_PORT, interval=2.0,
+                 name=None, collector=None, token=None):
+        self.server = server
+        self.token = token
+        self.port = port
+        self.interval = interval
+        self.name = name or platform.node()
+        self.collector = collector or SnapshotCollector()
+        self.sock = None
+        self.reader = None
+        self.outbuf = bytearray()
+        self.sent_rows = {}
+        self.seq = 0
+        self.force_full = True
+        self.skipped = 0
+        self.running = True
+
+    def connect(self):
+        """Intenta conectar y presentarse; devuelve True si lo consigue."""
+        try:
+            sock = socket.create_connection((self.server, self.port), timeout=5)
+        except OSError as e:
+            logger.info("Agregador %s:%s no disponible: %s", self.server, self.port, e)
+            return False
+        sock.setblocking(False)
+        self.sock = sock
+        self.reader = FrameReader()
+        self.outbuf = bytearray(encode_frame({
+            "type": "hello", "id": self.name, "host": platform.node(),
+            "platform": platform.platform(), "interval": self.interval,
+            "token": self.token,
+        }))
+        self.force_full = True
+        return True
+
+    def close(self):
+        """Cierra la conexión actual."""
+        if self.sock is not None:
+            try:
+                self.sock.close()
+            except OSError:
+                pass
+        self.sock = None
+        self.outbuf.clear()
+
+    def tick(self):
+        """Recoge una instantánea y la encola si no hay otra pendiente."""
+        system, rows = self.collector.collect()
+        if self.outbuf:
+            # El agregador o la red no dan abasto: acumular en el próximo delta
+            self.skipped += 1
+            return
+        full = self.force_full or self.seq % FULL_EVERY == 0
+        if full:
+            updated, removed = rows, []
+        else:
+            updated, removed = diff_rows(self.sent_rows, rows)
+        self.seq += 1
+        self.outbuf += encode_frame({
+            "type": "snap", "seq": self.seq, "full": full, "sys": system,
+            "upd": updated, "del": removed, "skipped": self.skipped,
+        })
+        self.sent_rows = rows
+        self.force_full = False
+        self.skipped = 0
+
+    def pump(self, timeout):
+        """Envía lo pendiente y atiende mensajes del agregador hasta `timeout`."""
+        readable, writable, _ = select.select(
+            [self.sock], [self.sock] if self.outbuf else [], [], timeout
+        )
+        if readable:
+            data = self.sock.recv(65536)
+            if not data:
+                raise ConnectionError("El agregador cerró la conexión")
+            for message in self.reader.feed(data):
+                if message.get("type") == "resync":
+                    self.force_full = True
+        if writable:
+            sent = self.sock.send(self.outbuf)
+            del self.outbuf[:sent]
+
+    def run(self):
+        """Bucle principal del agente."""
+        backoff = 1.0
+        next_tick = time.monotonic()
+        while self.running:
+            if self.sock is None:
+                if not self.connect():
+                    time.sleep(backoff)
+                    backoff = min(backoff * 2, 60.0)
+                    continue
+                backoff = 1.0
+                next_tick = time.monotonic()
+            try:
+                now = time.monotonic()
+                if now >= next_tick:
+                    self.tick()
+                    next_tick = now + self.interval
+                self.pump(max(0.0, next_tick - time.monotonic()))
+            except (OSError, ConnectionError, ProtocolError) as e:
+                logger.warning("Conexión con el agregador perdida: %s", e)
+                self.close()
+
+
+def run_agent(argv=None):
+    """Punto de entrada del modo agente (sin interfaz ni elevación)."""
+    parser = argparse.ArgumentParser(description="Agente de flota de SystemManager")
+    parser.add_argument("--agent", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--server", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--interval", type=float, default=2.0)
+    parser.add_argument("--name", help="identificador del equipo (por defecto, su nombre)")
+    parser.add_argument("--token", default=os.environ.get("SYSTEMMANAGER_FLEET_TOKEN"),
+                        help="clave compartida con el agregador")
+    args = parser.parse_args(argv)
+
+    agent = FleetAgent(args.server, args.port, max(0.2, args.interval), args.name,
+                       token=args.token)
+    try:
+        agent.run()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        agent.close()
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    sys.exit(run_agent())
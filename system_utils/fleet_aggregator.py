@@ -0,0 +1,267 @@
+"""
+fleet_aggregator.py
+Agregador del modo flota: un solo hilo con `selectors` atiende a cientos
+de agentes. La memoria está acotada (estado actual por equipo, historial
+corto, límite de equipos y de procesos) y la lectura por conexión tiene un
+presupuesto por vuelta; cuando no damos abasto, el control de flujo de TCP
+llena el búfer del agente y este acumula cambios en lugar de encolarlos.
+"""
+import hmac
+import time
+import socket
+import logging
+import selectors
+import threading
+from collections import deque, namedtuple
+from system_utils.fleet_protocol import (
+    DEFAULT_PORT, ProtocolError, FrameReader, encode_frame, apply_rows
+)
+
+logger = logging.getLogger(__name__)
+
+HostSummary = namedtuple(
+    "HostSummary",
+    ["id", "host", "platform", "online", "cpu", "ram", "disk", "procs", "age", "skipped"]
+)
+
+
+# pylint: disable=too-many-instance-attributes,too-few-public-methods
+class HostState:
+    """Último estado conocido de un equipo."""
+    def __init__(self, agent_id, host, platform_name, history=60):
+        self.id = agent_id
+        self.host = host
+        self.platform = platform_name
+        self.online = True
+        self.system = {}
+        self.rows = {}
+        self.seq = None
+        self.last_seen = time.monotonic()
+        self.skipped = 0
+        self.cpu_history = deque(maxlen=history)
+
+
+class _Connection:
+    """Socket de un agente con su lector y lo pendiente de enviar."""
+    def __init__(self, sock, address):
+        self.sock = sock
+        self.address = address
+        self.reader = FrameReader()
+        self.outbuf = bytearray()
+        self.host_id = None
+
+
+class FleetAggregator:
+    """
+    Servidor TCP de agentes. La interfaz consulta `hosts()` y `processes()`,
+    que devuelven copias tomadas bajo el candado.
+
+    Sin `token` solo escucha en el propio equipo; para aceptar agentes de
+    la red hay que indicar una clave compartida, que cada agente envía en
+    su saludo.
+    """
+    # pylint: disable=too-many-arguments
+    def __init__(self, bind=None, port=DEFAULT_PORT, max_hosts=1000,
+                 max_processes=8192, read_budget=256 * 1024, forget_after=600.0,
+                 token=None):
+        if bind is None:
+            bind = "0.0.0.0" if token else "127.0.0.1"
+        if not token and bind not in ("127.0.0.1", "localhost", "::1"):
+            raise ValueError("Escuchar en la red requiere una clave compartida")
+        self.bind = bind
+        self.port = port
+        self.token = token
+        self.max_hosts = max_hosts
+        self.max_processes = max_processes
+        self.read_budget = read_budget
+        self.forget_after = forget_after
+        self._hosts = {}
+        self._lock = threading.Lock()
+        self._selector = None
+        self._server = None
+        self._thread = None
+        self._running = False
+        self.frames = 0
+        self.bytes_received = 0
+        self.resyncs = 0
+
+    def start(self):
+        """Abre el puerto y arranca el hilo del servidor."""
+        self._server = socket.create_server((self.bind, self.port), backlog=128)
+        self._server.setblocking(False)
+        self.port = self._server.getsockname()[1]
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(self._server, selectors.EVENT_READ)
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        logger.info("Agregador de flota escuchando en %s:%s", self.bind, self.port)
+
+    def stop(self):
+        """Detiene el servidor y cierra todas las conexiones."""
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+
+    @property
+    def running(self):
+        """Indica si el servidor está activo."""
+        return self._running
+
+    def hosts(self, now=None):
+        """Resumen de todos los equipos conocidos."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            return [
+                HostSummary(
+                    h.id, h.host, h.platform, h.online, h.system.get("cpu"),
+                    h.system.get("ram"), h.system.get("disk"), len(h.rows),
+                    now - h.last_seen, h.skipped
+                )
+                for h in self._hosts.values()
+            ]
+
+    def processes(self, host_id):
+        """Copia de las filas de procesos de un equipo (pid → fila)."""
+        with self._lock:
+            host = self._hosts.get(host_id)
+            return dict(host.rows) if host else {}
+
+    def cpu_history(self, host_id):
+        """Historial reciente de CPU de un equipo."""
+        with self._lock:
+            host = self._hosts.get(host_id)
+            return list(host.cpu_history) if host else []
+
+    # --- Hilo del servidor ---
+    def _run(self):
+        """Bucle de `selectors`."""
+        last_sweep = time.monotonic()
+        try:
+            while self._running:
+                for key, mask in self._selector.select(timeout=0.5):
+                    if key.fileobj is self._server:
+                        self._accept()
+                        continue
+                    conn = key.data
+                    try:
+                        if mask & selectors.EVENT_READ:
+                            self._read(conn)
+                        if mask & selectors.EVENT_WRITE and conn.outbuf:
+                            self._write(conn)
+                    except (OSError, ConnectionError, ProtocolError) as e:
+                        logger.info("Agente %s desconectado: %s", conn.host_id or conn.address, e)
+                        self._drop(conn)
+                now = time.monotonic()
+                if now - last_sweep >= 10:
+                    last_sweep = now
+                    self._sweep(now)
+        finally:
+            for key in list(self._selector.get_map().values()):
+                key.fileobj.close()
+            self._selector.close()
+
+    def _accept(self):
+        """Acepta todas las conexiones pendientes."""
+        while True:
+            try:
+                sock, address = self._server.accept()
+            except BlockingIOError:
+                return
+            sock.setblocking(False)
+            self._selector.register(sock, selectors.EVENT_READ, _Connection(sock, address))
+
+    def _read(self, conn):
+        """Lee como mucho `read_budget` bytes para repartir el turno entre agentes."""
+        data = conn.sock.recv(self.read_budget)
+        if not data:
+            raise ConnectionError("conexión cerrada")
+        self.bytes_received += len(data)
+        for message in conn.reader.feed(data):
+            self.frames += 1
+            self._handle(conn, message)
+
+    def _write(self, conn):
+        """Envía lo pendiente y deja de vigilar escritura al vaciar."""
+        sent = conn.sock.send(conn.outbuf)
+        del conn.outbuf[:sent]
+        if not conn.outbuf:
+            self._selector.modify(conn.sock, selectors.EVENT_READ, conn)
+
+    def _send(self, conn, message):
+        """Encola un mensaje corto para el agente (se descarta si ya hay uno)."""
+        if conn.outbuf:
+            return
+        conn.outbuf += encode_frame(message)
+        self._selector.modify(conn.sock, selectors.EVENT_READ | selectors.EVENT_WRITE, conn)
+
+    def _handle(self, conn, message):
+        """Procesa un mensaje de un agente."""
+        kind = message.get("type")
+        if kind == "hello":
+            if self.token and not hmac.compare_digest(
+                    str(message.get("token") or "").encode("utf-8"),
+                    self.token.encode("utf-8")):
+                raise ConnectionError("clave compartida no válida")
+            agent_id = str(message.get("id") or conn.address)
+            with self._lock:
+                if agent_id not in self._hosts and len(self._hosts) >= self.max_hosts:
+                    raise ConnectionError("límite de equipos alcanzado")
+                host = self._hosts.get(agent_id)
+                if host is None:
+                    host = HostState(agent_id, message.get("host", ""), message.get("platform", ""))
+                    self._hosts[agent_id] = host
+                host.online = True
+                host.seq = None
+            conn.host_id = agent_id
+            return
+        if kind != "snap" or conn.host_id is None:
+            raise ProtocolError(f"Mensaje inesperado: {kind}")
+
+        with self._lock:
+            host = self._hosts[conn.host_id]
+            seq = message.get("seq")
+            if not message.get("full") and (host.seq is None or seq != host.seq + 1):
+                # Falta la base del delta: pedir una instantánea completa
+                host.seq = None
+                resync = True
+            else:
+                if message.get("full"):
+                    host.rows = {}
+                apply_rows(host.rows, message.get("upd", {}), message.get("del", []))
+                if len(host.rows) > self.max_processes:
+                    host.rows = dict(
+                        sorted(host.rows.items(), key=lambda item: -item[1][1])
+                        [:self.max_processes]
+                    )
+                host.seq = seq
+                host.system = message.get("sys", {})
+                host.skipped += message.get("skipped", 0)
+                host.cpu_history.append(host.system.get("cpu"))
+                resync = False
+            host.last_seen = time.monotonic()
+        if resync:
+            self.resyncs += 1
+            self._send(conn, {"type": "resync"})
+
+    def _drop(self, conn):
+        """Cierra una conexión y marca su equipo como desconectado."""
+        try:
+            self._selector.unregister(conn.sock)
+        except (KeyError, ValueError):
+            pass
+        conn.sock.close()
+        if conn.host_id is not None:
+            with self._lock:
+                host = self._hosts.get(conn.host_id)
+                if host is not None:
+                    host.online = False
+
+    def _sweep(self, now):
+        """Olvida equipos desconectados hace más de `forget_after` segundos."""
+        with self._lock:
+            for agent_id in [
+                    h.id for h in self._hosts.values()
+                    if not h.online and now - h.last_seen > self.forget_after]:
+                del self._hosts[agent_id]
@@ -0,0 +1,95 @@
+"""
+fleet_protocol.py
+Protocolo del modo flota: tramas con longitud (4 bytes big-endian) y JSON
+comprimido con zlib. Las instantáneas de procesos viajan como deltas
+respecto a la última enviada.
+
+Mensajes:
+    {"type": "hello", "id", "host", "platform", "interval", "token"}
+                                                              agente → agregador
+    {"type": "snap", "seq", "full", "sys", "upd", "del"}      agente → agregador
+    {"type": "resync"}                                        agregador → agente
+"""
+import json
+import zlib
+import struct
+
+DEFAULT_PORT = 47800
+HEADER = struct.Struct(">I")
+# Una instantánea completa de miles de procesos ocupa unos cientos de KB
+MAX_FRAME = 4 * 1024 * 1024
+# Límite del JSON descomprimido: una trama pequeña no puede inflarse sin control
+MAX_DECODED = 32 * 1024 * 1024
+
+
+class ProtocolError(Exception):
+    """Trama inválida o demasiado grande."""
+
+
+def encode_frame(message):
+    """Serializa un mensaje como trama."""
+    payload = zlib.compress(
+        json.dumps(message, separators=(",", ":")).encode("utf-8"), 1
+    )
+    if len(payload) > MAX_FRAME:
+        raise ProtocolError(f"Trama de {len(payload)} bytes supera el máximo")
+    return HEADER.pack(len(payload)) + payload
+
+
+class FrameReader:
+    """
+    Reensambla tramas a partir de bytes recibidos. El búfer nunca supera
+    una trama máxima: la cabecera se valida en cuanto llega.
+    """
+    def __init__(self, max_frame=MAX_FRAME, max_decoded=MAX_DECODED):
+        self.max_frame = max_frame
+        self.max_decoded = max_decoded
+        self._buffer = bytearray()
+
+    def feed(self, data):
+        """Agrega bytes y devuelve la lista de mensajes completos."""
+        self._buffer += data
+        messages = []
+        while len(self._buffer) >= HEADER.size:
+            (length,) = HEADER.unpack_from(self._buffer)
+            if length > self.max_frame:
+                raise ProtocolError(f"Trama de {length} bytes supera el máximo")
+            end = HEADER.size + length
+            if len(self._buffer) < end:
+                break
+            payload = bytes(self._buffer[HEADER.size:end])
+            del self._buffer[:end]
+            messages.append(self._decode(payload))
+        return messages
+
+    def _decode(self, payload):
+        """Descomprime y decodifica una trama sin pasar de `max_decoded` bytes."""
+        inflater = zlib.decompressobj()
+        try:
+            data = inflater.decompress(payload, self.max_decoded)
+            if inflater.unconsumed_tail:
+                raise ProtocolError(
+                    f"Trama descomprimida supera el máximo de {self.max_decoded} bytes"
+                )
+            if not inflater.eof:
+                raise ProtocolError("Trama corrupta: datos comprimidos incompletos")
+            return json.loads(data)
+        except (zlib.error, ValueError) as e:
+            raise ProtocolError(f"Trama corrupta: {e}") from e
+
+
+def diff_rows(previous, current):
+    """
+    Delta entre dos diccionarios pid → fila: (filas nuevas o cambiadas,
+    PIDs desaparecidos). Las claves son texto para viajar en JSON.
+    """
+    updated = {pid: row for pid, row in current.items() if previous.get(pid) != row}
+    removed = [pid for pid in previous if pid not in current]
+    return updated, removed
+
+
+def apply_rows(rows, updated, removed):
+    """Aplica un delta sobre `rows` en el sitio."""
+    for pid in removed:
+        rows.pop(pid, None)
+    rows.update(updated)
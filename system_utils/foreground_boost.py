@@ -0,0 +1,451 @@
+"""
+foreground_boost.py
+Modo primer plano: mientras una aplicación elegida está delante, baja la
+prioridad (o suspende) de los procesos de segundo plano indicados y,
+opcionalmente, recorta su memoria. Al salir el foco se restauran.
+
+El cambio de foco llega por eventos (SetWinEventHook en Windows), no por
+el sondeo de la pestaña de procesos. Cada cambio se anota en un diario
+en disco antes de aplicarse, de modo que si SystemManager termina sin
+restaurar (cierre forzado, fallo) el siguiente arranque lo deshace.
+"""
+import os
+import sys
+import json
+import time
+import queue
+import atexit
+import fnmatch
+import logging
+import threading
+from collections import deque
+import psutil
+from system_utils.process_governor import PRIORITIES
+
+logger = logging.getLogger(__name__)
+
+_ROOT = os.path.dirname(os.path.dirname(__file__))
+BOOST_FILE = os.path.join(_ROOT, "foreground_boost.json")
+# Diario de procesos modificados (existe solo mientras hay un perfil activo)
+BOOST_STATE_FILE = os.path.join(_ROOT, "foreground_boost_state.json")
+
+ACTIONS = ("lower", "suspend")
+BOOST_PRIORITIES = ("idle", "below_normal")
+
+# Procesos que nunca se frenan: suspenderlos bloquea el escritorio o la sesión
+PROTECTED_NAMES = {
+    "system", "registry", "smss.exe", "csrss.exe", "wininit.exe", "winlogon.exe",
+    "services.exe", "lsass.exe", "dwm.exe", "explorer.exe", "svchost.exe",
+    "audiodg.exe", "fontdrvhost.exe", "sihost.exe", "ctfmon.exe",
+    "systemd", "init", "xorg", "gnome-shell", "kwin_x11", "kwin_wayland",
+}
+
+
+def default_profile(app=""):
+    """Devuelve un perfil vacío."""
+    return {
+        "app": app,
+        "targets": [],
+        "action": "lower",
+        "priority": "idle",
+        "trim": False,
+        "enabled": True,
+    }
+
+
+def _matches(pattern, name, exe):
+    """Coincidencia por nombre o, si el patrón tiene separadores, por ruta."""
+    pattern = pattern.lower()
+    target = exe if ("\\" in pattern or "/" in pattern) else name
+    return bool(pattern) and fnmatch.fnmatch((target or "").lower(), pattern)
+
+
+class WinEventForegroundHook:
+    """
+    Avisa de cada cambio de ventana en primer plano con
+    EVENT_SYSTEM_FOREGROUND. El gancho vive en un hilo propio con su bucle
+    de mensajes (requisito de WINEVENT_OUTOFCONTEXT).
+    """
+    EVENT_SYSTEM_FOREGROUND = 0x0003
+    WINEVENT_OUTOFCONTEXT = 0x0000
+    WM_QUIT = 0x0012
+
+    def __init__(self, callback):
+        self.callback = callback
+        self._thread = None
+        self._thread_id = None
+        self._ready = threading.Event()
+        self.error = None
+
+    def start(self):
+        """Instala el gancho; devuelve False si no se pudo."""
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        self._ready.wait(timeout=2.0)
+        return self.error is None and self._thread_id is not None
+
+    def _run(self):
+        """Hilo del gancho: instala, bombea mensajes y desinstala."""
+        # pylint: disable=import-outside-toplevel
+        import ctypes
+        from ctypes import wintypes
+        user32 = ctypes.windll.user32
+        win_event_proc = ctypes.WINFUNCTYPE(
+            None, wintypes.HANDLE, wintypes.DWORD, wintypes.HWND,
+            wintypes.LONG, wintypes.LONG, wintypes.DWORD, wintypes.DWORD
+        )
+
+        def on_event(_hook, _event, hwnd, _obj, _child, _thread, _time):
+            pid = wintypes.DWORD()
+            user32.GetWindowThreadProcessId(hwnd, ctypes.byref(pid))
+            if pid.value:
+                self.callback(pid.value)
+
+        # La referencia debe vivir mientras el gancho esté instalado
+        proc = win_event_proc(on_event)
+        hook = user32.SetWinEventHook(
+            self.EVENT_SYSTEM_FOREGROUND, self.EVENT_SYSTEM_FOREGROUND,
+            0, proc, 0, 0, self.WINEVENT_OUTOFCONTEXT
+        )
+        if not hook:
+            self.error = "SetWinEventHook falló"
+            self._ready.set()
+            return
+        self._thread_id = ctypes.windll.kernel32.GetCurrentThreadId()
+        self._ready.set()
+
+        msg = wintypes.MSG()
+        while user32.GetMessageW(ctypes.byref(msg), 0, 0, 0) > 0:
+            user32.TranslateMessage(ctypes.byref(msg))
+            user32.DispatchMessageW(ctypes.byref(msg))
+        user32.UnhookWinEvent(hook)
+
+    def stop(self):
+        """Termina el bucle de mensajes y espera al hilo."""
+        if self._thread_id is None:
+            return
+        # pylint: disable=import-outside-toplevel
+        import ctypes
+        ctypes.windll.user32.PostThreadMessageW(self._thread_id, self.WM_QUIT, 0, 0)
+        self._thread.join(timeout=2.0)
+        self._thread_id = None
+
+
+class ForegroundBoost:
+    """
+    Aplica el perfil de la aplicación en primer plano. Los eventos de foco
+    se procesan en un hilo propio: un perfil se activa cuando la aplicación
+    lleva `delay` s delante (evita alternar con Alt+Tab) y se restaura en
+    cuanto el foco pasa a otra.
+    """
+    # pylint: disable=too-many-instance-attributes
+    def __init__(self, config_file=BOOST_FILE, state_file=BOOST_STATE_FILE):
+        self.config_file = config_file
+        self.state_file = state_file
+        self.config = self.load_config()
+        self.actions = deque(maxlen=500)
+        # Perfil activo: (pid en primer plano, nombre, perfil) o None
+        self.active = None
+        # pid → entrada del diario con el estado original del proceso
+        self.applied = {}
+        self.hooked = False
+        # Último PID en primer plano notificado por el gancho
+        self.foreground_pid = None
+        self._lock = threading.RLock()
+        self._events = queue.SimpleQueue()
+        self._hook = None
+        self._worker = None
+        self._own_pid = os.getpid()
+
+    @property
+    def profiles(self):
+        """Perfiles guardados."""
+        return self.config["profiles"]
+
+    @property
+    def enabled(self):
+        """Indica si el modo primer plano está activado."""
+        return self.config["enabled"]
+
+    def load_config(self):
+        """Carga la configuración guardada."""
+        config = {"enabled": False, "delay": 1.0, "profiles": []}
+        if os.path.exists(self.config_file):
+            try:
+                with open(self.config_file, "r", encoding="utf-8") as f:
+                    saved = json.load(f)
+                config.update(saved)
+                config["profiles"] = [dict(default_profile(), **p) for p in config["profiles"]]
+            # pylint: disable=broad-exception-caught
+            except Exception as e:
+                logger.warning("No se pudo leer %s: %s", self.config_file, e)
+        return config
+
+    def save_config(self, config):
+        """Guarda la configuración y reevalúa la aplicación en primer plano."""
+        with self._lock:
+            self.config = config
+            try:
+                with open(self.config_file, "w", encoding="utf-8") as f:
+                    json.dump(config, f, indent=4)
+            # pylint: disable=broad-exception-caught
+            except Exception as e:
+                self.log_action(f"Error guardando la configuración: {e}")
+                return False
+            # El perfil activo puede haber cambiado o desaparecido
+            self.restore()
+            if self.foreground_pid is not None:
+                self.handle_foreground(self.foreground_pid)
+        return True
+
+    def log_action(self, message):
+        """Registra una acción en memoria y en el log."""
+        self.actions.append((time.time(), message))
+        logger.info(message)
+
+    def match_profile(self, name, exe):
+        """Primer perfil habilitado cuya aplicación coincide, o None."""
+        for profile in self.profiles:
+            if profile.get("enabled", True) and _matches(profile["app"], name, exe):
+                return profile
+        return None
+
+    # --- Diario en disco ---
+    def _write_state(self):
+        """Guarda el diario de forma atómica (o lo borra si está vacío)."""
+        try:
+            if not self.applied:
+                if os.path.exists(self.state_file):
+                    os.remove(self.state_file)
+                return
+            tmp = self.state_file + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(list(self.applied.values()), f, indent=4)
+            os.replace(tmp, self.state_file)
+        except OSError as e:
+            logger.warning("No se pudo guardar el diario del modo primer plano: %s", e)
+
+    def recover(self):
+        """Restaura los procesos que dejó modificados una sesión anterior."""
+        if not os.path.exists(self.state_file):
+            return 0
+        try:
+            with open(self.state_file, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+        # pylint: disable=broad-exception-caught
+        except Exception as e:
+            logger.warning("Diario del modo primer plano ilegible: %s", e)
+            entries = []
+        with self._lock:
+            self.applied = {entry["pid"]: entry for entry in entries}
+            restored = self.restore()
+        if restored:
+            self.log_action(f"Restaurados {restored} procesos de una sesión anterior")
+        return restored
+
+    # --- Eventos de foco ---
+    def start(self, hook=None):
+        """
+        Restaura lo pendiente de una sesión anterior y empieza a seguir el
+        primer plano (con SetWinEventHook si no se indica otro gancho).
+        """
+        self.recover()
+        atexit.register(self.stop)
+        if hook is None and sys.platform == "win32":
+            hook = WinEventForegroundHook(self.notify)
+        if hook is None:
+            return False
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+        self._hook = hook
+        self.hooked = hook.start()
+        if not self.hooked:
+            logger.warning("No se pudo seguir la ventana en primer plano")
+        return self.hooked
+
+    def notify(self, pid):
+        """Cambio de foco (llamado desde el hilo del gancho)."""
+        self.foreground_pid = pid
+        self._events.put(pid)
+
+    def _run(self):
+        """Procesa los cambios de foco con un retardo antes de activar."""
+        pid = self._events.get()
+        while pid is not None:
+            try:
+                pid = self._events.get(timeout=self._delay_for(pid))
+                continue  # Otro cambio de foco antes del retardo
+            except queue.Empty:
+                pass
+            try:
+                self.handle_foreground(pid)
+            # pylint: disable=broad-exception-caught
+            except Exception:
+                logger.exception("Error aplicando el modo primer plano")
+            pid = self._events.get()
+
+    def _delay_for(self, pid):
+        """Retardo antes de procesar el foco: cero si solo hay que restaurar."""
+        name, exe = self._identify(pid)
+        if self.enabled and self.match_profile(name, exe) is not None:
+            return float(self.config.get("delay", 1.0))
+        return 0.0
+
+    @staticmethod
+    def _identify(pid):
+        """(nombre, ruta) de un proceso o cadenas vacías si no se puede leer."""
+        try:
+            proc = psutil.Process(pid)
+            with proc.oneshot():
+                name = proc.name()
+                try:
+                    exe = proc.exe()
+                except psutil.AccessDenied:
+                    exe = ""
+            return name, exe
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            return "", ""
+
+    def handle_foreground(self, pid):
+        """Activa el perfil de `pid` (restaurando el anterior) o restaura si no tiene."""
+        with self._lock:
+            if self.active is not None and self.active[0] == pid:
+                return
+            name, exe = self._identify(pid)
+            profile = None
+            if self.enabled and pid != self._own_pid:
+                profile = self.match_profile(name, exe)
+            if self.active is not None and profile is self.active[2]:
+                # Otra ventana de la misma aplicación: el perfil sigue activo
+                self.active = (pid, name, profile)
+                return
+            if self.active is not None:
+                self.log_action(f"{self.active[1]} dejó el primer plano")
+                self.restore()
+            if profile is None:
+                return
+            self.active = (pid, name, profile)
+            for proc in psutil.process_iter(['pid', 'name', 'exe', 'create_time']):
+                self._boost(proc.info, profile)
+            self.log_action(
+                f"{name} en primer plano: {len(self.applied)} procesos frenados "
+                f"(perfil '{profile['app']}')"
+            )
+
+    def on_processes_started(self, infos):
+        """Frena también los procesos objetivo que aparecen con el perfil activo."""
+        with self._lock:
+            if self.active is None:
+                return
+            for info in infos:
+                self._boost(info, self.active[2])
+
+    def on_processes_exited(self, pids):
+        """Olvida los procesos frenados que terminaron."""
+        with self._lock:
+            removed = [pid for pid in pids if self.applied.pop(pid, None) is not None]
+            if removed:
+                self._write_state()
+
+    def is_suspended(self, pid):
+        """Indica si el modo primer plano mantiene suspendido el proceso."""
+        entry = self.applied.get(pid)
+        return entry is not None and entry["suspended"]
+
+    # --- Aplicar y restaurar ---
+    def is_target(self, info, profile):
+        """Indica si un proceso se frena con el perfil (nunca el propio ni los críticos)."""
+        pid = info['pid']
+        name = (info.get('name') or "").lower()
+        if pid <= 4 or pid == self._own_pid or pid in self.applied:
+            return False
+        if self.active is not None and pid == self.active[0]:
+            return False
+        if name in PROTECTED_NAMES:
+            return False
+        return any(_matches(pattern, name, info.get('exe'))
+                   for pattern in profile["targets"])
+
+    def _boost(self, info, profile):
+        """Anota el estado original de un proceso en el diario y lo frena."""
+        if not self.is_target(info, profile):
+            return
+        pid = info['pid']
+        label = f"{info.get('name')} (PID {pid})"
+        try:
+            proc = psutil.Process(pid)
+            entry = {
+                "pid": pid,
+                "name": info.get('name') or "",
+                "create_time": proc.create_time(),
+                "nice": proc.nice(),
+                "suspended": profile["action"] == "suspend",
+            }
+            # Primero el diario: si el programa muere a mitad, se puede deshacer
+            self.applied[pid] = entry
+            self._write_state()
+            if entry["suspended"]:
+                proc.suspend()
+            else:
+                proc.nice(PRIORITIES[profile.get("priority") or "idle"])
+        except (psutil.NoSuchProcess, psutil.AccessDenied, KeyError) as e:
+            self.applied.pop(pid, None)
+            self._write_state()
+            self.log_action(f"{label}: no se pudo frenar: {e}")
+            return
+
+        if profile.get("trim"):
+            try:
+                # pylint: disable=import-outside-toplevel
+                from system_utils.memory_cleaner import trim_working_set
+                trim_working_set(pid)
+            # pylint: disable=broad-exception-caught
+            except Exception as e:
+                self.log_action(f"{label}: no se pudo recortar la memoria: {e}")
+
+    def restore(self):
+        """Deshace todos los cambios anotados. Devuelve cuántos procesos se restauraron."""
+        with self._lock:
+            restored = 0
+            for entry in list(self.applied.values()):
+                label = f"{entry['name']} (PID {entry['pid']})"
+                try:
+                    proc = psutil.Process(entry["pid"])
+                    # PID reutilizado por otro proceso: no tocarlo
+                    if abs(proc.create_time() - entry["create_time"]) > 0.01:
+                        continue
+                    if entry["suspended"]:
+                        proc.resume()
+                    if entry["nice"] is not None and proc.nice() != entry["nice"]:
+                        proc.nice(entry["nice"])
+                    restored += 1
+                except psutil.NoSuchProcess:
+                    continue
+                except psutil.AccessDenied as e:
+                    self.log_action(f"{label}: no se pudo restaurar: {e}")
+            self.applied.clear()
+            self.active = None
+            self._write_state()
+            return restored
+
+    def status(self):
+        """Texto breve del estado para la interfaz."""
+        with self._lock:
+            if not self.enabled:
+                return "Modo primer plano desactivado"
+            if self.active is None:
+                return "Modo primer plano activado: esperando una aplicación con perfil"
+            return (f"{self.active[1]} en primer plano: "
+                    f"{len(self.applied)} procesos frenados")
+
+    def stop(self):
+        """Deja de seguir el foco y restaura todos los procesos."""
+        if self._hook is not None:
+            self._hook.stop()
+            self._hook = None
+        if self._worker is not None:
+            self._events.put(None)
+            self._worker.join(timeout=2.0)
+            self._worker = None
+        self.hooked = False
+        self.restore()
@@ -0,0 +1,19 @@
+"""
+io_rates.py
+Tasas de E/S por proceso y su formato. Las calcula ProcessTable como
+deltas de `io_counters()` entre refrescos con una media exponencial.
+"""
+from collections import namedtuple
+
+IORates = namedtuple("IORates", ["read_bps", "write_bps", "ops_ps", "other_bps"])
+
+
+def format_bytes_rate(value):
+    """Formatea bytes/s en B/s, KB/s o MB/s."""
+    if value is None:
+        return "-"
+    if value >= 1024 * 1024:
+        return f"{value / (1024 * 1024):.1f} MB/s"
+    if value >= 1024:
+        return f"{value / 1024:.1f} KB/s"
+    return f"{value:.0f} B/s"
@@ -0,0 +1,159 @@
+"""
+leak_detector.py
+Detector de fugas de memoria: guarda muestras de memoria privada por
+proceso en un búfer columnar NumPy y ajusta una regresión lineal
+vectorizada sobre todos los procesos a la vez.
+"""
+import logging
+from collections import namedtuple
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+LeakReport = namedtuple(
+    "LeakReport", ["pid", "mb_per_hour", "r2", "hours_to_exhaustion", "samples"]
+)
+
+MB = 1024 * 1024
+
+
+class LeakDetector:
+    """
+    Búfer circular (procesos x muestras) de memoria privada en MB con una
+    columna de tiempos compartida. `analyze` calcula pendiente, R² y ruido
+    de todas las filas en una sola pasada.
+    """
+    # pylint: disable=too-many-instance-attributes,too-many-arguments
+    def __init__(self, samples=120, sample_interval=30.0, analyze_interval=300.0,
+                 min_samples=20, min_mb_per_hour=5.0, min_r2=0.8,
+                 noise_factor=3.0, capacity=512):
+        self.nsamples = samples
+        self.sample_interval = sample_interval
+        self.analyze_interval = analyze_interval
+        self.min_samples = min_samples
+        self.min_mb_per_hour = min_mb_per_hour
+        self.min_r2 = min_r2
+        self.noise_factor = noise_factor
+
+        self.times = np.full(samples, np.nan, dtype=np.float64)
+        self.head = 0
+        self.values = np.full((capacity, samples), np.nan, dtype=np.float32)
+        self.create_time = np.full(capacity, np.nan, dtype=np.float64)
+        self.slot_pid = np.full(capacity, -1, dtype=np.int64)
+        self._slots = {}
+        self._free = list(range(capacity - 1, -1, -1))
+        self._last_sample = None
+        self._last_analyze = None
+        self.reports = {}
+
+    def _slot(self, pid, create_time):
+        """Ranura de un proceso; se reinicia si el PID fue reutilizado."""
+        slot = self._slots.get(pid)
+        if slot is not None and self.create_time[slot] == create_time:
+            return slot
+        if slot is None:
+            if not self._free:
+                old = self.values.shape[0]
+                self.values = np.vstack(
+                    [self.values, np.full((old, self.nsamples), np.nan, dtype=np.float32)])
+                self.create_time = np.concatenate(
+                    [self.create_time, np.full(old, np.nan)])
+                self.slot_pid = np.concatenate([self.slot_pid, np.full(old, -1, np.int64)])
+                self._free.extend(range(2 * old - 1, old - 1, -1))
+            slot = self._free.pop()
+            self._slots[pid] = slot
+        self.values[slot] = np.nan
+        self.create_time[slot] = create_time
+        self.slot_pid[slot] = pid
+        self.reports.pop(pid, None)
+        return slot
+
+    def due(self, now):
+        """Indica si toca tomar una muestra."""
+        return self._last_sample is None or now - self._last_sample >= self.sample_interval
+
+    def sample(self, pids, create_times, private_bytes, now):
+        """
+        Agrega una columna con la memoria privada de todos los procesos
+        (None en `private_bytes` deja un hueco que la regresión ignora).
+        """
+        self._last_sample = now
+        column = self.head
+        self.head = (self.head + 1) % self.nsamples
+        self.times[column] = now
+        self.values[:, column] = np.nan
+
+        slots = np.fromiter(
+            (self._slot(pid, ct or 0.0) for pid, ct in zip(pids, create_times)),
+            dtype=np.intp, count=len(pids)
+        )
+        self.values[slots, column] = np.asarray(private_bytes, dtype=np.float64) / MB
+
+        alive = set(pids)
+        for pid in [pid for pid in self._slots if pid not in alive]:
+            slot = self._slots.pop(pid)
+            self.values[slot] = np.nan
+            self.create_time[slot] = np.nan
+            self.slot_pid[slot] = -1
+            self.reports.pop(pid, None)
+            self._free.append(slot)
+
+    def analysis_due(self, now):
+        """Indica si toca ejecutar la regresión."""
+        return self._last_analyze is None or now - self._last_analyze >= self.analyze_interval
+
+    # pylint: disable=too-many-locals
+    def analyze(self, available_bytes, now):
+        """
+        Regresión lineal por fila (MB frente a horas) ignorando huecos.
+        Devuelve las fugas nuevas y actualiza `reports` con todas las activas.
+        """
+        self._last_analyze = now
+        y = self.values.astype(np.float64)
+        t = np.broadcast_to((self.times - np.nanmin(self.times)) / 3600.0, y.shape)
+        mask = ~np.isnan(y) & ~np.isnan(t)
+        n = mask.sum(axis=1)
+
+        y0 = np.where(mask, y, 0.0)
+        t0 = np.where(mask, t, 0.0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean_t = t0.sum(axis=1) / n
+            mean_y = y0.sum(axis=1) / n
+            dt = np.where(mask, t - mean_t[:, None], 0.0)
+            dy = np.where(mask, y - mean_y[:, None], 0.0)
+            var_t = (dt * dt).sum(axis=1)
+            var_y = (dy * dy).sum(axis=1)
+            slope = (dt * dy).sum(axis=1) / var_t
+            r2 = np.where(var_y > 0, slope * slope * var_t / var_y, 0.0)
+            residual = np.sqrt(np.maximum(var_y - slope * slope * var_t, 0.0) / np.maximum(n - 2, 1))
+            span = (np.where(mask, t, -np.inf).max(axis=1)
+                    - np.where(mask, t, np.inf).min(axis=1))
+
+        # Crecimiento sostenido, bien explicado por la recta y mayor que el ruido
+        leaking = (
+            (n >= self.min_samples)
+            & (slope >= self.min_mb_per_hour)
+            & (r2 >= self.min_r2)
+            & (slope * span > self.noise_factor * residual)
+            & (self.slot_pid >= 0)
+        )
+
+        new = []
+        active = {}
+        available_mb = available_bytes / MB
+        for slot in np.flatnonzero(leaking):
+            pid = int(self.slot_pid[slot])
+            report = LeakReport(
+                pid, float(slope[slot]), float(r2[slot]),
+                available_mb / float(slope[slot]), int(n[slot])
+            )
+            active[pid] = report
+            if pid not in self.reports:
+                new.append(report)
+                logger.warning(
+                    "Posible fuga de memoria PID %s: %.1f MB/h (R² %.2f), "
+                    "memoria disponible agotada en ~%.1f h",
+                    pid, report.mb_per_hour, report.r2, report.hours_to_exhaustion
+                )
+        self.reports = active
+        return new
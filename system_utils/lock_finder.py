@@ -0,0 +1,107 @@
+"""
+lock_finder.py
+"¿Quién bloquea este archivo?": índice ruta → procesos construido en
+paralelo con los archivos abiertos, las imágenes mapeadas en memoria
+(DLL y EXE cargados), el ejecutable y el directorio de trabajo de cada
+proceso, reutilizado durante un TTL corto para resolver miles de rutas
+con búsquedas en memoria.
+"""
+import os
+import time
+import bisect
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+import psutil
+
+LockHolder = namedtuple("LockHolder", ["pid", "name", "path"])
+
+
+def _key(path):
+    """Ruta normalizada para comparar (mayúsculas y separadores en Windows)."""
+    return os.path.normcase(os.path.normpath(path))
+
+
+def _process_paths(pid):
+    """(pid, nombre, rutas abiertas) de un proceso; rutas vacías si no hay acceso."""
+    try:
+        proc = psutil.Process(pid)
+        name = proc.name()
+    except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+        return pid, "", []
+    paths = []
+    for getter in (
+            lambda: [f.path for f in proc.open_files()],
+            # Las DLL cargadas no salen en open_files y bloquean el borrado igual
+            lambda: [m.path for m in proc.memory_maps() if os.path.isabs(m.path)],
+            lambda: [proc.exe()],
+            lambda: [proc.cwd()]):
+        try:
+            paths.extend(p for p in getter() if p)
+        # pylint: disable=broad-exception-caught
+        except Exception:
+            continue
+    # Una misma imagen puede aparecer como archivo abierto y como mapeada
+    return pid, name, list(dict.fromkeys(paths))
+
+
+class LockIndex:
+    """Índice inmutable: rutas ordenadas para buscar también por prefijo de carpeta."""
+    def __init__(self, entries, built_at):
+        self.built_at = built_at
+        self._holders = {}
+        for pid, name, paths in entries:
+            for path in paths:
+                self._holders.setdefault(_key(path), []).append(LockHolder(pid, name, path))
+        self._keys = sorted(self._holders)
+        self.processes = sum(1 for _, _, paths in entries if paths)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def holders(self, path):
+        """Procesos que tienen abierta la ruta o algo dentro de ella si es carpeta."""
+        key = _key(path)
+        found = list(self._holders.get(key, []))
+        prefix = key.rstrip(os.sep) + os.sep
+        start = bisect.bisect_left(self._keys, prefix)
+        for other in self._keys[start:]:
+            if not other.startswith(prefix):
+                break
+            found.extend(self._holders[other])
+        return found
+
+
+class LockFinder:
+    """Construye el índice en un pool de hilos y lo reutiliza `ttl` segundos."""
+    def __init__(self, ttl=30.0, workers=8):
+        self.ttl = ttl
+        self.workers = workers
+        self._index = None
+        self._lock = threading.Lock()
+
+    def index(self, now=None):
+        """Índice vigente; se reconstruye si caducó."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            if self._index is not None and now - self._index.built_at < self.ttl:
+                return self._index
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                entries = list(pool.map(_process_paths, psutil.pids()))
+            self._index = LockIndex(entries, time.monotonic())
+            return self._index
+
+    def invalidate(self):
+        """Fuerza la reconstrucción en la próxima búsqueda (p. ej. tras finalizar un proceso)."""
+        with self._lock:
+            self._index = None
+
+    def find(self, paths):
+        """{ruta: [LockHolder, ...]} solo para las rutas con algún proceso."""
+        index = self.index()
+        result = {}
+        for path in paths:
+            holders = index.holders(path)
+            if holders:
+                result[path] = holders
+        return result
@@ -0,0 +1,315 @@
+"""
+maintenance_scheduler.py
+Mantenimiento en reposo: ejecuta trabajos por pasos en un hilo de baja
+prioridad solo cuando el equipo está inactivo (CPU, disco y entrada del
+usuario) y los pausa en cuanto vuelve la actividad.
+"""
+import os
+import sys
+import json
+import time
+import ctypes
+import logging
+import threading
+import psutil
+
+logger = logging.getLogger(__name__)
+
+STATE_FILE = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), "maintenance_state.json"
+    )
+
+# Modo de fondo de Windows: baja la prioridad de CPU, E/S y memoria del hilo
+THREAD_MODE_BACKGROUND_BEGIN = 0x00010000
+
+
+def lower_thread_priority():
+    """Baja la prioridad de CPU y de E/S del hilo actual."""
+    try:
+        if sys.platform == "win32":
+            kernel32 = ctypes.windll.kernel32
+            kernel32.SetThreadPriority(
+                kernel32.GetCurrentThread(), THREAD_MODE_BACKGROUND_BEGIN
+                )
+        else:
+            # En Linux "nice" e ioprio_set se aplican por hilo (id nativo)
+            tid = threading.get_native_id()
+            os.setpriority(os.PRIO_PROCESS, tid, 19)
+            psutil.Process(tid).ionice(psutil.IOPRIO_CLASS_IDLE)
+    # pylint: disable=broad-exception-caught
+    except Exception as e:
+        logger.warning("No se pudo bajar la prioridad del mantenimiento: %s", e)
+
+
+def input_idle_seconds():
+    """Segundos desde la última entrada del usuario, o None si no se sabe."""
+    if sys.platform != "win32":
+        return None
+
+    # pylint: disable=too-few-public-methods
+    class LASTINPUTINFO(ctypes.Structure):
+        """Estructura de GetLastInputInfo."""
+        _fields_ = [("cbSize", ctypes.c_uint), ("dwTime", ctypes.c_uint)]
+
+    try:
+        info = LASTINPUTINFO()
+        info.cbSize = ctypes.sizeof(info)
+        if not ctypes.windll.user32.GetLastInputInfo(ctypes.byref(info)):
+            return None
+        elapsed = (ctypes.windll.kernel32.GetTickCount() - info.dwTime) & 0xFFFFFFFF
+        return elapsed / 1000.0
+    # pylint: disable=broad-exception-caught
+    except Exception:
+        return None
+
+
+class IdleDetector:
+    """
+    Decide si el equipo está en reposo. Descuenta la CPU y la E/S del propio
+    proceso para que el mantenimiento no se considere actividad del usuario.
+    """
+    # pylint: disable=too-many-instance-attributes
+    def __init__(self, cpu_max=15.0, disk_max=5 * 1024 * 1024, input_idle_min=120.0,
+                 input_idle=input_idle_seconds):
+        self.cpu_max = cpu_max
+        self.disk_max = disk_max
+        self.input_idle_min = input_idle_min
+        self.input_idle = input_idle
+        self.ncpu = psutil.cpu_count() or 1
+        self.own = psutil.Process()
+        self._last = None
+        self.reason = "Sin datos"
+        psutil.cpu_percent(None)
+        self.own.cpu_percent(None)
+
+    def _own_io(self):
+        """Bytes leídos y escritos por este proceso."""
+        try:
+            io = self.own.io_counters()
+            return io.read_bytes + io.write_bytes
+        # pylint: disable=broad-exception-caught
+        except Exception:
+            return 0
+
+    def _disk_io(self):
+        """Bytes leídos y escritos por todos los discos."""
+        try:
+            io = psutil.disk_io_counters()
+            return io.read_bytes + io.write_bytes if io else 0
+        # pylint: disable=broad-exception-caught
+        except Exception:
+            return 0
+
+    def check(self, now=None):
+        """Devuelve True si el equipo está inactivo; deja el motivo en `reason`."""
+        now = time.monotonic() if now is None else now
+        cpu = psutil.cpu_percent(None) - self.own.cpu_percent(None) / self.ncpu
+        disk, own_io = self._disk_io(), self._own_io()
+
+        last, self._last = self._last, (now, disk, own_io)
+        if last is None or now <= last[0]:
+            self.reason = "Midiendo actividad"
+            return False
+        disk_rate = max(0.0, (disk - last[1]) - (own_io - last[2])) / (now - last[0])
+
+        idle_for = self.input_idle()
+        if idle_for is not None and idle_for < self.input_idle_min:
+            self.reason = f"Usuario activo (hace {idle_for:.0f} s)"
+            return False
+        if cpu > self.cpu_max:
+            self.reason = f"CPU ocupada ({cpu:.0f}%)"
+            return False
+        if disk_rate > self.disk_max:
+            self.reason = f"Disco ocupado ({disk_rate / (1024 * 1024):.1f} MB/s)"
+            return False
+        self.reason = "En reposo"
+        return True
+
+
+# pylint: disable=too-few-public-methods
+class MaintenanceJob:
+    """
+    Trabajo de mantenimiento. `factory` devuelve un generador que cede el
+    control entre pasos y cuyo valor de retorno es el resultado; `summary`
+    lo convierte en texto.
+    """
+    def __init__(self, name, label, factory, min_interval, summary=str):
+        self.name = name
+        self.label = label
+        self.factory = factory
+        self.min_interval = min_interval
+        self.summary = summary
+
+
+def single_step(func, *args):
+    """Adapta una función sin pasos a la interfaz de generador de los trabajos."""
+    return func(*args)
+    yield  # pylint: disable=unreachable
+
+
+class MaintenanceScheduler:
+    """
+    Hilo de fondo que espera a que el equipo esté en reposo durante
+    `idle_checks` comprobaciones seguidas y ejecuta, paso a paso, el trabajo
+    pendiente más atrasado. Si vuelve la actividad el generador se conserva
+    y el trabajo continúa desde ahí en el siguiente periodo de reposo.
+    Con un EffectMeter en `effects` se mide el efecto de cada trabajo que
+    termina sin pausas, igual que las acciones manuales.
+    """
+    # pylint: disable=too-many-instance-attributes,too-many-arguments
+    def __init__(self, jobs, detector=None, check_interval=10.0, step_check=1.0,
+                 idle_checks=3, state_file=STATE_FILE, effects=None):
+        self.jobs = {job.name: job for job in jobs}
+        self.effects = effects
+        self.detector = detector or IdleDetector()
+        self.check_interval = check_interval
+        self.step_check = step_check
+        self.idle_checks = idle_checks
+        self.state_file = state_file
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._paused = {}
+        self._thread = None
+        self.state = self.load_state()
+        self.enabled = self.state.pop("_enabled", False)
+        # Lo que quedó a medias en la sesión anterior vuelve a empezar
+        for entry in self.state.values():
+            if entry.get("status") not in ("Completado", "Error"):
+                entry["status"] = "Pendiente"
+                entry.pop("elapsed", None)
+
+    def load_state(self):
+        """Carga el estado persistido de los trabajos."""
+        if os.path.exists(self.state_file):
+            try:
+                with open(self.state_file, "r", encoding="utf-8") as f:
+                    return json.load(f)
+            # pylint: disable=broad-exception-caught
+            except Exception:
+                return {}
+        return {}
+
+    def save_state(self):
+        """Guarda el estado de los trabajos y si el modo está activo."""
+        with self._lock:
+            data = dict(self.state, _enabled=self.enabled)
+        try:
+            with open(self.state_file, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=4, ensure_ascii=False)
+        # pylint: disable=broad-exception-caught
+        except Exception as e:
+            logger.warning("No se pudo guardar el estado de mantenimiento: %s", e)
+
+    def set_enabled(self, enabled):
+        """Activa o desactiva el mantenimiento en reposo."""
+        self.enabled = enabled
+        self.save_state()
+        if enabled:
+            self.start()
+
+    def start(self):
+        """Arranca el hilo si no está en marcha."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Detiene el hilo; los trabajos a medias se retoman en la próxima sesión."""
+        self._stop.set()
+
+    def status(self):
+        """Lista de (trabajo, estado) para mostrar en la interfaz."""
+        with self._lock:
+            return [(job, dict(self.state.get(name, {}))) for name, job in self.jobs.items()]
+
+    def _update(self, name, **values):
+        """Actualiza el estado de un trabajo."""
+        with self._lock:
+            self.state.setdefault(name, {}).update(values)
+
+    def next_job(self, now=None):
+        """Trabajo pausado o, si no hay, el vencido que más tiempo lleva esperando."""
+        if self._paused:
+            return self.jobs[next(iter(self._paused))]
+        now = time.time() if now is None else now
+        due = [
+            (self.state.get(name, {}).get("last_run", 0), job)
+            for name, job in self.jobs.items()
+            if now - self.state.get(name, {}).get("last_run", 0) >= job.min_interval
+        ]
+        return min(due, key=lambda item: item[0])[1] if due else None
+
+    def _run(self):
+        """Bucle del hilo de mantenimiento."""
+        lower_thread_priority()
+        idle_count = 0
+        while not self._stop.wait(self.check_interval):
+            if not self.enabled:
+                idle_count = 0
+                continue
+            idle_count = idle_count + 1 if self.detector.check() else 0
+            if idle_count < self.idle_checks:
+                continue
+            job = self.next_job()
+            if job is not None:
+                self.run_job(job)
+
+    def run_job(self, job):
+        """Ejecuta un trabajo por pasos hasta terminar o hasta que haya actividad."""
+        gen = self._paused.pop(job.name, None)
+        if gen is not None:
+            self._update(job.name, status="En curso")
+            self._steps(job, gen)
+            return
+        self._update(job.name, elapsed=0.0, status="En curso")
+        if self.effects is None:
+            self._steps(job, job.factory())
+            return
+        with self.effects.track(job.name, job.label) as run:
+            status = self._steps(job, job.factory())
+        # Una pausa significa actividad del usuario entre el antes y el después
+        if status != "Completado":
+            self.effects.cancel(run)
+
+    def _steps(self, job, gen):
+        """Avanza el generador; devuelve 'Completado', 'Error' o None si se pausó."""
+        start = time.monotonic()
+        last_check = start
+        try:
+            while True:
+                next(gen)
+                now = time.monotonic()
+                if now - last_check >= self.step_check:
+                    last_check = now
+                    if self._stop.is_set() or not self.enabled or not self.detector.check():
+                        self._paused[job.name] = gen
+                        self._pause(job, now - start)
+                        return None
+        except StopIteration as stop:
+            self._finish(job, time.monotonic() - start, "Completado", job.summary(stop.value))
+            return "Completado"
+        # pylint: disable=broad-exception-caught
+        except Exception as e:
+            logger.exception("Error en mantenimiento '%s'", job.name)
+            self._finish(job, time.monotonic() - start, "Error", str(e))
+            return "Error"
+
+    def _pause(self, job, elapsed):
+        """Marca un trabajo como pausado por actividad."""
+        with self._lock:
+            entry = self.state.setdefault(job.name, {})
+            entry["elapsed"] = entry.get("elapsed", 0.0) + elapsed
+            entry["status"] = f"Pausado: {self.detector.reason}"
+        self.save_state()
+
+    def _finish(self, job, elapsed, status, result):
+        """Registra el resultado de un trabajo terminado y lo persiste."""
+        with self._lock:
+            entry = self.state.setdefault(job.name, {})
+            entry.update(
+                status=status, result=result, last_run=time.time(),
+                duration=entry.pop("elapsed", 0.0) + elapsed
+            )
+        logger.info("Mantenimiento '%s': %s (%s)", job.name, status, result)
+        self.save_state()
@@ -23,10 +23,10 @@ def run_as_admin():
 
 run_as_admin()
 
-def trim_working_set_all():
+def iter_trim_working_set(step=20):
     """
-    Recorta el working set de todos los procesos posibles.
-    Retorna (ok, mensaje) con el resultado del barrido.
+    Recorta el working set de todos los procesos posibles cediendo el
+    control cada `step` procesos. Retorna (total, recortados, fallidos).
     """
     kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
     # pylint: disable=invalid-name
@@ -46,6 +46,8 @@ def trim_working_set_all():
     for proc in psutil.process_iter(['pid', 'name']):
         pid = proc.info['pid']
         total += 1
+        if total % step == 0:
+            yield total
         try:
             hproc = ctypes.windll.kernel32.OpenProcess(
                 PROCESS_ALL_ACCESS, False, pid
@@ -70,6 +72,44 @@ def trim_working_set_all():
         except Exception:
             failed += 1
 
+    return total, trimmed, failed
+
+def trim_working_set(pid):
+    """
+    Recorta el working set de un solo proceso. Retorna True si se pudo.
+    """
+    kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+    # pylint: disable=invalid-name
+    SetProcessWorkingSetSize = kernel32.SetProcessWorkingSetSize
+    SetProcessWorkingSetSize.argtypes = [
+        ctypes.c_void_p, ctypes.c_size_t, ctypes.c_size_t
+        ]
+    SetProcessWorkingSetSize.restype = ctypes.c_int
+
+    # PROCESS_SET_QUOTA | PROCESS_QUERY_LIMITED_INFORMATION
+    hproc = ctypes.windll.kernel32.OpenProcess(0x0100 | 0x1000, False, pid)
+    if not hproc:
+        return False
+    try:
+        return SetProcessWorkingSetSize(
+            hproc, ctypes.c_size_t(-1), ctypes.c_size_t(-1)
+            ) != 0
+    finally:
+        ctypes.windll.kernel32.CloseHandle(hproc)
+
+def trim_working_set_all():
+    """
+    Recorta el working set de todos los procesos posibles.
+    Retorna (ok, mensaje) con el resultado del barrido.
+    """
+    gen = iter_trim_working_set()
+    while True:
+        try:
+            next(gen)
+        except StopIteration as stop:
+            total, trimmed, failed = stop.value
+            break
+
     mensaje = f"Procesos totales: {total} | Recortados: {trimmed} | Fallidos: {failed}"
     return True, mensaje
 
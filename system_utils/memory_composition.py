@@ -0,0 +1,255 @@
+"""
+memory_composition.py
+Composición de la memoria física (en uso, modificada, en espera/caché,
+libre), carga confirmada y memoria comprimida, y vaciado de la caché de
+archivos con el número de bytes que realmente quedaron libres.
+
+Cada plataforma es un backend: Windows lee contadores PDH y purga la
+lista en espera con NtSetSystemInformation; Linux lee /proc/meminfo y
+escribe en /proc/sys/vm/drop_caches.
+"""
+import os
+import sys
+import time
+import logging
+from collections import namedtuple
+import psutil
+
+logger = logging.getLogger(__name__)
+
+# Bytes. modified: páginas sucias pendientes de escribir; standby: caché
+# reutilizable sin escribir nada; compressed: None si el sistema no comprime
+MemoryComposition = namedtuple(
+    "MemoryComposition",
+    ["total", "in_use", "modified", "standby", "free",
+     "committed", "commit_limit", "compressed"]
+)
+
+# released: aumento de la memoria libre; cache_released: caída de la caché
+PurgeResult = namedtuple(
+    "PurgeResult", ["ok", "message", "released", "cache_released", "seconds"]
+)
+
+MB = 1024 * 1024
+
+
+class MemoryBackend:
+    """Interfaz de las fuentes de composición de memoria y de vaciado de caché."""
+    name = ""
+
+    def composition(self):
+        """MemoryComposition actual."""
+        raise NotImplementedError
+
+    def _purge(self):
+        """Vacía la caché; lanza una excepción si no se pudo."""
+        raise NotImplementedError
+
+    def purge_cache(self):
+        """
+        Vacía la caché de archivos y mide lo liberado comparando la
+        composición justo antes y justo después (operación bloqueante).
+        """
+        before = self.composition()
+        start = time.perf_counter()
+        try:
+            self._purge()
+        except PermissionError:
+            return PurgeResult(False, "Se necesitan permisos de administrador", 0, 0, 0.0)
+        # pylint: disable=broad-exception-caught
+        except Exception as e:
+            return PurgeResult(False, str(e), 0, 0, 0.0)
+        seconds = time.perf_counter() - start
+        after = self.composition()
+        released = max(0, after.free - before.free)
+        cache_released = max(0, before.standby - after.standby)
+        message = (f"Liberados {released / MB:.0f} MB "
+                   f"(caché {cache_released / MB:.0f} MB menos) en {seconds:.2f} s")
+        logger.info("Vaciado de caché (%s): %s", self.name, message)
+        return PurgeResult(True, message, released, cache_released, seconds)
+
+
+def parse_meminfo(text):
+    """{campo: bytes} de un /proc/meminfo."""
+    values = {}
+    for line in text.splitlines():
+        key, _, rest = line.partition(":")
+        parts = rest.split()
+        if parts:
+            values[key] = int(parts[0]) * (1024 if len(parts) > 1 else 1)
+    return values
+
+
+class LinuxMemoryBackend(MemoryBackend):
+    """
+    /proc/meminfo. La caché es Buffers + Cached + SReclaimable; la parte
+    sucia (Dirty + Writeback) se cuenta como modificada. Comprimida es el
+    tamaño del pool de zswap (Zswap) cuando el núcleo lo expone.
+    """
+    name = "Linux"
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, meminfo="/proc/meminfo", drop_caches="/proc/sys/vm/drop_caches",
+                 level=1, sync=os.sync):
+        self.meminfo = meminfo
+        self.drop_caches = drop_caches
+        # 1: caché de páginas; 3: también dentries e inodos
+        self.level = level
+        self.sync = sync
+
+    def composition(self):
+        with open(self.meminfo, "r", encoding="ascii") as f:
+            info = parse_meminfo(f.read())
+        total = info["MemTotal"]
+        free = info["MemFree"]
+        cache = info.get("Buffers", 0) + info.get("Cached", 0) + info.get("SReclaimable", 0)
+        modified = min(cache, info.get("Dirty", 0) + info.get("Writeback", 0))
+        return MemoryComposition(
+            total=total,
+            in_use=max(0, total - free - cache),
+            modified=modified,
+            standby=cache - modified,
+            free=free,
+            committed=info.get("Committed_AS", 0),
+            commit_limit=info.get("CommitLimit", 0),
+            compressed=info.get("Zswap"),
+        )
+
+    def _purge(self):
+        # drop_caches solo descarta páginas limpias: escribir antes las sucias
+        self.sync()
+        with open(self.drop_caches, "w", encoding="ascii") as f:
+            f.write(str(self.level))
+
+
+class WindowsMemoryBackend(MemoryBackend):
+    """
+    Listas de páginas con contadores PDH (las mismas que muestra el Monitor
+    de recursos). Comprimida es el working set del proceso Memory
+    Compression. La purga de la lista en espera necesita administrador.
+    """
+    name = "Windows"
+    COUNTERS = {
+        "modified": (r"\Memory\Modified Page List Bytes",),
+        "standby": (r"\Memory\Standby Cache Core Bytes",
+                    r"\Memory\Standby Cache Normal Priority Bytes",
+                    r"\Memory\Standby Cache Reserve Bytes"),
+        "free": (r"\Memory\Free & Zero Page List Bytes",),
+        "committed": (r"\Memory\Committed Bytes",),
+        "commit_limit": (r"\Memory\Commit Limit",),
+    }
+    # SYSTEM_INFORMATION_CLASS y SYSTEM_MEMORY_LIST_COMMAND
+    SYSTEM_MEMORY_LIST_INFORMATION = 80
+    MEMORY_PURGE_STANDBY_LIST = 4
+
+    def __init__(self):
+        # pylint: disable=import-outside-toplevel
+        import win32pdh
+        self.pdh = win32pdh
+        self.query = win32pdh.OpenQuery()
+        self.counters = {
+            key: [win32pdh.AddEnglishCounter(self.query, path) for path in paths]
+            for key, paths in self.COUNTERS.items()
+        }
+        self._compression_pid = None
+        self._compression_denied = False
+
+    def _compressed(self):
+        """
+        Working set de Memory Compression (None si no existe o no es
+        accesible). El PID se busca una sola vez: recorrer todos los procesos
+        cada 2 s se come el presupuesto del colector. Sin permisos se
+        conserva el PID y se deja de consultar.
+        """
+        if self._compression_pid is None:
+            self._compression_pid = next(
+                (p.pid for p in psutil.process_iter(['name'])
+                 if p.info['name'] == "Memory Compression"), 0
+            )
+        if not self._compression_pid or self._compression_denied:
+            return None
+        try:
+            return psutil.Process(self._compression_pid).memory_info().rss
+        except psutil.AccessDenied:
+            self._compression_denied = True
+            return None
+        except psutil.NoSuchProcess:
+            # Se reinició: buscarlo de nuevo en la próxima lectura
+            self._compression_pid = None
+            return None
+
+    def composition(self):
+        self.pdh.CollectQueryData(self.query)
+        values = {
+            key: sum(
+                int(self.pdh.GetFormattedCounterValue(c, self.pdh.PDH_FMT_LARGE)[1])
+                for c in counters
+            )
+            for key, counters in self.counters.items()
+        }
+        total = psutil.virtual_memory().total
+        return MemoryComposition(
+            total=total,
+            in_use=max(0, total - values["free"] - values["standby"] - values["modified"]),
+            compressed=self._compressed(),
+            **values
+        )
+
+    @staticmethod
+    def _enable_privilege(name):
+        """Activa un privilegio en el token del proceso (falla sin administrador)."""
+        # pylint: disable=import-outside-toplevel,too-few-public-methods
+        import ctypes
+        from ctypes import wintypes
+
+        class LUID(ctypes.Structure):
+            _fields_ = [("LowPart", wintypes.DWORD), ("HighPart", wintypes.LONG)]
+
+        class TOKEN_PRIVILEGES(ctypes.Structure):  # pylint: disable=invalid-name
+            _fields_ = [("PrivilegeCount", wintypes.DWORD), ("Luid", LUID),
+                        ("Attributes", wintypes.DWORD)]
+
+        advapi32 = ctypes.WinDLL("advapi32", use_last_error=True)
+        token = wintypes.HANDLE()
+        # TOKEN_ADJUST_PRIVILEGES | TOKEN_QUERY
+        if not advapi32.OpenProcessToken(
+                ctypes.windll.kernel32.GetCurrentProcess(), 0x0020 | 0x0008,
+                ctypes.byref(token)):
+            raise ctypes.WinError(ctypes.get_last_error())
+        try:
+            privileges = TOKEN_PRIVILEGES(1, LUID(), 0x00000002)  # SE_PRIVILEGE_ENABLED
+            if not advapi32.LookupPrivilegeValueW(None, name, ctypes.byref(privileges.Luid)):
+                raise ctypes.WinError(ctypes.get_last_error())
+            advapi32.AdjustTokenPrivileges(token, False, ctypes.byref(privileges), 0, None, None)
+            # ERROR_NOT_ALL_ASSIGNED: el token no tiene el privilegio
+            if ctypes.get_last_error() == 1300:
+                raise PermissionError(name)
+        finally:
+            ctypes.windll.kernel32.CloseHandle(token)
+
+    def _purge(self):
+        # pylint: disable=import-outside-toplevel
+        import ctypes
+        self._enable_privilege("SeProfileSingleProcessPrivilege")
+        command = ctypes.c_int(self.MEMORY_PURGE_STANDBY_LIST)
+        status = ctypes.windll.ntdll.NtSetSystemInformation(
+            self.SYSTEM_MEMORY_LIST_INFORMATION, ctypes.byref(command), ctypes.sizeof(command)
+        ) & 0xFFFFFFFF
+        if status == 0xC0000061:  # STATUS_PRIVILEGE_NOT_HELD
+            raise PermissionError("SeProfileSingleProcessPrivilege")
+        if status != 0:
+            raise OSError(f"NtSetSystemInformation devolvió 0x{status:08X}")
+
+
+def default_memory_backend():
+    """Backend de la plataforma actual, o None si no hay ninguno disponible."""
+    if sys.platform == "win32":
+        try:
+            return WindowsMemoryBackend()
+        # pylint: disable=broad-exception-caught
+        except Exception as e:
+            logger.info("Sin contadores de listas de memoria: %s", e)
+            return None
+    if os.path.exists("/proc/meminfo"):
+        return LinuxMemoryBackend()
+    return None
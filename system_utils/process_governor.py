@@ -0,0 +1,324 @@
+"""
+process_governor.py
+Reglas persistentes por nombre o ruta de ejecutable que fijan prioridad
+de CPU, afinidad, prioridad de E/S y un límite opcional de CPU.
+Las reglas se aplican cuando aparece un proceso nuevo.
+"""
+import os
+import json
+import time
+import atexit
+import fnmatch
+import logging
+import threading
+from collections import deque
+import psutil
+
+logger = logging.getLogger(__name__)
+
+RULES_FILE = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), "governor_rules.json"
+    )
+# Diario de los procesos limitados (pueden quedar suspendidos si el programa muere)
+THROTTLE_STATE_FILE = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), "governor_throttle_state.json"
+    )
+
+# Clases de prioridad de CPU (Windows) con equivalente nice en otros sistemas
+PRIORITIES = {
+    "idle": getattr(psutil, "IDLE_PRIORITY_CLASS", 19),
+    "below_normal": getattr(psutil, "BELOW_NORMAL_PRIORITY_CLASS", 10),
+    "normal": getattr(psutil, "NORMAL_PRIORITY_CLASS", 0),
+    "above_normal": getattr(psutil, "ABOVE_NORMAL_PRIORITY_CLASS", -5),
+    "high": getattr(psutil, "HIGH_PRIORITY_CLASS", -10),
+}
+
+IO_PRIORITIES = ["very_low", "low", "normal", "high"]
+
+
+def _set_io_priority(proc, level):
+    """Aplica la prioridad de E/S con la API disponible en la plataforma."""
+    if hasattr(psutil, "IOPRIO_VERYLOW"):
+        # Windows
+        value = {
+            "very_low": psutil.IOPRIO_VERYLOW,
+            "low": psutil.IOPRIO_LOW,
+            "normal": psutil.IOPRIO_NORMAL,
+            "high": psutil.IOPRIO_HIGH,
+        }[level]
+        proc.ionice(value)
+    elif level == "very_low":
+        proc.ionice(psutil.IOPRIO_CLASS_IDLE)
+    else:
+        proc.ionice(psutil.IOPRIO_CLASS_BE, {"low": 7, "normal": 4, "high": 0}[level])
+
+
+def default_rule(match=""):
+    """Devuelve una regla vacía."""
+    return {
+        "match": match,
+        "priority": None,
+        "affinity": None,
+        "io_priority": None,
+        "cpu_cap": None,
+        "enabled": True,
+    }
+
+
+class CpuThrottler:
+    """
+    Limita el uso de CPU de procesos suspendiéndolos una fracción
+    de cada periodo (ciclo de trabajo), en un hilo en segundo plano.
+    `skip(pid)` indica procesos que otro componente mantiene suspendidos
+    (modo primer plano): no se tocan para no reanudarlos en cada ciclo.
+
+    Los procesos limitados se anotan (PID y `create_time`) en un diario
+    al cambiar la lista, no en cada ciclo; si SystemManager muere a mitad
+    de una pausa, `recover` los reanuda en el siguiente arranque.
+    """
+    def __init__(self, period=0.5, skip=None, state_file=THROTTLE_STATE_FILE):
+        self.period = period
+        self.skip = skip
+        self.state_file = state_file
+        self._journal = {}
+        self._caps = {}
+        self._last = {}
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+        self._ncpu = psutil.cpu_count() or 1
+
+    def set_cap(self, pid, cap):
+        """Limita un proceso a `cap` % de la CPU total."""
+        create_time = psutil.Process(pid).create_time()
+        with self._lock:
+            self._caps[pid] = cap
+            if pid not in self._journal:
+                # Primero el diario: la primera pausa puede llegar enseguida
+                self._journal[pid] = {"pid": pid, "create_time": create_time}
+                self._write_state()
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def remove(self, pid):
+        """Deja de limitar un proceso."""
+        with self._lock:
+            self._caps.pop(pid, None)
+            self._last.pop(pid, None)
+            if self._journal.pop(pid, None) is not None:
+                self._write_state()
+
+    def _write_state(self):
+        """Guarda el diario de forma atómica (o lo borra si está vacío)."""
+        try:
+            if not self._journal:
+                if os.path.exists(self.state_file):
+                    os.remove(self.state_file)
+                return
+            tmp = self.state_file + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(list(self._journal.values()), f, indent=4)
+            os.replace(tmp, self.state_file)
+        except OSError as e:
+            logger.warning("No se pudo guardar el diario del limitador de CPU: %s", e)
+
+    def recover(self):
+        """Reanuda los procesos que una sesión anterior dejó limitados. Devuelve cuántos."""
+        if not os.path.exists(self.state_file):
+            return 0
+        try:
+            with open(self.state_file, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+        # pylint: disable=broad-exception-caught
+        except Exception as e:
+            logger.warning("Diario del limitador de CPU ilegible: %s", e)
+            entries = []
+        resumed = 0
+        for entry in entries:
+            try:
+                proc = psutil.Process(entry["pid"])
+                # PID reutilizado por otro proceso: no tocarlo
+                if abs(proc.create_time() - entry["create_time"]) > 0.01:
+                    continue
+                proc.resume()
+                resumed += 1
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+        with self._lock:
+            self._write_state()
+        return resumed
+
+    def stop(self):
+        """Detiene el hilo y reanuda todos los procesos limitados."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2 * self.period)
+
+    def _run(self):
+        """Bucle de ciclo de trabajo."""
+        while not self._stop.is_set():
+            start = time.monotonic()
+            with self._lock:
+                caps = dict(self._caps)
+            pauses = []
+            skip = self.skip
+            for pid, cap in caps.items():
+                if skip is not None and skip(pid):
+                    self._last.pop(pid, None)
+                    continue
+                try:
+                    proc = psutil.Process(pid)
+                    times = proc.cpu_times()
+                    used = times.user + times.system
+                    prev = self._last.get(pid)
+                    self._last[pid] = (start, used)
+                    if prev is None or start <= prev[0]:
+                        continue
+                    usage = (used - prev[1]) / (start - prev[0]) / self._ncpu * 100
+                    if usage > cap:
+                        off = self.period * min(0.9, 1 - cap / usage)
+                        proc.suspend()
+                        pauses.append((off, proc))
+                except (psutil.NoSuchProcess, psutil.AccessDenied):
+                    self.remove(pid)
+
+            for off, proc in sorted(pauses, key=lambda p: p[0]):
+                remaining = start + off - time.monotonic()
+                if remaining > 0:
+                    self._stop.wait(remaining)
+                self._resume(proc)
+
+            self._stop.wait(max(0.0, self.period - (time.monotonic() - start)))
+
+        with self._lock:
+            pids = list(self._caps)
+        for pid in pids:
+            if self.skip is not None and self.skip(pid):
+                continue
+            try:
+                psutil.Process(pid).resume()
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+        with self._lock:
+            self._journal.clear()
+            self._write_state()
+
+    @staticmethod
+    def _resume(proc):
+        """Reanuda un proceso ignorando si ya terminó."""
+        try:
+            proc.resume()
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            pass
+
+
+class ProcessGovernor:
+    """Aplica las reglas a los procesos nuevos y registra cada acción."""
+    def __init__(self, rules_file=RULES_FILE, throttler=None):
+        self.rules_file = rules_file
+        self.rules = self.load_rules()
+        self.actions = deque(maxlen=500)
+        self.throttler = throttler or CpuThrottler()
+        self._match_cache = {}
+        resumed = self.throttler.recover()
+        if resumed:
+            self.log_action(f"Reanudados {resumed} procesos limitados en una sesión anterior")
+        # Un cierre sin pasar por la ventana no debe dejar procesos en pausa
+        atexit.register(self.stop)
+
+    def load_rules(self):
+        """Carga las reglas guardadas."""
+        if os.path.exists(self.rules_file):
+            try:
+                with open(self.rules_file, "r", encoding="utf-8") as f:
+                    return [dict(default_rule(), **rule) for rule in json.load(f)]
+            # pylint: disable=broad-exception-caught
+            except Exception:
+                return []
+        return []
+
+    def save_rules(self, rules):
+        """Guarda las reglas y reinicia la caché de coincidencias."""
+        self.rules = rules
+        self._match_cache.clear()
+        try:
+            with open(self.rules_file, "w", encoding="utf-8") as f:
+                json.dump(rules, f, indent=4)
+            return True
+        # pylint: disable=broad-exception-caught
+        except Exception as e:
+            self.log_action(f"Error guardando reglas: {e}")
+            return False
+
+    def log_action(self, message):
+        """Registra una acción en memoria y en el log."""
+        self.actions.append((time.time(), message))
+        logger.info(message)
+
+    def match(self, name, exe):
+        """Devuelve las reglas habilitadas que coinciden con un ejecutable."""
+        key = (name, exe)
+        cached = self._match_cache.get(key)
+        if cached is not None:
+            return cached
+
+        name = (name or "").lower()
+        exe = (exe or "").lower()
+        matched = []
+        for rule in self.rules:
+            pattern = rule["match"].lower()
+            if not rule.get("enabled", True) or not pattern:
+                continue
+            target = exe if ("\\" in pattern or "/" in pattern) else name
+            if fnmatch.fnmatch(target, pattern):
+                matched.append(rule)
+        self._match_cache[key] = matched
+        return matched
+
+    def on_processes_started(self, infos):
+        """Aplica las reglas a los procesos recién aparecidos."""
+        if not self.rules:
+            return
+        for info in infos:
+            for rule in self.match(info.get("name"), info.get("exe")):
+                self.apply_rule(info["pid"], info.get("name") or "", rule)
+
+    def on_processes_exited(self, pids):
+        """Olvida los procesos terminados."""
+        for pid in pids:
+            self.throttler.remove(pid)
+
+    def apply_rule(self, pid, name, rule):
+        """Aplica una regla a un proceso concreto."""
+        label = f"{name} (PID {pid})"
+        try:
+            proc = psutil.Process(pid)
+        except psutil.NoSuchProcess:
+            return
+
+        steps = [
+            ("priority", "prioridad",
+             lambda v: proc.nice(PRIORITIES[v])),
+            ("affinity", "afinidad",
+             proc.cpu_affinity),
+            ("io_priority", "prioridad de E/S",
+             lambda v: _set_io_priority(proc, v)),
+            ("cpu_cap", "límite de CPU",
+             lambda v: self.throttler.set_cap(pid, float(v))),
+        ]
+        for key, description, action in steps:
+            value = rule.get(key)
+            if value in (None, "", []):
+                continue
+            try:
+                action(value)
+                self.log_action(f"{label}: {description} = {value} (regla '{rule['match']}')")
+            except (psutil.NoSuchProcess, psutil.AccessDenied,
+                    AttributeError, ValueError, KeyError) as e:
+                self.log_action(f"{label}: no se pudo aplicar {description}: {e}")
+
+    def stop(self):
+        """Detiene el limitador de CPU."""
+        self.throttler.stop()
@@ -0,0 +1,98 @@
+"""
+process_index.py
+Índice incremental de nombre, PID, ruta y línea de comandos
+para filtrar la lista de procesos mientras el usuario escribe.
+"""
+
+
+def _trigrams(text):
+    """Devuelve el conjunto de trigramas de un texto."""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class ProcessIndex:
+    """
+    Índice invertido de trigramas por PID. Se actualiza con los eventos
+    de alta/baja de cada refresco, nunca recorriendo todas las filas.
+    """
+    def __init__(self):
+        self._texts = {}      # pid -> texto normalizado
+        self._postings = {}   # trigrama -> set(pid)
+        self._last_query = ""
+        self._last_result = None
+
+    def add(self, pid, name="", exe="", cmdline=None):
+        """Indexa (o reindexa) un proceso."""
+        if pid in self._texts:
+            self.remove(pid)
+        parts = [str(pid), name or "", exe or ""]
+        if cmdline:
+            parts.append(" ".join(cmdline))
+        text = "\n".join(parts).lower()
+        self._texts[pid] = text
+        for gram in _trigrams(text):
+            self._postings.setdefault(gram, set()).add(pid)
+        self._invalidate()
+
+    def remove(self, pid):
+        """Quita un proceso del índice."""
+        text = self._texts.pop(pid, None)
+        if text is None:
+            return
+        for gram in _trigrams(text):
+            pids = self._postings.get(gram)
+            if pids is not None:
+                pids.discard(pid)
+                if not pids:
+                    del self._postings[gram]
+        self._invalidate()
+
+    def _invalidate(self):
+        """Descarta la caché de la última búsqueda."""
+        self._last_query = ""
+        self._last_result = None
+
+    def matches(self, pid, query):
+        """Indica si un proceso concreto coincide con la consulta."""
+        query = query.strip().lower()
+        if not query:
+            return True
+        text = self._texts.get(pid)
+        return text is not None and query in text
+
+    def search(self, query):
+        """
+        Devuelve el conjunto de PIDs que contienen la consulta.
+        Con consultas de 3+ caracteres se intersectan las listas de
+        trigramas; si la consulta amplía la anterior, se filtra sobre
+        el resultado previo.
+        """
+        query = query.strip().lower()
+        if not query:
+            return set(self._texts)
+
+        if (self._last_result is not None and self._last_query
+                and query.startswith(self._last_query)):
+            candidates = self._last_result
+        elif len(query) >= 3:
+            grams = sorted(_trigrams(query),
+                           key=lambda g: len(self._postings.get(g, ())))
+            candidates = set(self._postings.get(grams[0], ()))
+            for gram in grams[1:]:
+                if not candidates:
+                    break
+                candidates &= self._postings.get(gram, set())
+        else:
+            candidates = self._texts.keys()
+
+        texts = self._texts
+        result = {pid for pid in candidates if query in texts[pid]}
+        self._last_query = query
+        self._last_result = result
+        return result
+
+    def __contains__(self, pid):
+        return pid in self._texts
+
+    def __len__(self):
+        return len(self._texts)
@@ -0,0 +1,324 @@
+"""
+process_table.py
+Tabla de procesos en columnas NumPy (una por atributo, tipo fijo) que se
+actualiza en su sitio con cada recorrido de ProcessWatch. Las tasas de
+E/S de ProcessTab, los detectores de procesos desbocados y de fugas y el
+"ahora" de los mayores consumidores salen de estas columnas con operaciones
+vectorizadas en lugar de bucles sobre los diccionarios `proc.info`.
+"""
+import logging
+from collections import namedtuple
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Columnas: nombre → (dtype, valor de una fila libre)
+COLUMNS = {
+    "pid": (np.int32, -1),
+    "ppid": (np.int32, -1),
+    "create_time": (np.float64, np.nan),
+    "cpu_user": (np.float64, 0.0),
+    "cpu_system": (np.float64, 0.0),
+    "cpu_percent": (np.float32, 0.0),
+    "memory_percent": (np.float32, 0.0),
+    "rss": (np.uint64, 0),
+    "vms": (np.uint64, 0),
+    "read_bytes": (np.uint64, 0),
+    "write_bytes": (np.uint64, 0),
+    "read_count": (np.uint64, 0),
+    "write_count": (np.uint64, 0),
+    # Solo Windows (red y dispositivos); NaN si el sistema no lo da
+    "other_bytes": (np.float64, np.nan),
+    # Tasas de E/S suavizadas (media exponencial); NaN hasta la segunda muestra
+    "read_rate": (np.float64, np.nan),
+    "write_rate": (np.float64, np.nan),
+    "ops_rate": (np.float64, np.nan),
+    "other_rate": (np.float64, np.nan),
+    "name_id": (np.int32, -1),
+    "updated": (np.float64, np.nan),
+}
+
+# Valores del tick anterior (CPU total, E/S, momento) para las tasas
+PREVIOUS = ("prev_cpu", "prev_read", "prev_write", "prev_ops", "prev_other", "prev_updated")
+
+# count: procesos del grupo; total: suma de la columna; pids: miembros
+ProcessGroup = namedtuple("ProcessGroup", ["name", "count", "total", "pids"])
+# Tasas por segundo alineadas con `rows`; NaN en la primera muestra de cada fila
+ProcessRates = namedtuple(
+    "ProcessRates", ["rows", "cpu", "read_bps", "write_bps", "ops_ps", "other_bps"]
+)
+
+
+def _fields(info, key, fields):
+    """Campos de un namedtuple de psutil (ceros si falta: acceso denegado)."""
+    value = info.get(key)
+    if value is None:
+        return (0,) * len(fields)
+    return tuple(getattr(value, field, 0) for field in fields)
+
+
+class ProcessTable:
+    """
+    Estructura de arreglos: cada proceso ocupa una fila fija mientras vive
+    y las filas de los procesos terminados se reutilizan. Un PID reutilizado
+    (distinto `create_time`) recibe una fila limpia, sin tasas heredadas.
+
+    `rows` devuelve las filas vivas; todas las consultas aceptan columnas o
+    arreglos alineados con ellas. `smoothing` es la ventana (en muestras)
+    de la media exponencial de las tasas de E/S.
+    """
+    # pylint: disable=too-many-instance-attributes,no-member
+    def __init__(self, capacity=1024, smoothing=3):
+        self.smoothing = max(1, smoothing)
+        self._rows = {}
+        self._free = []
+        self._names = []
+        self._name_ids = {}
+        self._capacity = 0
+        self._live = None
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        """Crea (o amplía) todas las columnas conservando las filas actuales."""
+        old = self._capacity
+        self._capacity = capacity
+
+        def grow(name, dtype, fill):
+            arr = np.full(capacity, fill, dtype=dtype)
+            if old:
+                arr[:old] = getattr(self, name)
+            setattr(self, name, arr)
+
+        for name, (dtype, fill) in COLUMNS.items():
+            grow(name, dtype, fill)
+        grow("alive", np.bool_, False)
+        grow("prev_cpu", np.float64, 0.0)
+        grow("prev_read", np.uint64, 0)
+        grow("prev_write", np.uint64, 0)
+        grow("prev_ops", np.uint64, 0)
+        grow("prev_other", np.float64, np.nan)
+        grow("prev_updated", np.float64, np.nan)
+        self._free.extend(range(capacity - 1, old - 1, -1))
+
+    def _intern(self, name):
+        """Identificador entero del nombre (los nombres se guardan una vez)."""
+        name_id = self._name_ids.get(name)
+        if name_id is None:
+            name_id = len(self._names)
+            self._names.append(name)
+            self._name_ids[name] = name_id
+        return name_id
+
+    def _row(self, pid, create_time):
+        """Fila del proceso; asigna una limpia si es nuevo o el PID se reutilizó."""
+        row = self._rows.get(pid)
+        if row is not None and self.create_time[row] == create_time:
+            return row
+        if row is None:
+            if not self._free:
+                self._allocate(self._capacity * 2)
+            row = self._free.pop()
+            self._rows[pid] = row
+        for name, (_, fill) in COLUMNS.items():
+            getattr(self, name)[row] = fill
+        self.prev_updated[row] = np.nan
+        self.create_time[row] = create_time
+        self.alive[row] = True
+        return row
+
+    def _release(self, rows):
+        """Libera filas de procesos terminados."""
+        for row in rows.tolist():
+            self._rows.pop(int(self.pid[row]), None)
+            self._free.append(row)
+        self.alive[rows] = False
+        self.pid[rows] = -1
+
+    # pylint: disable=too-many-locals
+    def update(self, snapshot, now):
+        """
+        Vuelca un recorrido (lista de `proc.info`) en las columnas. Las filas
+        que no aparecen en él se liberan. Devuelve las filas del recorrido.
+        """
+        count = len(snapshot)
+        rows = np.fromiter(
+            (self._row(info['pid'], info.get('create_time') or 0.0) for info in snapshot),
+            dtype=np.intp, count=count
+        )
+        seen = np.zeros(self._capacity, dtype=np.bool_)
+        seen[rows] = True
+        gone = np.flatnonzero(self.alive & ~seen)
+        if gone.size:
+            self._release(gone)
+
+        # Valores del tick anterior antes de sobrescribir
+        self.prev_cpu[rows] = self.cpu_user[rows] + self.cpu_system[rows]
+        self.prev_read[rows] = self.read_bytes[rows]
+        self.prev_write[rows] = self.write_bytes[rows]
+        self.prev_ops[rows] = self.read_count[rows] + self.write_count[rows]
+        self.prev_other[rows] = self.other_bytes[rows]
+        self.prev_updated[rows] = self.updated[rows]
+
+        self.pid[rows] = [info['pid'] for info in snapshot]
+        self.ppid[rows] = [info.get('ppid') or 0 for info in snapshot]
+        self.cpu_percent[rows] = [info.get('cpu_percent') or 0.0 for info in snapshot]
+        self.memory_percent[rows] = [info.get('memory_percent') or 0.0 for info in snapshot]
+        self.name_id[rows] = [self._intern(info.get('name') or "") for info in snapshot]
+
+        cpu = np.array([_fields(info, 'cpu_times', ("user", "system")) for info in snapshot],
+                       dtype=np.float64).reshape(count, 2)
+        self.cpu_user[rows] = cpu[:, 0]
+        self.cpu_system[rows] = cpu[:, 1]
+        mem = np.array([_fields(info, 'memory_info', ("rss", "vms")) for info in snapshot],
+                       dtype=np.uint64).reshape(count, 2)
+        self.rss[rows] = mem[:, 0]
+        self.vms[rows] = mem[:, 1]
+        io = np.array([
+            _fields(info, 'io_counters',
+                    ("read_bytes", "write_bytes", "read_count", "write_count"))
+            for info in snapshot
+        ], dtype=np.uint64).reshape(count, 4)
+        self.read_bytes[rows] = io[:, 0]
+        self.write_bytes[rows] = io[:, 1]
+        self.read_count[rows] = io[:, 2]
+        self.write_count[rows] = io[:, 3]
+        self.other_bytes[rows] = [
+            getattr(info.get('io_counters'), 'other_bytes', np.nan) for info in snapshot
+        ]
+        self.updated[rows] = now
+
+        self._live = None
+        self._smooth()
+        return rows
+
+    def set_smoothing(self, smoothing):
+        """Cambia la ventana de suavizado de las tasas de E/S."""
+        self.smoothing = max(1, smoothing)
+
+    def _smooth(self):
+        """Media exponencial de las tasas del tick sobre las columnas `*_rate`."""
+        rates = self.rates()
+        alpha = 2.0 / (self.smoothing + 1)
+        for name, current in (("read_rate", rates.read_bps), ("write_rate", rates.write_bps),
+                              ("ops_rate", rates.ops_ps), ("other_rate", rates.other_bps)):
+            column = getattr(self, name)
+            previous = column[rates.rows]
+            column[rates.rows] = np.where(
+                np.isnan(current), previous,
+                np.where(np.isnan(previous), current, previous + alpha * (current - previous))
+            )
+
+    @property
+    def rows(self):
+        """Filas vivas en orden de fila (se recalcula solo tras `update`)."""
+        if self._live is None:
+            self._live = np.flatnonzero(self.alive)
+        return self._live
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __contains__(self, pid):
+        return pid in self._rows
+
+    def column(self, name, rows=None):
+        """Valores de una columna para las filas dadas (por defecto, las vivas)."""
+        return getattr(self, name)[self.rows if rows is None else rows]
+
+    def name(self, pid):
+        """Nombre del proceso o cadena vacía si no está en la tabla."""
+        row = self._rows.get(pid)
+        if row is None:
+            return ""
+        return self._names[self.name_id[row]]
+
+    def names(self, rows=None):
+        """Nombres de las filas dadas como lista."""
+        names = self._names
+        return [names[i] for i in self.column("name_id", rows).tolist()]
+
+    def row(self, pid):
+        """Todas las columnas de un proceso como diccionario (None si no está)."""
+        row = self._rows.get(pid)
+        if row is None:
+            return None
+        values = {name: getattr(self, name)[row].item() for name in COLUMNS}
+        values["name"] = self._names[values["name_id"]]
+        return values
+
+    def rates(self):
+        """
+        Tasas por segundo desde el tick anterior, vectorizadas sobre todas
+        las filas vivas: CPU en % de un núcleo, bytes de E/S leídos/escritos,
+        operaciones de E/S y otros bytes (NaN donde no hay contador).
+        """
+        rows = self.rows
+        dt = self.updated[rows] - self.prev_updated[rows]
+        valid = dt > 0  # NaN (fila nueva) queda en False
+        safe_dt = np.where(valid, dt, 1.0)
+
+        def rate(current, previous):
+            delta = current.astype(np.float64) - previous.astype(np.float64)
+            # Contadores que retroceden (reinicio o desbordamiento) no dan tasa
+            return np.where(valid & (delta >= 0), delta / safe_dt, np.nan)
+
+        cpu = rate(self.cpu_user[rows] + self.cpu_system[rows], self.prev_cpu[rows]) * 100.0
+        return ProcessRates(
+            rows, cpu,
+            rate(self.read_bytes[rows], self.prev_read[rows]),
+            rate(self.write_bytes[rows], self.prev_write[rows]),
+            rate(self.read_count[rows] + self.write_count[rows], self.prev_ops[rows]),
+            rate(self.other_bytes[rows], self.prev_other[rows]),
+        )
+
+    def order(self, key, descending=True, limit=None):
+        """
+        PIDs ordenados por una columna (nombre) o por un arreglo alineado con
+        `rows`. Con `limit` solo se ordenan los `limit` primeros (argpartition).
+        """
+        rows = self.rows
+        values = self.column(key) if isinstance(key, str) else np.asarray(key)
+        if descending:
+            values = -values.astype(np.float64)
+        if limit is not None and limit < len(values):
+            head = np.argpartition(values, limit)[:limit]
+            order = head[np.argsort(values[head], kind="stable")]
+        else:
+            order = np.argsort(values, kind="stable")
+        return self.pid[rows[order]]
+
+    def top(self, key, n=5):
+        """Los `n` procesos con mayor valor: lista de (pid, nombre, valor)."""
+        rows = self.rows
+        values = self.column(key) if isinstance(key, str) else np.asarray(key)
+        pids = self.order(values, limit=n)
+        by_pid = dict(zip(self.pid[rows].tolist(), values.tolist()))
+        return [(pid, self.name(pid), by_pid[pid]) for pid in pids.tolist()]
+
+    def group_by(self, value="rss", key="name_id"):
+        """
+        Suma una columna por grupo (por defecto, memoria por nombre de
+        proceso) con `bincount`. Devuelve ProcessGroup de mayor a menor total.
+        """
+        rows = self.rows
+        values = self.column(value) if isinstance(value, str) else np.asarray(value)
+        keys, inverse = np.unique(self.column(key), return_inverse=True)
+        totals = np.bincount(inverse, weights=values.astype(np.float64), minlength=len(keys))
+        counts = np.bincount(inverse, minlength=len(keys))
+        order = np.argsort(-totals, kind="stable")
+        pids = self.pid[rows]
+        members = np.split(pids[np.argsort(inverse, kind="stable")], np.cumsum(counts)[:-1])
+        names = self._names if key == "name_id" else None
+        return [
+            ProcessGroup(
+                names[keys[i]] if names is not None else keys[i].item(),
+                int(counts[i]), float(totals[i]), members[i].tolist()
+            )
+            for i in order.tolist()
+        ]
+
+    @property
+    def nbytes(self):
+        """Memoria de las columnas en bytes (sin contar la tabla de nombres)."""
+        names = list(COLUMNS) + ["alive"] + list(PREVIOUS)
+        return sum(getattr(self, name).nbytes for name in names)
@@ -0,0 +1,123 @@
+"""
+process_watch.py
+Servicio único de vigilancia de procesos: un solo `process_iter` por tick,
+diferenciado contra el anterior, publica inicios, finales y cambios de
+atributos a todos los suscriptores.
+"""
+import time
+import logging
+from collections import namedtuple
+import psutil
+
+logger = logging.getLogger(__name__)
+
+# procs: objetos psutil.Process del recorrido (con `info` rellenado)
+# snapshot: lista de `proc.info`; processes: pid → info
+# started / exited: listas de info (el de `exited` es el último conocido)
+# changed: lista de (info, {atributo: (antes, ahora)})
+ProcessEvents = namedtuple(
+    "ProcessEvents",
+    ["procs", "snapshot", "processes", "started", "exited", "changed", "now"]
+)
+
+# Atributos que generan evento de cambio: exactos o con umbral de variación
+CHANGE_ATTRS = ("name", "exe")
+CHANGE_THRESHOLDS = {"cpu_percent": 10.0, "memory_percent": 1.0}
+
+
+class ProcessWatch:
+    """
+    Un recorrido por tick es la fuente más barata disponible: las pestañas
+    necesitan igualmente las métricas de todos los procesos, así que las
+    notificaciones del sistema (WMI, ETW, netlink) no ahorrarían el
+    recorrido y exigen privilegios o dependencias extra.
+
+    Los PIDs reutilizados (mismo PID, distinto `create_time`) se publican
+    como un final seguido de un inicio.
+    """
+    def __init__(self, attrs, change_attrs=CHANGE_ATTRS, thresholds=None):
+        attrs = list(attrs)
+        for attr in ("pid", "create_time", *change_attrs):
+            if attr not in attrs:
+                attrs.append(attr)
+        self.attrs = attrs
+        self.change_attrs = change_attrs
+        self.thresholds = dict(CHANGE_THRESHOLDS if thresholds is None else thresholds)
+        self.processes = {}
+        self._reference = {}
+        self._subscribers = []
+
+    def subscribe(self, callback):
+        """Registra `callback(events)`; se llama en el hilo que ejecuta `poll`."""
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        """Elimina un suscriptor."""
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    def _changes(self, info):
+        """Atributos que cambiaron respecto a la última referencia publicada."""
+        reference = self._reference[info['pid']]
+        changes = {}
+        for attr in self.change_attrs:
+            if info.get(attr) != reference.get(attr):
+                changes[attr] = (reference.get(attr), info.get(attr))
+        for attr, threshold in self.thresholds.items():
+            old, new = reference.get(attr) or 0.0, info.get(attr) or 0.0
+            if abs(new - old) >= threshold:
+                changes[attr] = (old, new)
+        if changes:
+            reference.update({attr: new for attr, (_, new) in changes.items()})
+        return changes
+
+    def _remember(self, info):
+        """Guarda los valores de referencia para detectar cambios."""
+        self._reference[info['pid']] = {
+            attr: info.get(attr) for attr in (*self.change_attrs, *self.thresholds)
+        }
+
+    def poll(self, now=None):
+        """Recorre los procesos, calcula el diff y lo publica. Devuelve los eventos."""
+        now = time.monotonic() if now is None else now
+        procs = []
+        snapshot = []
+        processes = {}
+        started = []
+        exited = []
+        changed = []
+
+        for proc in psutil.process_iter(self.attrs):
+            info = proc.info
+            pid = info['pid']
+            procs.append(proc)
+            snapshot.append(info)
+            processes[pid] = info
+
+            previous = self.processes.get(pid)
+            if previous is None:
+                started.append(info)
+                self._remember(info)
+            elif previous['create_time'] != info['create_time']:
+                exited.append(previous)
+                started.append(info)
+                self._remember(info)
+            else:
+                changes = self._changes(info)
+                if changes:
+                    changed.append((info, changes))
+
+        for pid, info in self.processes.items():
+            if pid not in processes:
+                exited.append(info)
+                self._reference.pop(pid, None)
+
+        self.processes = processes
+        events = ProcessEvents(procs, snapshot, processes, started, exited, changed, now)
+        for callback in list(self._subscribers):
+            try:
+                callback(events)
+            # pylint: disable=broad-exception-caught
+            except Exception:
+                logger.exception("Error en un suscriptor de ProcessWatch")
+        return events
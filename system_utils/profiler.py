@@ -0,0 +1,173 @@
+"""
+profiler.py
+Instrumentación ligera del propio SystemManager: tiempo real, tiempo
+de CPU y número de llamadas por ruta en histogramas, más captura
+cProfile bajo demanda de los próximos N ticks.
+"""
+import os
+import io
+import time
+import logging
+import cProfile
+import pstats
+import functools
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Cubetas log2 en microsegundos: [0-1), [1-2), [2-4) ... hasta ~16 s
+BUCKETS = 25
+
+
+class Histogram:
+    """Histograma logarítmico de duraciones."""
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self):
+        self.counts = [0] * BUCKETS
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds):
+        """Registra una duración en segundos."""
+        micros = int(seconds * 1_000_000)
+        self.counts[min(BUCKETS - 1, micros.bit_length())] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, pct):
+        """Cota superior (segundos) del percentil indicado."""
+        if not self.count:
+            return 0.0
+        target = self.count * pct / 100
+        seen = 0
+        for bucket, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return min(self.max, (1 << bucket) / 1_000_000)
+        return self.max
+
+    @property
+    def mean(self):
+        """Duración media en segundos."""
+        return self.total / self.count if self.count else 0.0
+
+
+class PathStats:
+    """Estadísticas de una ruta instrumentada."""
+    __slots__ = ("wall", "cpu_total")
+
+    def __init__(self):
+        self.wall = Histogram()
+        self.cpu_total = 0.0
+
+
+class Profiler:
+    """Registro global de rutas instrumentadas."""
+    def __init__(self):
+        self.paths = {}
+        self._lock = threading.Lock()
+        self._capture = None
+        self._capture_left = 0
+        self._capture_file = None
+        self._depth = 0
+
+    def record(self, name, wall, cpu):
+        """Agrega una medición."""
+        with self._lock:
+            stats = self.paths.get(name)
+            if stats is None:
+                stats = self.paths[name] = PathStats()
+            stats.wall.add(wall)
+            stats.cpu_total += cpu
+
+    def instrument(self, name):
+        """Decorador que mide cada llamada de la función."""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                # Solo la llamada más externa del hilo principal cuenta como tick
+                capture = self._capture
+                if (capture is None or self._depth
+                        or threading.current_thread() is not threading.main_thread()):
+                    capture = None
+                else:
+                    capture.enable()
+                self._depth += capture is not None
+                wall0 = time.perf_counter()
+                cpu0 = time.thread_time()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.record(name, time.perf_counter() - wall0, time.thread_time() - cpu0)
+                    if capture is not None:
+                        self._depth -= 1
+                        capture.disable()
+                        self._tick_captured()
+            return wrapper
+        return decorator
+
+    def start_capture(self, ticks, path):
+        """Perfila con cProfile las próximas `ticks` llamadas instrumentadas."""
+        self._capture_file = path
+        self._capture_left = max(1, ticks)
+        self._capture = cProfile.Profile()
+
+    def _tick_captured(self):
+        """Cuenta un tick capturado y vuelca el perfil al terminar."""
+        self._capture_left -= 1
+        if self._capture_left > 0:
+            return
+        capture, self._capture = self._capture, None
+        try:
+            capture.dump_stats(self._capture_file)
+            text = io.StringIO()
+            pstats.Stats(capture, stream=text).sort_stats("cumulative").print_stats(40)
+            with open(os.path.splitext(self._capture_file)[0] + ".txt", "w",
+                      encoding="utf-8") as f:
+                f.write(text.getvalue())
+            logger.info("Perfil cProfile guardado en %s", self._capture_file)
+        # pylint: disable=broad-exception-caught
+        except Exception as e:
+            logger.error("No se pudo guardar el perfil: %s", e)
+
+    @property
+    def capturing(self):
+        """Indica si hay una captura cProfile en curso."""
+        return self._capture is not None
+
+    def snapshot(self):
+        """
+        Devuelve una lista de dicts por ruta (ms), ordenada de la más lenta
+        (p95) a la más rápida.
+        """
+        with self._lock:
+            rows = [
+                {
+                    "name": name,
+                    "count": stats.wall.count,
+                    "mean_ms": stats.wall.mean * 1000,
+                    "p95_ms": stats.wall.percentile(95) * 1000,
+                    "max_ms": stats.wall.max * 1000,
+                    "cpu_ms": stats.cpu_total * 1000,
+                }
+                for name, stats in self.paths.items()
+            ]
+        return sorted(rows, key=lambda row: row["p95_ms"], reverse=True)
+
+    def report(self):
+        """Resumen en texto de todas las rutas."""
+        lines = [f"{'Ruta':34} {'llam.':>6} {'media':>8} {'p95':>8} {'máx':>8} {'CPU':>9}"]
+        for row in self.snapshot():
+            lines.append(
+                f"{row['name'][:34]:34} {row['count']:6d} {row['mean_ms']:7.2f}ms "
+                f"{row['p95_ms']:7.2f}ms {row['max_ms']:7.2f}ms {row['cpu_ms']:8.0f}ms"
+            )
+        return "\n".join(lines)
+
+
+PROFILER = Profiler()
+instrument = PROFILER.instrument
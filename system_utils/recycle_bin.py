@@ -0,0 +1,42 @@
+"""recycle_bin.py"""
+import subprocess
+
+COUNT_SCRIPT = r"""
+$shell = New-Object -ComObject Shell.Application
+$recycleBin = $shell.NameSpace(10)
+$itemCount = $recycleBin.Items().Count
+Write-Output $itemCount
+"""
+
+
+def empty_recycle_bin():
+    """
+    Vacía la papelera de reciclaje.
+    Retorna (ok, mensaje) con el resultado.
+    """
+    try:
+        # Verificar si hay elementos
+        # pylint: disable=subprocess-run-check
+        result = subprocess.run(
+            ["powershell", "-ExecutionPolicy", "Bypass", "-Command", COUNT_SCRIPT],
+            capture_output=True, text=True, encoding="utf-8"
+        )
+        item_count = result.stdout.strip()
+
+        if item_count == "0":
+            return True, "La papelera de reciclaje ya está vacía."
+
+        # Vaciar la papelera
+        # pylint: disable=subprocess-run-check
+        subprocess.run(
+            ["powershell", "-ExecutionPolicy", "Bypass", "-Command",
+             "Clear-RecycleBin -Force -Confirm:$false -ErrorAction SilentlyContinue"],
+            capture_output=True, text=True, encoding="utf-8"
+        )
+        return True, (
+            f"Papelera de reciclaje vaciada correctamente ({item_count}"
+            " elementos eliminados)."
+        )
+    # pylint: disable=broad-exception-caught
+    except Exception as e:
+        return False, f"Error vaciando papelera: {e}"
@@ -0,0 +1,183 @@
+"""
+runaway_detector.py
+Detector de procesos desbocados: mantiene líneas base EWMA de CPU,
+crecimiento de memoria y E/S por proceso en arreglos NumPy y marca
+los procesos que las superan (o superan umbrales absolutos) de forma
+sostenida.
+"""
+import logging
+from collections import namedtuple
+import numpy as np
+import psutil
+
+logger = logging.getLogger(__name__)
+
+RunawayAlert = namedtuple(
+    "RunawayAlert", ["pid", "reason", "cpu", "mem_growth", "io_rate", "duration"]
+)
+
+
+class RunawayDetector:
+    """
+    Estado compacto por proceso en arreglos indexados por ranura.
+    Cada `update` procesa todos los procesos con operaciones vectorizadas.
+    """
+    # pylint: disable=too-many-instance-attributes,too-many-arguments
+    def __init__(self, alpha=0.05, factor=3.0, sustain=60.0, warmup=10,
+                 cpu_abs=90.0, mem_growth_abs=5 * 1024 * 1024,
+                 io_abs=50 * 1024 * 1024, capacity=1024, ncpu=None):
+        self.alpha = alpha
+        self.factor = factor
+        self.sustain = sustain
+        self.warmup = warmup
+        # La CPU se compara en % de la CPU total, como en el limitador de
+        # CpuThrottler: un programa de un solo hilo no llena un equipo de 16 núcleos
+        self.ncpu = ncpu or psutil.cpu_count() or 1
+        # Umbrales absolutos: % de la CPU total, bytes/s de crecimiento, bytes/s de E/S
+        self.cpu_abs = cpu_abs
+        self.mem_growth_abs = mem_growth_abs
+        self.io_abs = io_abs
+        # Márgenes mínimos sobre la línea base para evitar ruido en procesos inactivos
+        # (el de CPU equivale al 10 % de un núcleo)
+        self.cpu_margin = 10.0 / self.ncpu
+        self.mem_margin = 256 * 1024
+        self.io_margin = 1024 * 1024
+
+        self._slots = {}
+        self._free = []
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        """Crea (o amplía) los arreglos de estado."""
+        old = getattr(self, "_capacity", 0)
+        self._capacity = capacity
+
+        def grow(name, dtype, fill):
+            arr = np.full(capacity, fill, dtype=dtype)
+            if old:
+                arr[:old] = getattr(self, name)
+            setattr(self, name, arr)
+
+        grow("create_time", np.float64, np.nan)
+        grow("last_t", np.float64, np.nan)
+        grow("last_rss", np.float64, 0.0)
+        grow("last_io", np.float64, 0.0)
+        grow("cpu_base", np.float32, 0.0)
+        grow("mem_base", np.float32, 0.0)
+        grow("io_base", np.float32, 0.0)
+        grow("samples", np.int32, 0)
+        grow("over_since", np.float64, np.nan)
+        grow("flagged", np.bool_, False)
+        self._free.extend(range(capacity - 1, old - 1, -1))
+
+    def _slot(self, pid, create_time):
+        """Devuelve la ranura de un PID, reutilizando ranuras libres."""
+        slot = self._slots.get(pid)
+        if slot is not None and self.create_time[slot] == create_time:
+            return slot
+        if slot is None:
+            if not self._free:
+                self._allocate(self._capacity * 2)
+            slot = self._free.pop()
+            self._slots[pid] = slot
+        self._reset(slot, create_time)
+        return slot
+
+    def _reset(self, slot, create_time):
+        """Inicializa una ranura para un proceso nuevo."""
+        self.create_time[slot] = create_time
+        self.last_t[slot] = np.nan
+        self.cpu_base[slot] = 0.0
+        self.mem_base[slot] = 0.0
+        self.io_base[slot] = 0.0
+        self.samples[slot] = 0
+        self.over_since[slot] = np.nan
+        self.flagged[slot] = False
+
+    # pylint: disable=too-many-locals
+    def update(self, pids, create_times, cpu, rss, io_bytes, now):
+        """
+        Procesa una muestra de todos los procesos (secuencias alineadas)
+        y devuelve las alertas nuevas como lista de RunawayAlert. `cpu` va
+        en % de un núcleo (psutil); las alertas lo dan en % del total.
+        """
+        slots = np.fromiter(
+            (self._slot(pid, ct or 0.0) for pid, ct in zip(pids, create_times)),
+            dtype=np.intp, count=len(pids)
+        )
+        cpu = np.asarray(cpu, dtype=np.float64) / self.ncpu
+        rss = np.asarray(rss, dtype=np.float64)
+        io_bytes = np.asarray(io_bytes, dtype=np.float64)
+
+        dt = now - self.last_t[slots]
+        valid = dt > 0  # NaN (primera muestra) queda en False
+        safe_dt = np.where(valid, dt, 1.0)
+        mem_growth = np.where(valid, (rss - self.last_rss[slots]) / safe_dt, 0.0)
+        io_rate = np.where(valid, (io_bytes - self.last_io[slots]) / safe_dt, 0.0)
+
+        warm = self.samples[slots] >= self.warmup
+        cpu_over = (cpu > self.cpu_abs) | (
+            warm & (cpu > self.cpu_base[slots] * self.factor + self.cpu_margin))
+        mem_over = valid & ((mem_growth > self.mem_growth_abs) | (
+            warm & (mem_growth > self.mem_base[slots] * self.factor + self.mem_margin)))
+        io_over = valid & ((io_rate > self.io_abs) | (
+            warm & (io_rate > self.io_base[slots] * self.factor + self.io_margin)))
+        over = cpu_over | mem_over | io_over
+
+        # La línea base solo se mueve mientras el proceso está en rango
+        calm = valid & ~over
+        calm_slots = slots[calm]
+        a = self.alpha
+        self.cpu_base[calm_slots] += a * (cpu[calm] - self.cpu_base[calm_slots])
+        self.mem_base[calm_slots] += a * (
+            np.maximum(mem_growth[calm], 0.0) - self.mem_base[calm_slots])
+        self.io_base[calm_slots] += a * (io_rate[calm] - self.io_base[calm_slots])
+        self.samples[slots[valid]] += 1
+
+        over_since = self.over_since[slots]
+        over_since = np.where(over, np.where(np.isnan(over_since), now, over_since), np.nan)
+        self.over_since[slots] = over_since
+        duration = np.where(over, now - over_since, 0.0)
+
+        flagged = self.flagged[slots]
+        new_alerts = over & (duration >= self.sustain) & ~flagged
+        self.flagged[slots] = np.where(over, flagged | new_alerts, False)
+
+        self.last_t[slots] = now
+        self.last_rss[slots] = rss
+        self.last_io[slots] = io_bytes
+
+        self._evict(set(pids))
+
+        alerts = []
+        for i in np.flatnonzero(new_alerts):
+            reasons = []
+            if cpu_over[i]:
+                reasons.append("CPU")
+            if mem_over[i]:
+                reasons.append("memoria")
+            if io_over[i]:
+                reasons.append("E/S")
+            alert = RunawayAlert(
+                pids[i], ", ".join(reasons), float(cpu[i]),
+                float(mem_growth[i]), float(io_rate[i]), float(duration[i])
+            )
+            logger.warning(
+                "Proceso desbocado PID %s (%s): CPU %.1f%% del total, memoria %+.1f KB/s, "
+                "E/S %.1f KB/s durante %.0f s", alert.pid, alert.reason, alert.cpu,
+                alert.mem_growth / 1024, alert.io_rate / 1024, alert.duration
+            )
+            alerts.append(alert)
+        return alerts
+
+    def _evict(self, alive):
+        """Libera las ranuras de los procesos que ya no existen."""
+        if len(alive) == len(self._slots):
+            return
+        for pid in [pid for pid in self._slots if pid not in alive]:
+            slot = self._slots.pop(pid)
+            self.create_time[slot] = np.nan
+            self._free.append(slot)
+
+    def __len__(self):
+        return len(self._slots)
@@ -0,0 +1,240 @@
+"""
+services.py
+Servicios del sistema con el uso de recursos de sus procesos anfitriones.
+La lista de servicios la da un backend (Windows, systemd o uno falso para
+pruebas) y se refresca en segundo plano; la CPU y la memoria se atribuyen
+con el recorrido de procesos que ya hizo ProcessWatch, sin otro recorrido.
+"""
+import os
+import sys
+import time
+import shutil
+import logging
+import subprocess
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+import psutil
+
+logger = logging.getLogger(__name__)
+
+# pids: procesos que ejecutan el servicio (vacío si está detenido)
+ServiceInfo = namedtuple(
+    "ServiceInfo", ["name", "display_name", "status", "start_type", "pids"]
+)
+# shared: número máximo de servicios que comparten alguno de sus procesos
+ServiceUsage = namedtuple("ServiceUsage", ["cpu", "rss", "shared", "hosts"])
+
+STATUS_LABELS = {
+    # Windows
+    "running": "En ejecución", "stopped": "Detenido", "paused": "En pausa",
+    "start_pending": "Iniciando", "stop_pending": "Deteniendo",
+    "continue_pending": "Reanudando", "pause_pending": "Pausando",
+    # systemd
+    "active": "En ejecución", "inactive": "Detenido", "failed": "Error",
+    "activating": "Iniciando", "deactivating": "Deteniendo", "reloading": "Recargando",
+}
+
+START_TYPE_LABELS = {
+    # Windows
+    "automatic": "Automático", "manual": "Manual", "disabled": "Deshabilitado",
+    # systemd
+    "enabled": "Automático", "enabled-runtime": "Automático", "static": "Estático",
+    "indirect": "Indirecto", "generated": "Generado", "masked": "Bloqueado",
+    "alias": "Alias", "transient": "Temporal",
+}
+
+
+def _label(labels, value):
+    """Etiqueta en español o el valor original si no se conoce."""
+    return labels.get(value, value or "")
+
+
+class ServiceBackend:
+    """Interfaz de las fuentes de servicios."""
+    name = ""
+
+    def list_services(self):
+        """Lista de ServiceInfo (operación lenta: se llama fuera de la interfaz)."""
+        raise NotImplementedError
+
+
+class WindowsServiceBackend(ServiceBackend):
+    """
+    Servicios del SCM mediante psutil. El tipo de inicio (una consulta de
+    configuración por servicio) se vuelve a leer cada `config_every` s.
+    """
+    name = "Windows"
+
+    def __init__(self, config_every=60.0):
+        self.config_every = config_every
+        self._start_types = {}
+        self._config_at = None
+
+    def list_services(self):
+        now = time.monotonic()
+        reload_config = self._config_at is None or now - self._config_at > self.config_every
+        if reload_config:
+            self._config_at = now
+        services = []
+        # pylint: disable=no-member
+        for service in psutil.win_service_iter():
+            try:
+                name = service.name()
+                if reload_config or name not in self._start_types:
+                    self._start_types[name] = service.start_type()
+                status = service.status()
+                pid = service.pid() if status != "stopped" else None
+            # pylint: disable=broad-exception-caught
+            except Exception:
+                continue
+            services.append(ServiceInfo(
+                name, service.display_name(), _label(STATUS_LABELS, status),
+                _label(START_TYPE_LABELS, self._start_types[name]),
+                (pid,) if pid else ()
+            ))
+        return services
+
+
+class SystemdServiceBackend(ServiceBackend):
+    """
+    Unidades .service de systemd. Cada unidad tiene su propio cgroup, así
+    que los procesos se reparten por servicio de forma exacta.
+    """
+    name = "systemd"
+    PROPERTIES = "Id,Description,ActiveState,UnitFileState,MainPID,ControlGroup"
+    CGROUP_ROOTS = ("/sys/fs/cgroup", "/sys/fs/cgroup/systemd")
+
+    @staticmethod
+    def _systemctl(*args):
+        result = subprocess.run(
+            ["systemctl", "--no-pager", *args],
+            capture_output=True, text=True, check=False, timeout=20
+        )
+        return result.stdout
+
+    def _cgroup_pids(self, cgroup, main_pid):
+        """PIDs del cgroup de la unidad (v2 o v1); el MainPID si no se puede leer."""
+        if cgroup:
+            for root in self.CGROUP_ROOTS:
+                try:
+                    with open(root + cgroup + "/cgroup.procs", "r", encoding="ascii") as f:
+                        return tuple(int(line) for line in f if line.strip())
+                except (OSError, ValueError):
+                    continue
+        return (main_pid,) if main_pid else ()
+
+    def list_services(self):
+        units = [
+            line.split()[0] for line in self._systemctl(
+                "list-units", "--type=service", "--all", "--no-legend", "--plain"
+            ).splitlines() if line.strip()
+        ]
+        if not units:
+            return []
+
+        services = []
+        block = {}
+        output = self._systemctl("show", "-p", self.PROPERTIES, *units)
+        for line in output.splitlines() + [""]:
+            if line.strip():
+                key, _, value = line.partition("=")
+                block[key] = value
+                continue
+            if block.get("Id"):
+                main_pid = int(block.get("MainPID") or 0)
+                services.append(ServiceInfo(
+                    block["Id"], block.get("Description", ""),
+                    _label(STATUS_LABELS, block.get("ActiveState")),
+                    _label(START_TYPE_LABELS, block.get("UnitFileState")),
+                    self._cgroup_pids(block.get("ControlGroup"), main_pid)
+                ))
+            block = {}
+        return services
+
+
+def default_backend():
+    """Backend de la plataforma actual, o None si no hay ninguno disponible."""
+    if sys.platform == "win32":
+        return WindowsServiceBackend()
+    if shutil.which("systemctl") and os.path.isdir("/run/systemd/system"):
+        return SystemdServiceBackend()
+    return None
+
+
+def attribute_usage(services, processes):
+    """
+    {nombre: ServiceUsage} a partir de la instantánea pid → info. Los
+    procesos que alojan varios servicios (svchost compartido) se reparten
+    a partes iguales entre ellos; `shared` indica que el valor es estimado.
+    """
+    owners = {}
+    for service in services:
+        for pid in service.pids:
+            owners[pid] = owners.get(pid, 0) + 1
+
+    usage = {}
+    for service in services:
+        cpu = rss = 0.0
+        shared = 1
+        hosts = []
+        for pid in service.pids:
+            info = processes.get(pid)
+            if info is None:
+                continue
+            count = owners[pid]
+            shared = max(shared, count)
+            mem = info.get('memory_info')
+            cpu += (info.get('cpu_percent') or 0.0) / count
+            rss += (mem.rss if mem else 0) / count
+            hosts.append(info.get('name') or str(pid))
+        usage[service.name] = ServiceUsage(cpu, rss, shared, hosts)
+    return usage
+
+
+class ServiceCatalog:
+    """
+    Última lista de servicios del backend. `services()` no bloquea: lanza
+    una actualización en un hilo si la lista tiene más de `refresh` s y
+    devuelve la que haya mientras tanto.
+    """
+    def __init__(self, backend, refresh=10.0):
+        self.backend = backend
+        self.refresh = refresh
+        self.error = None
+        self._services = []
+        self._loaded_at = None
+        self._future = None
+        self._pool = ThreadPoolExecutor(max_workers=1)
+
+    @property
+    def loaded(self):
+        """True cuando ya hay una lista (aunque sea vacía)."""
+        return self._loaded_at is not None
+
+    def services(self, now=None):
+        """Lista vigente de ServiceInfo."""
+        now = time.monotonic() if now is None else now
+        if self._future is not None and self._future.done():
+            try:
+                self._services = self._future.result()
+                self.error = None
+            # pylint: disable=broad-exception-caught
+            except Exception as e:
+                logger.warning("No se pudo leer la lista de servicios: %s", e)
+                self.error = str(e)
+            self._loaded_at = now
+            self._future = None
+        stale = self._loaded_at is None or now - self._loaded_at > self.refresh
+        if stale and self._future is None:
+            self._future = self._pool.submit(self.backend.list_services)
+        return self._services
+
+    def reload(self, now=None):
+        """Recarga la lista en el hilo actual (bloquea)."""
+        self._services = self.backend.list_services()
+        self._loaded_at = time.monotonic() if now is None else now
+        return self._services
+
+    def stop(self):
+        """Libera el hilo de actualización."""
+        self._pool.shutdown(wait=False)
@@ -0,0 +1,139 @@
+"""
+startup_impact.py
+Impacto real de los programas de inicio: suscriptor de ProcessWatch que
+mide la CPU y el disco de los procesos lanzados durante el arranque y
+guarda la medición por ejecutable para la pestaña de Inicio.
+"""
+import os
+import json
+import time
+import logging
+import psutil
+
+logger = logging.getLogger(__name__)
+
+IMPACT_FILE = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), "startup_impact.json"
+    )
+
+# Mismos umbrales que el Administrador de tareas: CPU en s, disco en bytes
+HIGH_CPU, HIGH_DISK = 1.0, 3 * 1024 * 1024
+MEDIUM_CPU, MEDIUM_DISK = 0.3, 300 * 1024
+
+
+def classify_impact(cpu_seconds, disk_bytes):
+    """Nivel de impacto a partir de la CPU y el disco consumidos."""
+    if cpu_seconds > HIGH_CPU or disk_bytes > HIGH_DISK:
+        return "Alto"
+    if cpu_seconds > MEDIUM_CPU or disk_bytes > MEDIUM_DISK:
+        return "Medio"
+    return "Bajo"
+
+
+def _key(path):
+    """Clave normalizada de un ejecutable."""
+    return os.path.normcase(os.path.normpath(path)).lower()
+
+
+def _usage(info):
+    """(segundos de CPU, bytes de disco) acumulados por un proceso."""
+    times = info.get('cpu_times')
+    io = info.get('io_counters')
+    cpu = times.user + times.system if times else 0.0
+    disk = io.read_bytes + io.write_bytes if io else 0
+    return cpu, disk
+
+
+class StartupImpactTracker:
+    """
+    Los procesos creados en los primeros `boot_window` segundos tras el
+    arranque se siguen durante `measure` segundos desde su creación. Los
+    que ya llevaban más tiempo al abrir SystemManager no se miden: sus
+    contadores acumulados incluirían todo lo que han hecho después del
+    arranque.
+    """
+    def __init__(self, boot_window=180.0, measure=60.0, boot_time=None,
+                 impact_file=IMPACT_FILE):
+        self.boot_window = boot_window
+        self.measure = measure
+        self.boot_time = psutil.boot_time() if boot_time is None else boot_time
+        self.impact_file = impact_file
+        self.pending = {}
+        self.results = self.load()
+        # Se llama tras guardar mediciones nuevas (p. ej. para refrescar la interfaz)
+        self.on_update = None
+
+    def load(self):
+        """Carga las mediciones guardadas (ruta en minúsculas → datos)."""
+        if os.path.exists(self.impact_file):
+            try:
+                with open(self.impact_file, "r", encoding="utf-8") as f:
+                    return json.load(f)
+            # pylint: disable=broad-exception-caught
+            except Exception:
+                return {}
+        return {}
+
+    def save(self):
+        """Guarda las mediciones."""
+        try:
+            with open(self.impact_file, "w", encoding="utf-8") as f:
+                json.dump(self.results, f, indent=4, ensure_ascii=False)
+        # pylint: disable=broad-exception-caught
+        except Exception as e:
+            logger.warning("No se pudo guardar el impacto de inicio: %s", e)
+
+    def on_process_events(self, events):
+        """Suscriptor de ProcessWatch."""
+        wall = time.time()
+        for info in events.started:
+            create_time = info.get('create_time')
+            if info.get('exe') and create_time and \
+                    0 <= create_time - self.boot_time <= self.boot_window and \
+                    wall - create_time < self.measure:
+                self.pending[info['pid']] = info
+
+        finished = False
+        for pid, first in list(self.pending.items()):
+            info = events.processes.get(pid)
+            if info is not None and info['create_time'] == first['create_time']:
+                self.pending[pid] = info
+                if wall - info['create_time'] < self.measure:
+                    continue
+            # Terminado, reutilizado o fuera de la ventana: cerrar la medición
+            last = self.pending.pop(pid)
+            self.record(last)
+            finished = True
+        if finished:
+            self.save()
+            if self.on_update is not None:
+                self.on_update()
+
+    def record(self, info):
+        """Acumula la medición de un proceso en la entrada de su ejecutable."""
+        cpu, disk = _usage(info)
+        key = _key(info['exe'])
+        entry = self.results.get(key)
+        if entry is None or entry.get("boot_time") != self.boot_time:
+            entry = {"boot_time": self.boot_time, "cpu": 0.0, "disk": 0, "processes": []}
+            self.results[key] = entry
+        # Si SystemManager se reinicia en la misma sesión no se cuenta dos veces
+        process_id = f"{info['pid']}:{info['create_time']}"
+        if process_id in entry["processes"]:
+            return
+        entry["processes"].append(process_id)
+        entry["cpu"] += cpu
+        entry["disk"] += disk
+
+    def impact(self, path):
+        """(nivel, detalle) medidos para un ejecutable, o None si no hay datos."""
+        if not path:
+            return None
+        entry = self.results.get(_key(path))
+        if entry is None:
+            return None
+        detail = (
+            f"CPU {entry['cpu'] * 1000:.0f} ms, disco {entry['disk'] / (1024 * 1024):.1f} MB "
+            f"({len(entry['processes'])} proceso(s) en el último arranque medido)"
+        )
+        return classify_impact(entry["cpu"], entry["disk"]), detail
@@ -0,0 +1,73 @@
+"""
+temp_cleaner.py
+Limpieza de archivos temporales como generador, para poder ejecutarla
+de una vez (botón) o por pasos con pausas (mantenimiento en reposo).
+"""
+import os
+import shutil
+import tempfile
+
+
+def temp_dirs():
+    """Carpetas temporales a limpiar."""
+    return [
+        tempfile.gettempdir(),
+        r"C:\Windows\Temp",
+        os.path.expandvars(r"%LocalAppData%\Temp"),
+        os.path.expandvars(r"%AppData%\Temp"),
+    ]
+
+
+class CleanResult:
+    """Resultado acumulado de una limpieza."""
+    def __init__(self):
+        self.deleted = 0
+        self.failed = 0
+        self.failed_paths = []
+
+    def __str__(self):
+        return f"Eliminados: {self.deleted} | No eliminados: {self.failed}"
+
+
+def iter_clean_temp(folders=None, step=200):
+    """
+    Borra los temporales y cede el control cada `step` elementos.
+    El valor de retorno (StopIteration.value) es un CleanResult.
+    """
+    result = CleanResult()
+    pending = 0
+    for folder in folders or temp_dirs():
+        if os.path.exists(folder):
+            for root, dirs, files in os.walk(folder, topdown=False):
+                for f in files:
+                    path = os.path.join(root, f)
+                    try:
+                        os.remove(path)
+                        result.deleted += 1
+                    # pylint: disable=broad-exception-caught
+                    except Exception:
+                        result.failed += 1
+                        result.failed_paths.append(path)
+                    pending += 1
+                    if pending >= step:
+                        pending = 0
+                        yield result
+                for d in dirs:
+                    path = os.path.join(root, d)
+                    try:
+                        shutil.rmtree(path, ignore_errors=True)
+                    # pylint: disable=broad-exception-caught
+                    except Exception:
+                        result.failed += 1
+                        result.failed_paths.append(path)
+    return result
+
+
+def clean_temp(folders=None):
+    """Ejecuta la limpieza completa y devuelve el CleanResult."""
+    gen = iter_clean_temp(folders)
+    while True:
+        try:
+            next(gen)
+        except StopIteration as stop:
+            return stop.value
@@ -0,0 +1,206 @@
+"""
+throttle_detector.py
+Detección de limitación térmica o de energía: compara la frecuencia por
+núcleo con su máximo mientras hay carga y abre un episodio cuando la
+caída se sostiene, anotando temperatura y estado de la batería.
+"""
+import time
+import logging
+from collections import namedtuple, deque
+import numpy as np
+import psutil
+
+logger = logging.getLogger(__name__)
+
+# load/freq/max_freq: listas por núcleo (% y MHz); temps: {sensor: (°C, umbral)}
+# battery: (porcentaje, enchufado) o None
+SensorReading = namedtuple(
+    "SensorReading", ["time", "load", "freq", "max_freq", "temps", "battery"]
+)
+
+
+class PsutilSensorSource:
+    """
+    Lee los sensores con psutil. La carga por núcleo se calcula con sus
+    propios `cpu_times` para no interferir con otros usuarios de
+    `cpu_percent`.
+    """
+    def __init__(self):
+        self.ncores = psutil.cpu_count(logical=True) or 1
+        self._last_times = psutil.cpu_times(percpu=True)
+
+    def loads(self):
+        """% de uso por núcleo desde la lectura anterior."""
+        times = psutil.cpu_times(percpu=True)
+        loads = []
+        for old, new in zip(self._last_times, times):
+            total = sum(new) - sum(old)
+            idle = (new.idle - old.idle) + (getattr(new, "iowait", 0) - getattr(old, "iowait", 0))
+            loads.append(100.0 * (1 - idle / total) if total > 0 else 0.0)
+        self._last_times = times
+        return loads
+
+    def freqs(self):
+        """Frecuencia actual y máxima por núcleo (listas vacías si no hay dato)."""
+        try:
+            freqs = psutil.cpu_freq(percpu=True) or []
+        # pylint: disable=broad-exception-caught
+        except Exception:
+            freqs = []
+        if len(freqs) == 1 and self.ncores > 1:
+            # Algunas plataformas solo informan una frecuencia global
+            freqs = freqs * self.ncores
+        return [f.current for f in freqs], [f.max for f in freqs]
+
+    @staticmethod
+    def _temps():
+        """Temperaturas disponibles; en Windows psutil no las expone."""
+        sensors = getattr(psutil, "sensors_temperatures", None)
+        if sensors is None:
+            return {}
+        try:
+            data = sensors() or {}
+        # pylint: disable=broad-exception-caught
+        except Exception:
+            return {}
+        temps = {}
+        for chip, entries in data.items():
+            for i, entry in enumerate(entries):
+                label = f"{chip}/{entry.label or i}"
+                temps[label] = (entry.current, entry.high or entry.critical)
+        return temps
+
+    @staticmethod
+    def _battery():
+        """(porcentaje, enchufado) o None en equipos sin batería."""
+        sensors = getattr(psutil, "sensors_battery", None)
+        try:
+            battery = sensors() if sensors else None
+        # pylint: disable=broad-exception-caught
+        except Exception:
+            battery = None
+        if battery is None:
+            return None
+        return battery.percent, battery.power_plugged
+
+    def read(self, now=None):
+        """Toma una lectura completa."""
+        freq, max_freq = self.freqs()
+        return SensorReading(
+            time.monotonic() if now is None else now,
+            self.loads(), freq, max_freq, self._temps(), self._battery()
+        )
+
+
+# pylint: disable=too-few-public-methods,too-many-instance-attributes
+class ThrottleEpisode:
+    """Periodo con la frecuencia por debajo de lo esperado bajo carga."""
+    def __init__(self, start, ratio, temp, cause, wall_start=None):
+        self.start = start
+        self.wall_start = time.time() if wall_start is None else wall_start
+        self.end = None
+        self.min_ratio = ratio
+        self.max_temp = temp
+        self.cause = cause
+
+    def duration(self, now):
+        """Duración en segundos (hasta `now` si sigue abierto)."""
+        return (self.end if self.end is not None else now) - self.start
+
+
+class ThrottleDetector:
+    """
+    Usa como referencia el máximo entre la frecuencia máxima informada y el
+    pico observado por núcleo (el turbo supera a menudo la "máxima").
+    Un episodio empieza tras `sustain` s con los núcleos cargados por debajo
+    de `drop_ratio` y termina tras `recover` s sin esa condición.
+    """
+    # pylint: disable=too-many-arguments
+    def __init__(self, drop_ratio=0.75, load_min=60.0, sustain=10.0, recover=5.0,
+                 temp_high=90.0, history=50):
+        self.drop_ratio = drop_ratio
+        self.load_min = load_min
+        self.sustain = sustain
+        self.recover = recover
+        self.temp_high = temp_high
+        self.peak = None
+        self.ratio = None
+        self.temp = None
+        self.on_battery = False
+        self.current = None
+        self.episodes = deque(maxlen=history)
+        self._below_since = None
+        self._above_since = None
+
+    def cause(self, temps, battery):
+        """Causa probable según temperatura y alimentación."""
+        if any(current >= (high or self.temp_high) for current, high in temps.values()):
+            return "Térmica"
+        if battery is not None and not battery[1]:
+            return "Energía (batería)"
+        return "Límite de potencia o firmware"
+
+    def update(self, reading):
+        """
+        Procesa una lectura. Devuelve ("inicio"|"fin", episodio) cuando cambia
+        el estado, o None.
+        """
+        now = reading.time
+        self.temp = max((t for t, _ in reading.temps.values()), default=None)
+        self.on_battery = reading.battery is not None and not reading.battery[1]
+        if not reading.freq:
+            self.ratio = None
+            return None
+
+        freq = np.asarray(reading.freq, dtype=np.float64)
+        self.peak = freq if self.peak is None or len(self.peak) != len(freq) \
+            else np.maximum(self.peak, freq)
+        reference = np.maximum(np.asarray(reading.max_freq, dtype=np.float64), self.peak)
+        loads = np.asarray(reading.load[:len(freq)], dtype=np.float64)
+        busy = (loads >= self.load_min) & (reference > 0)
+        if len(loads) != len(freq) or not busy.any():
+            self.ratio = None
+            throttled = False
+        else:
+            self.ratio = float(np.mean(freq[busy] / reference[busy]))
+            throttled = self.ratio < self.drop_ratio
+
+        if throttled:
+            self._above_since = None
+            if self._below_since is None:
+                self._below_since = now
+            if self.current is not None:
+                self.current.min_ratio = min(self.current.min_ratio, self.ratio)
+                if self.temp is not None:
+                    self.current.max_temp = max(self.current.max_temp or self.temp, self.temp)
+                cause = self.cause(reading.temps, reading.battery)
+                if cause == "Térmica":
+                    self.current.cause = cause
+            elif now - self._below_since >= self.sustain:
+                self.current = ThrottleEpisode(
+                    self._below_since, self.ratio, self.temp,
+                    self.cause(reading.temps, reading.battery),
+                    time.time() - (now - self._below_since)
+                )
+                self.episodes.append(self.current)
+                logger.warning(
+                    "Limitación de frecuencia: %.0f%% del máximo (%s)",
+                    self.ratio * 100, self.current.cause
+                )
+                return "inicio", self.current
+            return None
+
+        self._below_since = None
+        if self.current is None:
+            return None
+        if self._above_since is None:
+            self._above_since = now
+        if now - self._above_since < self.recover:
+            return None
+        episode, self.current = self.current, None
+        episode.end = self._above_since
+        logger.info(
+            "Fin de limitación: %.0f s, mínimo %.0f%% (%s)",
+            episode.end - episode.start, episode.min_ratio * 100, episode.cause
+        )
+        return "fin", episode
@@ -0,0 +1,160 @@
+"""
+top_consumers.py
+Seguimiento de los procesos que más CPU, RAM y disco consumieron
+en ventanas deslizantes (1, 5 y 15 minutos por defecto).
+"""
+import heapq
+import time
+from bisect import bisect_right
+from collections import namedtuple
+
+DEFAULT_WINDOWS = (60, 300, 900)
+METRICS = ("cpu", "ram", "disk")
+
+TopEntry = namedtuple("TopEntry", ["pid", "name", "value"])
+
+
+class _ProcessHistory:
+    """Acumuladores de un proceso: muestras (t, cpu_s, ram_byte_s, disk_bytes, t_reloj)."""
+    __slots__ = ("name", "samples", "create_time", "last_seen",
+                 "last_rss", "ram_area")
+
+    def __init__(self, name, create_time):
+        self.name = name
+        self.samples = []
+        self.create_time = create_time
+        self.last_seen = 0.0
+        self.last_rss = 0
+        self.ram_area = 0.0
+
+
+class TopConsumersTracker:
+    """
+    Mantiene acumuladores por proceso y responde consultas top-N
+    sobre varias ventanas a la vez con un heap acotado.
+    """
+    def __init__(self, windows=DEFAULT_WINDOWS, resolution=5.0, max_processes=4096):
+        self.windows = tuple(sorted(windows))
+        self.resolution = resolution
+        self.max_processes = max_processes
+        self._procs = {}
+        self._last_update = None
+
+    def update(self, infos, now=None):
+        """
+        Registra una muestra por proceso. `infos` son los diccionarios
+        `proc.info` del recorrido de procesos (pid, name, cpu_times,
+        memory_info, io_counters, create_time).
+        """
+        now = time.monotonic() if now is None else now
+        wall_now = time.time()
+
+        for info in infos:
+            pid = info.get("pid")
+            if pid is None:
+                continue
+
+            cpu_times = info.get("cpu_times")
+            mem = info.get("memory_info")
+            io = info.get("io_counters")
+            cpu_s = (cpu_times.user + cpu_times.system) if cpu_times else 0.0
+            rss = mem.rss if mem else 0
+            disk = (io.read_bytes + io.write_bytes) if io else 0
+
+            hist = self._procs.get(pid)
+            if hist is None or hist.create_time != info.get("create_time"):
+                # PID nuevo o reutilizado por otro proceso
+                hist = _ProcessHistory(
+                    info.get("name") or str(pid), info.get("create_time")
+                )
+                self._procs[pid] = hist
+            else:
+                hist.ram_area += hist.last_rss * (now - hist.last_seen)
+
+            hist.last_rss = rss
+            hist.last_seen = now
+            sample = (now, cpu_s, hist.ram_area, disk, wall_now)
+
+            samples = hist.samples
+            if len(samples) > 1 and now - samples[-2][0] < self.resolution:
+                # Misma ranura de resolución: sobrescribir la última muestra
+                samples[-1] = sample
+            else:
+                samples.append(sample)
+            self._prune(samples, now)
+
+        self._evict(now)
+        self._last_update = now
+
+    def _prune(self, samples, now):
+        """Descarta muestras más antiguas que la ventana mayor (conserva una base)."""
+        horizon = now - self.windows[-1]
+        idx = bisect_right(samples, horizon, key=lambda s: s[0])
+        if idx > 1:
+            del samples[:idx - 1]
+
+    def _evict(self, now):
+        """Elimina procesos muertos cuya actividad ya salió de todas las ventanas."""
+        horizon = now - self.windows[-1]
+        dead = [pid for pid, hist in self._procs.items() if hist.last_seen < horizon]
+        for pid in dead:
+            del self._procs[pid]
+
+        overflow = len(self._procs) - self.max_processes
+        if overflow > 0:
+            # Primero los que llevan más tiempo sin verse
+            stale = heapq.nsmallest(
+                overflow, self._procs.items(), key=lambda kv: kv[1].last_seen
+            )
+            for pid, _ in stale:
+                del self._procs[pid]
+
+    def _window_value(self, hist, metric, window, now):
+        """Calcula el consumo de un proceso en la ventana indicada."""
+        samples = hist.samples
+        if not samples:
+            return 0.0
+        start = now - window
+        latest = samples[-1]
+        idx = bisect_right(samples, start, key=lambda s: s[0])
+        if idx > 0:
+            base = samples[idx - 1]
+        elif hist.create_time and hist.create_time >= latest[4] - (latest[0] - start):
+            # El proceso nació dentro de la ventana: contar desde cero
+            base = (start, 0.0, 0.0, 0, 0.0)
+        else:
+            base = samples[0]
+
+        if metric == "cpu":
+            return (latest[1] - base[1]) / window * 100.0
+        if metric == "ram":
+            return (latest[2] - base[2]) / window
+        return float(latest[3] - base[3])
+
+    def top(self, metric="cpu", window=DEFAULT_WINDOWS[0], n=5, now=None):
+        """
+        Devuelve los `n` procesos con mayor consumo en la ventana.
+        cpu: % medio de un núcleo, ram: bytes medios, disk: bytes leídos+escritos.
+        """
+        if metric not in METRICS:
+            raise ValueError(f"Métrica desconocida: {metric}")
+        now = (self._last_update or time.monotonic()) if now is None else now
+        values = (
+            (self._window_value(hist, metric, window, now), pid, hist.name)
+            for pid, hist in self._procs.items()
+        )
+        return [
+            TopEntry(pid, name, value)
+            for value, pid, name in heapq.nlargest(n, values)
+            if value > 0
+        ]
+
+    def summary(self, n=5):
+        """Devuelve {ventana: {métrica: [TopEntry, ...]}} para todas las ventanas."""
+        return {
+            window: {metric: self.top(metric, window, n) for metric in METRICS}
+            for window in self.windows
+        }
+
+    def __len__(self):
+        return len(self._procs)
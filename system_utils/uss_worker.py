@@ -0,0 +1,120 @@
+"""
+uss_worker.py
+Cálculo en segundo plano de la memoria privada (USS/PSS o bytes privados)
+por proceso, con prioridad para los procesos visibles y más grandes y
+una caché con marca de tiempo para mostrar la antigüedad del dato.
+"""
+import time
+import queue
+import itertools
+import threading
+import psutil
+
+# Resultado de `get` para procesos cuya memoria privada no se pudo leer
+UNAVAILABLE = object()
+
+
+def private_memory(pid):
+    """Memoria privada de un proceso: USS si es posible, si no bytes privados."""
+    proc = psutil.Process(pid)
+    try:
+        return proc.memory_full_info().uss
+    except psutil.AccessDenied:
+        # En Windows `private` (commit privado) no requiere recorrer páginas
+        info = proc.memory_info()
+        value = getattr(info, "private", None)
+        if value is None:
+            raise
+        return value
+
+
+class UssWorker:
+    """
+    Pool acotado de hilos que consume una cola de prioridad de PIDs.
+    Los resultados quedan en caché como (create_time, bytes, timestamp);
+    los fallos se guardan con bytes None para no reintentarlos en cada tick.
+    """
+    def __init__(self, workers=2, max_pending=64, fetch=private_memory):
+        self.max_pending = max_pending
+        self.fetch = fetch
+        self._queue = queue.PriorityQueue()
+        # pid → create_time de lo encolado o en curso
+        self._pending = {}
+        self._cache = {}
+        self._lock = threading.Lock()
+        self._counter = itertools.count()
+        self._stop = threading.Event()
+        self._threads = [
+            threading.Thread(target=self._run, daemon=True) for _ in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def request(self, candidates, max_age_visible=5.0, max_age_other=60.0, now=None):
+        """
+        Encola los procesos cuyo dato esté viejo. `candidates` son tuplas
+        (pid, create_time, rss, visible); se priorizan visibles y grandes.
+        """
+        now = time.monotonic() if now is None else now
+        stale = []
+        with self._lock:
+            room = self.max_pending - len(self._pending)
+            if room <= 0:
+                return 0
+            for pid, create_time, rss, visible in candidates:
+                if pid in self._pending:
+                    continue
+                cached = self._cache.get(pid)
+                max_age = max_age_visible if visible else max_age_other
+                if cached and cached[0] == create_time and now - cached[2] < max_age:
+                    continue
+                stale.append(((0 if visible else 1, -rss), pid, create_time))
+
+            stale.sort()
+            for priority, pid, create_time in stale[:room]:
+                self._pending[pid] = create_time
+                self._queue.put((priority, next(self._counter), pid, create_time))
+        return min(len(stale), room)
+
+    def get(self, pid, create_time, now=None):
+        """
+        Devuelve (bytes, antigüedad en s), UNAVAILABLE si la lectura falló
+        (p. ej. acceso denegado) o None si aún no hay dato.
+        """
+        cached = self._cache.get(pid)
+        if not cached or cached[0] != create_time:
+            return None
+        if cached[1] is None:
+            return UNAVAILABLE
+        now = time.monotonic() if now is None else now
+        return cached[1], now - cached[2]
+
+    def discard(self, pid):
+        """Olvida un proceso terminado (también si su lectura está en curso)."""
+        with self._lock:
+            self._cache.pop(pid, None)
+            self._pending.pop(pid, None)
+
+    def stop(self):
+        """Detiene los hilos de trabajo."""
+        self._stop.set()
+        for _ in self._threads:
+            self._queue.put(((-1, 0), next(self._counter), None, None))
+
+    def _run(self):
+        """Bucle de cada hilo de trabajo."""
+        while not self._stop.is_set():
+            _, _, pid, create_time = self._queue.get()
+            if pid is None:
+                break
+            try:
+                value = self.fetch(pid)
+            # pylint: disable=broad-exception-caught
+            except Exception:
+                value = None
+            with self._lock:
+                # Descartado mientras se leía: el proceso ya terminó
+                if self._pending.get(pid) != create_time:
+                    continue
+                del self._pending[pid]
+                self._cache[pid] = (create_time, value, time.monotonic())
@@ -0,0 +1,174 @@
+"""Inicio escalonado: orden, simultaneidad y tiempos de DelayedLauncher."""
+import os
+import signal
+import pytest
+from system_utils import delayed_start
+from system_utils.delayed_start import DelayedLauncher, dummy_items
+
+
+class FakeClock:
+    """Reloj que solo avanza con `sleep`."""
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        """Avanza el reloj."""
+        self.now += seconds
+
+
+class FakeGate:
+    """Reposo fijo (o desde un instante) para no depender de la carga real."""
+    def __init__(self, idle=True, idle_from=0.0):
+        self.idle = idle
+        self.idle_from = idle_from
+        self.reason = "En reposo"
+
+    def check(self, now=None):
+        """True si el equipo cuenta como en reposo en `now`."""
+        if self.idle and now >= self.idle_from:
+            self.reason = "En reposo"
+            return True
+        self.reason = "CPU ocupada (90%)"
+        return False
+
+
+class FakePrograms:
+    """Lanzador y seguimiento falsos: cada prueba se asienta tras su CPU ocupada."""
+    def __init__(self, clock):
+        self.clock = clock
+        self.launched = []
+        self.busy = {}
+        self.started = {}
+
+    def launch(self, item):
+        """Registra el lanzamiento y devuelve un PID ficticio."""
+        pid = 1000 + len(self.launched)
+        self.launched.append(item["name"])
+        self.busy[pid] = float(item["command"][3])
+        self.started[pid] = self.clock()
+        return pid
+
+    def readiness(self, pid):
+        """Sustituto de _Readiness."""
+        programs = self
+
+        class Readiness:  # pylint: disable=too-few-public-methods
+            """Listo cuando pasa la CPU ocupada del programa de prueba."""
+            def check(self, now, ready_cpu, quiet):  # pylint: disable=unused-argument
+                """Mismo contrato que _Readiness.check."""
+                done = programs.started[pid] + programs.busy[pid]
+                return "listo" if now >= done else None
+        return Readiness()
+
+
+def run_session(monkeypatch, mode, count=6, gate=None, **settings):
+    """Sesión completa con reloj, reposo y programas falsos."""
+    clock = FakeClock()
+    programs = FakePrograms(clock)
+    monkeypatch.setattr(delayed_start, "_Readiness", programs.readiness)
+    launcher = DelayedLauncher(
+        dummy_items(count, busy=(1.0, 3.0)),
+        settings=dict({"mode": mode, "initial_delay": 5.0, "max_concurrent": 2}, **settings),
+        gate=gate or FakeGate(), clock=clock, sleep=clock.sleep,
+        launcher=programs.launch, poll=0.25
+    )
+    return launcher.run(), programs
+
+
+def max_concurrent(records):
+    """Máximo de programas arrancando a la vez según los tiempos registrados."""
+    return max(
+        sum(1 for other in records if other["launched"] <= r["launched"] < other["ready"])
+        for r in records
+    )
+
+
+# dummy_items da prioridades 0, 1, 2, 0, 1, 2
+ORDER = ["prueba-1", "prueba-4", "prueba-2", "prueba-5", "prueba-3", "prueba-6"]
+
+
+def test_staggered_session(monkeypatch):
+    session, programs = run_session(monkeypatch, "escalonado")
+    records = session["items"]
+
+    assert programs.launched == ORDER
+    assert [r["name"] for r in records] == ORDER
+    assert [r["priority"] for r in records] == [0, 0, 1, 1, 2, 2]
+    assert all(r["status"] == "listo" and r["gate"] == "reposo" for r in records)
+    assert records[0]["launched"] == 5.0
+    assert max_concurrent(records) == 2
+    for record in records:
+        pid = record["pid"]
+        assert record["launched"] == programs.started[pid]
+        # Listo en el primer sondeo tras la CPU ocupada
+        assert 0 <= record["startup"] - programs.busy[pid] < 0.25 + 1e-9
+        assert record["ready"] == pytest.approx(record["launched"] + record["startup"])
+    assert [r["launched"] for r in records] == sorted(r["launched"] for r in records)
+    assert session["usable_after"] >= max(r["ready"] for r in records)
+    assert "usable_timeout" not in session
+
+
+def test_direct_session(monkeypatch):
+    session, programs = run_session(monkeypatch, "directo")
+    records = session["items"]
+
+    assert programs.launched == ORDER
+    assert all(r["launched"] == 0.0 and r["gate"] == "sin control" for r in records)
+    assert max_concurrent(records) == 6
+    for record in records:
+        assert record["status"] == "listo"
+        assert 0 <= record["ready"] - programs.busy[record["pid"]] < 0.25 + 1e-9
+
+
+def test_busy_gate_forces_launch_and_usable_timeout(monkeypatch):
+    session, _ = run_session(
+        monkeypatch, "escalonado", count=2, gate=FakeGate(idle=False),
+        gate_timeout=4.0, usable_timeout=10.0
+    )
+    records = session["items"]
+    assert all(r["gate"] == "forzado (CPU ocupada (90%))" for r in records)
+    assert records[0]["launched"] == 9.0
+    assert records[1]["launched"] >= records[0]["launched"] + 4.0
+    assert session["usable_timeout"] is True
+
+
+def test_launch_error_is_recorded(monkeypatch):
+    clock = FakeClock()
+
+    def failing(item):
+        raise OSError(f"no existe {item['name']}")
+
+    launcher = DelayedLauncher(
+        dummy_items(2), settings={"mode": "directo"}, gate=FakeGate(),
+        clock=clock, sleep=clock.sleep, launcher=failing
+    )
+    monkeypatch.setattr(delayed_start, "_Readiness", None)
+    records = launcher.run()["items"]
+    assert [r["status"] for r in records] == ["error", "error"]
+    assert all(r["ready"] == r["launched"] == 0.0 and r["startup"] == 0.0 for r in records)
+
+
+def test_real_dummy_programs():
+    """Programas de prueba reales: se asientan tras su CPU ocupada."""
+    launcher = DelayedLauncher(
+        dummy_items(2, busy=(0.2, 0.4), idle=30.0),
+        settings={"mode": "directo", "ready_quiet": 0.5, "ready_timeout": 20.0,
+                  "usable_timeout": 0.0},
+        gate=FakeGate(), poll=0.1
+    )
+    session = launcher.run()
+    try:
+        for record in session["items"]:
+            assert record["status"] == "listo"
+            assert record["pid"]
+            assert record["startup"] >= 0.5
+    finally:
+        for record in session["items"]:
+            if record["pid"]:
+                try:
+                    os.kill(record["pid"], signal.SIGTERM)
+                except OSError:
+                    pass
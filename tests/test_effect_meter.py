@@ -0,0 +1,42 @@
+"""Efecto medido: archivo compartido por la ventana principal y el monitor flotante."""
+import os
+from system_utils.effect_meter import EffectRun, EffectStore, compare
+
+
+def finished_run(name, used_before, used_after):
+    """EffectRun terminada con dos muestras por ventana."""
+    run = EffectRun(name, f"Acción {name}", [{"used": used_before}, {"used": used_before + 2}])
+    run.after = [{"used": used_after}, {"used": used_after + 2}]
+    run.result = compare(run.before, run.after)
+    return run
+
+
+def test_two_processes_keep_each_others_runs(tmp_path):
+    path = str(tmp_path / "effects.json")
+    window = EffectStore(path)
+    overlay = EffectStore(path)
+
+    window.record(finished_run("temp", 100, 80))
+    overlay.record(finished_run("trim", 100, 50))
+    window.record(finished_run("temp", 90, 85))
+
+    data = EffectStore(path).data
+    assert len(data["temp"]["runs"]) == 2
+    assert len(data["trim"]["runs"]) == 1
+    # El guardado del otro proceso no duplica ejecuciones ya mezcladas
+    overlay.record(finished_run("trim", 60, 40))
+    data = EffectStore(path).data
+    assert [len(data[name]["runs"]) for name in ("temp", "trim")] == [2, 2]
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+
+def test_merge_keeps_latest_runs(tmp_path):
+    path = str(tmp_path / "effects.json")
+    first = EffectStore(path, keep=3)
+    second = EffectStore(path, keep=3)
+    for i in range(2):
+        first.record(finished_run("recycle", 100, 100 - i))
+        second.record(finished_run("recycle", 100, 50 - i))
+    runs = EffectStore(path).data["recycle"]["runs"]
+    assert len(runs) == 3
+    assert [run["time"] for run in runs] == sorted(run["time"] for run in runs)
@@ -0,0 +1,86 @@
+"""Modo flota: protocolo y agregador con varios agentes locales reales."""
+import os
+import sys
+import json
+import time
+import zlib
+import subprocess
+import pytest
+from system_utils.fleet_protocol import FrameReader, ProtocolError, HEADER, encode_frame
+from system_utils.fleet_aggregator import FleetAggregator
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def start_agent(port, name, token):
+    """Agente en su propio proceso, como en un equipo de la flota."""
+    return subprocess.Popen(
+        [sys.executable, "-m", "system_utils.fleet_agent", "--server", "127.0.0.1",
+         "--port", str(port), "--interval", "0.2", "--name", name, "--token", token],
+        cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+
+
+def wait_for(condition, timeout=20.0):
+    """Espera a que `condition()` sea cierta."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.1)
+    return False
+
+
+def test_frame_roundtrip():
+    message = {"type": "snap", "seq": 1, "upd": {"1": ["init", 0.0]}}
+    frame = encode_frame(message)
+    reader = FrameReader()
+    assert reader.feed(frame[:3]) == []
+    assert reader.feed(frame[3:] + frame) == [message, message]
+
+
+def test_decompression_bomb_rejected():
+    payload = zlib.compress(json.dumps({"x": "a" * 10_000_000}).encode("utf-8"), 9)
+    reader = FrameReader(max_decoded=1024 * 1024)
+    assert len(payload) < reader.max_frame
+    with pytest.raises(ProtocolError):
+        reader.feed(HEADER.pack(len(payload)) + payload)
+
+
+def test_network_bind_requires_token():
+    with pytest.raises(ValueError):
+        FleetAggregator(bind="0.0.0.0")
+    assert FleetAggregator().bind == "127.0.0.1"
+    assert FleetAggregator(token="clave").bind == "0.0.0.0"
+
+
+def test_aggregator_with_several_agents():
+    aggregator = FleetAggregator(bind="127.0.0.1", port=0, token="clave")
+    aggregator.start()
+    agents = [start_agent(aggregator.port, f"prueba-{i}", "clave") for i in range(3)]
+    intruder = start_agent(aggregator.port, "intruso", "otra")
+    try:
+        def all_reporting():
+            hosts = {h.id: h for h in aggregator.hosts()}
+            return all(
+                f"prueba-{i}" in hosts and hosts[f"prueba-{i}"].online
+                and hosts[f"prueba-{i}"].procs > 0 and hosts[f"prueba-{i}"].cpu is not None
+                for i in range(3)
+            )
+        assert wait_for(all_reporting)
+
+        # Los deltas siguientes mantienen las filas del agente
+        frames = aggregator.frames
+        assert wait_for(lambda: aggregator.frames >= frames + 6)
+        rows = aggregator.processes("prueba-0")
+        assert str(agents[0].pid) in rows
+        assert "intruso" not in {h.id for h in aggregator.hosts()}
+
+        agents[1].terminate()
+        agents[1].wait(timeout=5)
+        assert wait_for(lambda: not {h.id: h for h in aggregator.hosts()}["prueba-1"].online)
+    finally:
+        for proc in agents + [intruder]:
+            proc.terminate()
+            proc.wait(timeout=5)
+        aggregator.stop()
@@ -0,0 +1,104 @@
+"""Mantenimiento en reposo: efecto medido de los trabajos automáticos."""
+import os
+import sys
+import time
+import threading
+import psutil
+import pytest
+from system_utils.effect_meter import EffectMeter, EffectStore
+from system_utils.maintenance_scheduler import (
+    MaintenanceScheduler, MaintenanceJob, lower_thread_priority
+)
+
+
+class FakeDetector:
+    """Reposo controlado por la prueba."""
+    def __init__(self):
+        self.idle = True
+        self.reason = "En reposo"
+
+    def check(self, now=None):
+        """Devuelve el valor fijado por la prueba."""
+        return self.idle
+
+
+def steps(count, on_step=None):
+    """Trabajo de `count` pasos."""
+    for i in range(count):
+        if on_step is not None:
+            on_step(i)
+        time.sleep(0.002)
+        yield
+    return count
+
+
+def make(tmp_path, jobs, detector):
+    """Planificador con un EffectMeter sin hilo alimentado a mano."""
+    meter = EffectMeter(store=EffectStore(str(tmp_path / "effects.json")),
+                        window=2, settle=0.0, start=False)
+    scheduler = MaintenanceScheduler(
+        jobs, detector=detector, step_check=0.0,
+        state_file=str(tmp_path / "state.json"), effects=meter
+    )
+    scheduler.enabled = True
+    return scheduler, meter
+
+
+def feed(meter, count):
+    """Muestras posteriores a la acción que cierran las mediciones."""
+    for _ in range(count):
+        meter.add_sample({"time": time.monotonic() + 1000.0, "used": 1.0, "cpu": 0.0})
+
+
+def test_completed_job_is_measured(tmp_path):
+    scheduler, meter = make(
+        tmp_path, [MaintenanceJob("temp", "Temporales", lambda: steps(3), 3600)],
+        FakeDetector()
+    )
+    meter.add_sample({"time": time.monotonic() - 5.0, "used": 2.0, "cpu": 0.0})
+    scheduler.run_job(scheduler.jobs["temp"])
+    feed(meter, 2)
+
+    runs = EffectStore(str(tmp_path / "effects.json")).data["temp"]["runs"]
+    assert len(runs) == 1
+    assert runs[0]["effects"]["used"]["delta"] == -1.0
+    assert scheduler.status()[0][1]["status"] == "Completado"
+
+
+def test_paused_job_is_not_measured(tmp_path):
+    detector = FakeDetector()
+
+    def activity(i):
+        if i == 1:
+            detector.idle = False
+
+    job = MaintenanceJob("trim", "Recorte", lambda: steps(5, activity), 3600)
+    scheduler, meter = make(tmp_path, [job], detector)
+    scheduler.run_job(job)
+    assert "trim" in scheduler._paused  # pylint: disable=protected-access
+    assert not meter.active
+
+    # Al reanudar termina, pero sin medición: el antes es de otro periodo
+    detector.idle = True
+    scheduler.run_job(job)
+    feed(meter, 2)
+    assert scheduler.status()[0][1]["status"] == "Completado"
+    assert "trim" not in EffectStore(str(tmp_path / "effects.json")).data
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="ioprio por hilo de Linux")
+def test_lower_thread_priority_only_affects_thread():
+    seen = {}
+
+    def worker():
+        lower_thread_priority()
+        tid = threading.get_native_id()
+        seen["ionice"] = psutil.Process(tid).ionice().ioclass
+        seen["nice"] = os.getpriority(os.PRIO_PROCESS, tid)
+
+    before = psutil.Process().ionice()
+    thread = threading.Thread(target=worker)
+    thread.start()
+    thread.join()
+    assert seen == {"ionice": psutil.IOPRIO_CLASS_IDLE, "nice": 19}
+    assert psutil.Process().ionice() == before
@@ -0,0 +1,31 @@
+"""Procesos desbocados: umbral absoluto de CPU en % del total."""
+from system_utils.runaway_detector import RunawayDetector
+
+
+def feed(detector, cpu, seconds, pids=(100, 200)):
+    """Una muestra por segundo con la misma CPU (en % de un núcleo) para cada PID."""
+    alerts = []
+    for t in range(seconds):
+        alerts += detector.update(
+            list(pids), [1.0] * len(pids), [cpu] * len(pids),
+            [50e6] * len(pids), [0.0] * len(pids), float(t)
+        )
+    return alerts
+
+
+def test_single_busy_core_is_not_runaway_on_many_cores():
+    detector = RunawayDetector(ncpu=16, sustain=60.0)
+    assert not feed(detector, 100.0, 180)
+
+
+def test_process_filling_the_machine_is_runaway():
+    detector = RunawayDetector(ncpu=16, sustain=60.0)
+    alerts = feed(detector, 1550.0, 70)
+    assert sorted(alert.pid for alert in alerts) == [100, 200]
+    assert all(alert.reason == "CPU" and round(alert.cpu) == 97 for alert in alerts)
+    assert all(alert.duration == 60.0 for alert in alerts)
+
+
+def test_one_core_machine_keeps_core_units():
+    detector = RunawayDetector(ncpu=1, sustain=60.0)
+    assert len(feed(detector, 95.0, 61)) == 2
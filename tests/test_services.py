@@ -0,0 +1,124 @@
+"""Servicios: reparto del uso de los anfitriones y backend de systemd."""
+from collections import namedtuple
+from benchmarks.fakes import FakeSystem, FakeServiceBackend
+from system_utils.services import SystemdServiceBackend, attribute_usage
+
+Mem = namedtuple("Mem", ["rss"])
+
+
+def snapshot(system):
+    """Instantánea pid → info como la de ProcessWatch."""
+    return {
+        pid: {"pid": pid, "name": proc.name_, "cpu_percent": proc.load,
+              "memory_info": Mem(proc.rss)}
+        for pid, proc in system.processes.items()
+    }
+
+
+def test_attribute_usage_with_fake_backend():
+    system = FakeSystem(processes=300, windows=0)
+    backend = FakeServiceBackend(system, per_host=4, stopped=5)
+    services = backend.list_services()
+    processes = snapshot(system)
+    usage = attribute_usage(services, processes)
+
+    assert set(usage) == {service.name for service in services}
+    per_host = {}
+    for service in services:
+        for pid in service.pids:
+            per_host.setdefault(pid, []).append(service.name)
+    assert any(len(names) > 1 for names in per_host.values())
+
+    # Cada svchost se reparte a partes iguales y el total se conserva
+    for pid, names in per_host.items():
+        info = processes[pid]
+        for name in names:
+            entry = usage[name]
+            assert entry.shared == len(names)
+            assert entry.hosts == ["svchost.exe"]
+            assert entry.rss == info["memory_info"].rss / len(names)
+        assert abs(sum(usage[name].cpu for name in names) - info["cpu_percent"]) < 1e-9
+
+    for index in range(5):
+        assert usage[f"Stopped{index}"] == (0.0, 0.0, 1, [])
+
+
+def test_attribute_usage_ignores_exited_hosts():
+    system = FakeSystem(processes=100, windows=0)
+    services = FakeServiceBackend(system, stopped=0).list_services()
+    processes = snapshot(system)
+    gone = services[0].pids[0]
+    del processes[gone]
+    usage = attribute_usage(services, processes)
+    for service in services:
+        if service.pids == (gone,):
+            assert usage[service.name] == (0.0, 0.0, 1, [])
+
+
+LIST_UNITS = """\
+cron.service loaded active running Regular background program processing daemon
+ssh.service loaded inactive dead OpenBSD Secure Shell server
+gone.service loaded failed failed Broken unit
+"""
+
+SHOW = """\
+Id=cron.service
+Description=Regular background program processing daemon
+ActiveState=active
+UnitFileState=enabled
+MainPID=612
+ControlGroup=/system.slice/cron.service
+
+Id=ssh.service
+Description=OpenBSD Secure Shell server
+ActiveState=inactive
+UnitFileState=disabled
+MainPID=0
+ControlGroup=
+
+Id=gone.service
+Description=Broken unit
+ActiveState=failed
+UnitFileState=static
+MainPID=733
+ControlGroup=/system.slice/gone.service
+"""
+
+
+class CannedSystemd(SystemdServiceBackend):
+    """systemctl con salida fija."""
+    def __init__(self, root):
+        self.CGROUP_ROOTS = (str(root),)  # pylint: disable=invalid-name
+        self.calls = []
+
+    def _systemctl(self, *args):
+        self.calls.append(args)
+        return LIST_UNITS if args[0] == "list-units" else SHOW
+
+
+def test_systemd_list_services(tmp_path):
+    cgroup = tmp_path / "system.slice" / "cron.service"
+    cgroup.mkdir(parents=True)
+    (cgroup / "cgroup.procs").write_text("612\n640\n", encoding="ascii")
+
+    backend = CannedSystemd(tmp_path)
+    services = {s.name: s for s in backend.list_services()}
+
+    assert backend.calls[1][:3] == ("show", "-p", SystemdServiceBackend.PROPERTIES)
+    assert backend.calls[1][3:] == ("cron.service", "ssh.service", "gone.service")
+    assert list(services) == ["cron.service", "ssh.service", "gone.service"]
+
+    cron = services["cron.service"]
+    assert cron.display_name == "Regular background program processing daemon"
+    assert (cron.status, cron.start_type, cron.pids) == ("En ejecución", "Automático", (612, 640))
+    ssh = services["ssh.service"]
+    assert (ssh.status, ssh.start_type, ssh.pids) == ("Detenido", "Deshabilitado", ())
+    # Sin cgroup legible queda el MainPID
+    gone = services["gone.service"]
+    assert (gone.status, gone.start_type, gone.pids) == ("Error", "Estático", (733,))
+
+
+def test_systemd_without_units(tmp_path):
+    backend = CannedSystemd(tmp_path)
+    backend._systemctl = lambda *args: ""  # pylint: disable=protected-access
+    assert not backend.list_services()
@@ -0,0 +1,94 @@
+"""Limitación de frecuencia: episodios con una fuente de sensores falsa."""
+from benchmarks.fakes import FakeSensorSource
+from system_utils.throttle_detector import ThrottleDetector
+
+
+def run(detector, source, seconds):
+    """Lecturas de `seconds` s; devuelve los cambios de estado."""
+    events = []
+    for _ in range(int(seconds / source.step)):
+        event = detector.update(source.read())
+        if event is not None:
+            events.append(event)
+    return events
+
+
+def throttled_under_load(source, seconds, detector):
+    """Carga alta con la frecuencia al 50 % del máximo."""
+    source.load = 95.0
+    source.freq_ratio = 0.5
+    return run(detector, source, seconds)
+
+
+def test_episode_needs_sustained_drop_under_load():
+    source = FakeSensorSource()
+    detector = ThrottleDetector(sustain=10.0, recover=5.0)
+    assert not run(detector, source, 5)
+
+    # Frecuencia baja sin carga: ahorro de energía normal
+    source.freq_ratio = 0.5
+    assert not run(detector, source, 30)
+    assert detector.ratio is None
+
+    # Caída breve bajo carga que se recupera antes de `sustain`
+    assert not throttled_under_load(source, 8, detector)
+    source.freq_ratio = 1.0
+    assert not run(detector, source, 3)
+
+    first = source.now + source.step
+    assert not throttled_under_load(source, 10, detector)
+    events = throttled_under_load(source, 1, detector)
+    assert [kind for kind, _ in events] == ["inicio"]
+    episode = events[0][1]
+    assert episode.start == first
+    assert source.now - episode.start == 10.0
+    assert episode.min_ratio == 0.5
+    assert detector.current is episode
+
+
+def test_cause_tags():
+    source = FakeSensorSource()
+    detector = ThrottleDetector()
+    source.temp = 97.0
+    assert throttled_under_load(source, 12, detector)[0][1].cause == "Térmica"
+    assert detector.current.max_temp == 97.0
+
+    source = FakeSensorSource()
+    source.battery = (40, False)
+    detector = ThrottleDetector()
+    assert throttled_under_load(source, 12, detector)[0][1].cause == "Energía (batería)"
+    assert detector.on_battery
+
+    source = FakeSensorSource()
+    source.battery = (90, True)
+    detector = ThrottleDetector()
+    episode = throttled_under_load(source, 12, detector)[0][1]
+    assert episode.cause == "Límite de potencia o firmware"
+
+    # El calor que llega con el episodio abierto cambia la causa
+    source.temp = 99.0
+    throttled_under_load(source, 2, detector)
+    assert episode.cause == "Térmica"
+
+
+def test_episode_closes_when_frequency_recovers():
+    source = FakeSensorSource()
+    detector = ThrottleDetector(sustain=10.0, recover=5.0)
+    (_, episode), = throttled_under_load(source, 12, detector)
+    source.freq_ratio = 0.6
+    throttled_under_load(source, 3, detector)
+    assert episode.min_ratio == 0.5
+
+    # Recuperación más corta que `recover`: sigue abierto
+    source.freq_ratio = 1.0
+    assert not run(detector, source, 3)
+    throttled_under_load(source, 1, detector)
+    assert detector.current is episode
+
+    source.freq_ratio = 1.0
+    recovered = source.now + source.step
+    events = run(detector, source, 6)
+    assert events == [("fin", episode)]
+    assert episode.end == recovered
+    assert detector.current is None
+    assert list(detector.episodes) == [episode]